@@ -0,0 +1,642 @@
+import gc
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import ply.yacc as yacc
+import parser as pascal_parser
+from parser import PascalParser
+from lexer import PascalLexer
+from driver import compile_files
+from syntax import AbstractSyntaxTree, NodeInterner, TranslationError, VISITORS, walk
+from flat_ast import FlatTree
+from semantic import analyze
+from optimizer import pass_manager
+from vm_translator import TAIL_ENTRY_SUFFIX, PascalEWVMTranslator
+from view import ASTPrinter
+
+def best_of(fn, repeat=5, number=1):
+    best = float('inf')
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+def report(name, seconds):
+    print(f"{name:<40} {seconds * 1000:10.3f} ms")
+
+class LegacyKeywordLexer(PascalLexer):
+    reserved = {}
+
+    def t_IDENTIFIER(self, t):
+        r'[a-zA-Z_][a-zA-Z0-9_]*'
+        return t
+
+def _keyword_rule(name, pattern, order):
+    def rule(self, t):
+        return t
+    rule.__doc__ = pattern
+    rule.__name__ = f"t_{name}"
+    rule.__code__ = rule.__code__.replace(co_firstlineno=order)
+    return rule
+
+for _order, (_word, _name) in enumerate(PascalLexer.reserved.items(), start=1):
+    setattr(LegacyKeywordLexer, f"t_{_name}", _keyword_rule(_name, _word, _order))
+
+def corpus(scale=1):
+    sources = []
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Tests', 'Correct', '*.txt'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            sources.append(f.read())
+    return "\n".join(sources * scale)
+
+LARGE_PROGRAM_BODY = """    sum := sum + i * 2;
+    if (i mod 2) = 0 then
+        count := count + 1
+    else
+        sum := sum - 1;
+    for i := 1 to 5 do
+        valores[i] := i * i;
+    while sum > 100 do
+        sum := sum div 2;
+    writeln('sum: ', sum);
+"""
+
+def large_program(repeat):
+    return ("program Large;\n"
+            "var\n"
+            "    i, sum, count: integer;\n"
+            "    valores: array[1..5] of integer;\n"
+            "begin\n"
+            "    sum := 0;\n"
+            "    count := 0;\n"
+            + LARGE_PROGRAM_BODY * repeat +
+            "    writeln(count)\n"
+            "end.\n")
+
+def count_tokens(lexer, code):
+    lexer.input(code)
+    count = 0
+    while lexer.token():
+        count += 1
+    return count
+
+def bench_parser_startup():
+    lexer = PascalLexer()
+    lexer.build()
+
+    def regenerate():
+        module = PascalParser.__new__(PascalParser)
+        module.tokens = lexer.tokens
+        module.diagnostics = lexer.diagnostics
+        yacc.yacc(module=module, tabmodule='no_such_parsetab',
+                  write_tables=False, debug=False, errorlog=yacc.NullLogger())
+
+    def cold():
+        pascal_parser._tables.clear()
+        sys.modules.pop(pascal_parser.TABLE_MODULE, None)
+        PascalParser(lexer, write_tables=False)
+
+    def warm():
+        PascalParser(lexer, write_tables=False)
+
+    report("regenerate LALR tables", best_of(regenerate, repeat=3))
+    report("load shipped table module", best_of(cold))
+    report("construct with process-wide tables", best_of(warm, number=100))
+
+def bench_lexer_keywords():
+    code = corpus(200)
+    legacy = LegacyKeywordLexer()
+    legacy.build()
+    current = PascalLexer()
+    current.build()
+    tokens = count_tokens(current.lexer, code)
+    print(f"{len(code)} characters, {tokens} tokens")
+    report("keyword rules before IDENTIFIER", best_of(lambda: count_tokens(legacy.lexer, code), repeat=3))
+    report("reserved-word lookup", best_of(lambda: count_tokens(current.lexer, code), repeat=3))
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_lexer_streaming():
+    lexer = PascalLexer()
+    lexer.build()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'large.pas')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(corpus(100))
+        print(f"{os.path.getsize(path)} bytes on disk")
+
+        def read_all():
+            with open(path, 'r', encoding='utf-8') as f:
+                lexer.lexer.input(f.read())
+            return list(lexer.lexer)
+
+        def stream(use_mmap):
+            with open(path, 'rb') as f:
+                for _ in lexer.stream(f, chunk_size=64 * 1024, use_mmap=use_mmap):
+                    pass
+
+        for name, fn in (("read + token list", read_all),
+                         ("buffered stream", lambda: stream(False)),
+                         ("mmap stream", lambda: stream(True))):
+            print(f"{name:<40} {best_of(fn, repeat=3) * 1000:10.3f} ms {peak_memory(fn) / 1024:10.1f} KiB peak")
+
+def bench_compact_tokens():
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = large_program(500)
+    print(f"{len(code)} characters")
+
+    def token_list():
+        lexer.lexer.input(code)
+        return list(lexer.lexer)
+
+    tokens = token_list()
+    compact = lexer.compact(code)
+    list_peak = peak_memory(token_list)
+    compact_peak = peak_memory(lambda: lexer.compact(code))
+    print(f"{len(tokens)} tokens, {len(compact.table)} interned values")
+    print(f"{'LexToken list':<40} {list_peak / len(tokens):10.1f} bytes/token")
+    print(f"{'PascalTokenArray':<40} {compact_peak / len(tokens):10.1f} bytes/token")
+    report("parse from source", best_of(lambda: parser.parse(code), repeat=3))
+    report("parse from PascalTokenArray", best_of(lambda: parser.parse_tokens(compact), repeat=3))
+
+def bench_parallel_driver():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(400):
+            path = os.path.join(tmp, f"unit{i}.pas")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(large_program(5))
+            paths.append(path)
+        print(f"{len(paths)} files, {os.cpu_count()} cores")
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            seconds = best_of(lambda: sum(1 for _ in compile_files(paths, workers)), repeat=2)
+            print(f"{f'{workers} worker(s)':<40} {seconds * 1000:10.3f} ms {len(paths) / seconds:10.1f} files/s")
+            workers *= 2
+
+def bench_compile_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(200):
+            path = os.path.join(tmp, f"unit{i}.pas")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(large_program(5) + f"{{ unit {i} }}")
+            paths.append(path)
+        cache_dir = os.path.join(tmp, 'cache')
+        report("uncached", best_of(lambda: list(compile_files(paths, 1)), repeat=1))
+        report("cold cache", best_of(lambda: list(compile_files(paths, 1, cache_dir=cache_dir)), repeat=1))
+        report("warm cache", best_of(lambda: list(compile_files(paths, 1, cache_dir=cache_dir)), repeat=3))
+        # new options miss the code cache but still find every parsed tree
+        report("new options, warm AST cache", best_of(lambda: list(compile_files(paths, 1, cache_dir=cache_dir, options={"check_bounds": True})), repeat=1))
+
+def bench_ast_serialization():
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = large_program(500)
+    tree = parser.parse(code)
+    data = tree.dumps()
+    assert AbstractSyntaxTree.loads(data) == tree
+    print(f"{len(code)} characters of source, {len(data)} bytes serialized")
+    report("parse", best_of(lambda: parser.parse(code), repeat=3))
+    report("dumps", best_of(tree.dumps, repeat=3))
+    report("loads", best_of(lambda: AbstractSyntaxTree.loads(data), repeat=3))
+
+def bench_ast_memory():
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = large_program(500)
+    trees = []
+    peak = peak_memory(lambda: trees.append(parser.parse(code)))
+    nodes = sum(1 for _ in _walk(trees[0].program))
+    print(f"{nodes} nodes, {peak / 1024:.1f} KiB peak while parsing, {peak / nodes:.1f} bytes per node")
+
+def bench_hash_consing():
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = large_program(500)
+    left, right = parser.parse(code), parser.parse(code)
+    report("structural __eq__", best_of(lambda: left == right, repeat=3))
+    interner = NodeInterner()
+    start = time.perf_counter()
+    left.hash_cons(interner)
+    report("hash_cons", time.perf_counter() - start)
+    right.hash_cons(interner)
+    nodes = sum(1 for _ in _walk(parser.parse(code).program))
+    print(f"{nodes} nodes, {len(interner)} unique subtrees after hash-consing")
+    report("hash-consed __eq__", best_of(lambda: left == right, repeat=3))
+
+def bench_flat_ast():
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = large_program(500)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tree = parser.parse(code)
+    tree_bytes = tracemalloc.get_traced_memory()[0] - before
+    before = tracemalloc.get_traced_memory()[0]
+    flat = FlatTree.from_tree(tree)
+    flat_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    print(f"{flat}: object tree {tree_bytes / 1024:.1f} KiB, flat tree {flat_bytes / 1024:.1f} KiB")
+    report("from_tree", best_of(lambda: FlatTree.from_tree(tree), repeat=3))
+    report("to_tree", best_of(flat.to_tree, repeat=3))
+    assert PascalEWVMTranslator().translate(flat) == PascalEWVMTranslator().translate(tree)
+    report("translate object tree", best_of(lambda: PascalEWVMTranslator().translate(tree), repeat=3))
+
+    def translate_flat():
+        flat.release()
+        return PascalEWVMTranslator().translate(flat)
+
+    report("translate flat tree", best_of(translate_flat, repeat=3))
+    report("to_tree then translate", best_of(lambda: PascalEWVMTranslator().translate(flat.to_tree()), repeat=3))
+
+def deep_chain_program(terms):
+    chain = " + ".join(["a"] * terms)
+    return f"program Chain;\nvar a, x: integer;\nbegin\n  a := 1;\n  x := {chain};\n  writeln(x)\nend.\n"
+
+def bench_deep_expressions():
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    for terms in (10000, 20000, 40000):
+        print(f"-- {terms} terms")
+        code = deep_chain_program(terms)
+        tree = parser.parse(code)
+        other = parser.parse(code)
+        report("parse", best_of(lambda: parser.parse(code), repeat=1))
+        report("translate", best_of(lambda: PascalEWVMTranslator().translate(tree), repeat=1))
+        report("repr", best_of(lambda: repr(tree), repeat=1))
+        report("__eq__", best_of(lambda: tree == other, repeat=1))
+        report("hash", best_of(lambda: hash(parser.parse(code)), repeat=1))
+    code = deep_chain_program(2000)
+    report("ASTPrinter (2000 terms)", best_of(lambda: ASTPrinter().translate(parser.parse(code)), repeat=1))
+
+def translatable_corpus(parser, scale=1):
+    trees = []
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Tests', 'Correct', '*.txt'))):
+        tree = parser.parse_file(path)
+        try:
+            PascalEWVMTranslator().translate(tree)
+        except TranslationError:
+            continue
+        trees.append(tree)
+    return trees * scale
+
+def bench_dispatch(scale=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    trees = translatable_corpus(parser, scale)
+    nodes = sum(1 for tree in trees for node in walk(tree) if node.node_class in VISITORS)
+    translator = PascalEWVMTranslator()
+
+    def translate_all():
+        for tree in trees:
+            translator.reset()
+            translator.translate(tree)
+
+    seconds = best_of(translate_all, repeat=3)
+    report("translate corpus", seconds)
+    print(f"{len(trees)} programs, {nodes} dispatched nodes, {seconds / nodes * 1e9:.0f} ns per node")
+
+def bench_semantic(scale=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    trees = translatable_corpus(parser, scale)
+    translator = PascalEWVMTranslator()
+
+    def translate_all():
+        for tree in trees:
+            translator.reset()
+            translator.translate(tree)
+
+    analysis = best_of(lambda: [analyze(tree) for tree in trees], repeat=3)
+    total = best_of(translate_all, repeat=3)
+    report("semantic analysis (corpus)", analysis)
+    report("code generation (corpus)", total - analysis)
+    for depth in (250, 500, 1000):
+        index = "a[" * depth + "1" + "]" * depth
+        code = f"program Nested;\nvar a: array[1..10] of integer; x: integer;\nbegin\n  x := {index} + {index};\n  writeln(x)\nend.\n"
+        tree = parser.parse(code)
+        report(f"translate nested index (depth {depth})", best_of(lambda: PascalEWVMTranslator().translate(tree), repeat=3))
+
+FOLDABLE_BODY = """    x := 2 * 3 + 4 * (10 div 2);
+    y := x * 1 + 0 - y * 0;
+    a[1 + 1] := -(-x) + 2 ** 3;
+    b := not (x < y) and true;
+    if not (2 * 3 <> 6) then
+        writeln(x + 0, ' ', a[2] * 1);
+"""
+
+def bench_folding(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Fold;\n"
+            "var\n"
+            "    x, y: integer;\n"
+            "    b: boolean;\n"
+            "    a: array[1..2 * 5] of integer;\n"
+            "begin\n"
+            "    y := 1;\n"
+            + FOLDABLE_BODY * repeat +
+            "    writeln(x)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    for level in (0, 1):
+        manager = pass_manager(level)
+        optimized = manager.run(tree)
+        code_size = len(PascalEWVMTranslator().translate(optimized))
+        report(f"-O{level} passes", sum(manager.timings.values()))
+        print(f"-O{level}: {code_size} instructions, {manager.stats.get('fold', {}).get('folded', 0)} folds")
+    report("-O1 pipeline", best_of(lambda: pass_manager(1).run(tree), repeat=3))
+
+DEAD_CODE_BODY = """    if false then
+        writeln('never')
+    else
+        x := x + 1;
+    while false do
+        x := x - 1;
+    scratch := x * 2;
+    begin end;
+    if x > 0 then
+        writeln(x)
+    else
+    begin end;
+"""
+
+def bench_dead_code(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Dead;\n"
+            "var\n"
+            "    x, scratch: integer;\n"
+            "begin\n"
+            "    x := 0;\n"
+            + DEAD_CODE_BODY * repeat +
+            "    writeln(x)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    baseline = len(PascalEWVMTranslator().translate(tree))
+    manager = pass_manager(1)
+    optimized = len(PascalEWVMTranslator().translate(manager.run(tree)))
+    print(f"-O0: {baseline} instructions, -O1: {optimized} instructions")
+    print(f"dce: {manager.stats['dce']}")
+    report("-O1 pipeline", best_of(lambda: pass_manager(1).run(tree), repeat=3))
+
+SUBEXPRESSION_BODY = """    valores[i] := valores[i] + valores[j] * 2;
+    total := total + valores[i] * (i + j) + (i + j);
+    valores[j] := total;
+    writeln(valores[j], ' ', valores[i] + valores[j]);
+"""
+
+def bench_common_subexpressions(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Reuse;\n"
+            "var\n"
+            "    i, j, total: integer;\n"
+            "    valores: array[1..5] of integer;\n"
+            "begin\n"
+            "    i := 2;\n"
+            "    j := 3;\n"
+            "    total := 0;\n"
+            + SUBEXPRESSION_BODY * repeat +
+            "    writeln(total)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    for level in (1, 2):
+        manager = pass_manager(level)
+        size = len(PascalEWVMTranslator().translate(manager.run(tree)))
+        print(f"-O{level}: {size} instructions")
+    print(f"cse: {manager.stats['cse']}")
+    report("-O2 pipeline", best_of(lambda: pass_manager(2).run(tree), repeat=3))
+
+def bench_exponentiation(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    for exponent in (2, 15, 64, 1000):
+        tree = parser.parse(f"program Power;\nvar x, r: integer;\nbegin\n  x := 3;\n  r := x ** {exponent}\nend.\n")
+        print(f"x ** {exponent}: {len(PascalEWVMTranslator().translate(tree))} instructions")
+    body = "    r := r + x ** 13 + x ** i;\n" * repeat
+    tree = parser.parse(f"program Powers;\nvar x, i, r: integer;\nbegin\n  x := 3;\n  i := 5;\n  r := 0;\n{body}  writeln(r)\nend.\n")
+    print(f"{repeat} constant and runtime powers: {len(PascalEWVMTranslator().translate(tree))} instructions")
+    report("translate powers", best_of(lambda: PascalEWVMTranslator().translate(tree), repeat=3))
+
+LOOP_BODY = """    i := 0;
+    while i < n * n do
+    begin
+        for j := 1 to length(s) do
+            total := total + (n + 1) * valores[2] + j;
+        i := i + 1
+    end;
+"""
+
+def _loop_instructions(code):
+    # instructions between the outermost loop label and its matching end label
+    start = next(index for index, line in enumerate(code) if line.startswith(("while", "for")))
+    end = code.index(f"end{code[start][:-1]}:")
+    return end - start
+
+def bench_loop_invariants(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Invariant;\n"
+            "var\n"
+            "    i, j, n, total: integer;\n"
+            "    s: string;\n"
+            "    valores: array[1..5] of integer;\n"
+            "begin\n"
+            "    n := 4;\n"
+            "    s := 'abc';\n"
+            "    total := 0;\n"
+            + LOOP_BODY * repeat +
+            "    writeln(total)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    for level in (1, 2):
+        manager = pass_manager(level)
+        translated = PascalEWVMTranslator().translate(manager.run(tree))
+        print(f"-O{level}: {len(translated)} instructions, {_loop_instructions(translated)} in the first loop nest")
+    print(f"licm: {manager.stats['licm']}")
+    report("-O2 pipeline", best_of(lambda: pass_manager(2).run(tree), repeat=3))
+
+INLINE_HELPERS = """function max(a, b: integer): integer;
+begin
+    if a > b then max := a else max := b
+end;
+function square(v: integer): integer;
+begin
+    square := v * v
+end;
+"""
+
+INLINE_BODY = """    for i := 1 to n do
+        total := total + max(square(i), total mod 7);
+"""
+
+def bench_inlining(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Helpers;\n"
+            + INLINE_HELPERS +
+            "var\n"
+            "    i, n, total: integer;\n"
+            "begin\n"
+            "    n := 10;\n"
+            "    total := 0;\n"
+            + INLINE_BODY * repeat +
+            "    writeln(total)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    for level in (1, 2):
+        manager = pass_manager(level)
+        translated = PascalEWVMTranslator().translate(manager.run(tree))
+        calls = sum(1 for line in translated if line == "call")
+        print(f"-O{level}: {len(translated)} instructions, {calls} call sites, {_loop_instructions(translated)} in the first loop")
+    print(f"inline: {manager.stats['inline']}")
+    report("-O2 pipeline", best_of(lambda: pass_manager(2).run(tree), repeat=3))
+
+TAIL_RECURSIVE = """function gcd(a, b: integer): integer;
+begin
+    if b = 0 then
+        gcd := a
+    else
+        gcd := gcd(b, a mod b)
+end;
+function total(n, acc: integer): integer;
+begin
+    if n = 0 then
+        total := acc
+    else
+        total := total(n - 1, acc + n)
+end;
+"""
+
+def bench_tail_calls(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Tail;\n"
+            + TAIL_RECURSIVE +
+            "var\n"
+            "    r: integer;\n"
+            "begin\n"
+            "    r := 0;\n"
+            + "    r := r + gcd(1071, 462) + total(100000, 0);\n" * repeat +
+            "    writeln(r)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    translated = PascalEWVMTranslator().translate(tree)
+    body = translated[translated.index("gcd:"):translated.index("main:")]
+    print(f"{len(translated)} instructions, {body.count('call')} calls and "
+          f"{body.count(f'jump gcd{TAIL_ENTRY_SUFFIX}') + body.count(f'jump total{TAIL_ENTRY_SUFFIX}')} tail jumps inside the recursive functions")
+    report("translate", best_of(lambda: PascalEWVMTranslator().translate(tree), repeat=3))
+
+BOUNDS_BODY = """    for i := 1 to 10 do
+        a[i] := i * i;
+    for i := 0 to 4 do
+        b[2 * i + 1] := a[10 - i] + a[i mod 3 + 1];
+    k := a[3] mod 10;
+    total := total + b[k];
+"""
+
+def bench_bounds_checks(repeat=200):
+    lexer = PascalLexer()
+    lexer.build()
+    parser = PascalParser(lexer)
+    code = ("program Bounds;\n"
+            "var\n"
+            "    a: array[1..10] of integer;\n"
+            "    b: array[0..9] of integer;\n"
+            "    i, k, total: integer;\n"
+            "begin\n"
+            "    total := 0;\n"
+            + BOUNDS_BODY * repeat +
+            "    writeln(total)\n"
+            "end.\n")
+    tree = parser.parse(code)
+    accesses = 5 * repeat
+    for level in (0, 2):
+        optimized = pass_manager(level).run(tree)
+        unchecked = PascalEWVMTranslator().translate(optimized)
+        checked = PascalEWVMTranslator(check_bounds=True).translate(optimized)
+        checks = sum(1 for line in checked if line.startswith("check"))
+        print(f"-O{level}: {checks} of {accesses} array accesses checked, {len(checked) - len(unchecked)} extra instructions")
+    report("checked translate", best_of(lambda: PascalEWVMTranslator(check_bounds=True).translate(tree), repeat=3))
+    report("unchecked translate", best_of(lambda: PascalEWVMTranslator().translate(tree), repeat=3))
+
+def _walk(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(node)
+        elif hasattr(node, '__slots__'):
+            yield node
+            stack.extend(getattr(node, field) for field in node.__slots__)
+
+BENCHMARKS = {
+    "parser_startup": bench_parser_startup,
+    "lexer_keywords": bench_lexer_keywords,
+    "lexer_streaming": bench_lexer_streaming,
+    "compact_tokens": bench_compact_tokens,
+    "parallel_driver": bench_parallel_driver,
+    "compile_cache": bench_compile_cache,
+    "ast_serialization": bench_ast_serialization,
+    "ast_memory": bench_ast_memory,
+    "hash_consing": bench_hash_consing,
+    "flat_ast": bench_flat_ast,
+    "deep_expressions": bench_deep_expressions,
+    "dispatch": bench_dispatch,
+    "semantic": bench_semantic,
+    "folding": bench_folding,
+    "dead_code": bench_dead_code,
+    "common_subexpressions": bench_common_subexpressions,
+    "loop_invariants": bench_loop_invariants,
+    "exponentiation": bench_exponentiation,
+    "inlining": bench_inlining,
+    "tail_calls": bench_tail_calls,
+    "bounds_checks": bench_bounds_checks,
+}
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"Unknown benchmark '{name}'. Available: {', '.join(BENCHMARKS)}")
+            return
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
+if __name__ == "__main__":
+    main()
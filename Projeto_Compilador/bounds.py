@@ -0,0 +1,208 @@
+from typing import Dict, List, Optional, Set, Tuple
+import syntax as ast
+from semantic import INTEGER_MAX, INTEGER_MIN, READ_PROCEDURES, Scope, reads_into_array
+
+Interval = Tuple[int, int]
+# nodes that can neither index an array nor call or write anything
+LEAVES = (ast.Constant, ast.VariableAccess, ast.Identifier)
+
+
+def _bounded(low: int, high: int) -> Optional[Interval]:
+    return (low, high) if INTEGER_MIN <= low and high <= INTEGER_MAX else None
+
+def _combine(operator: str, left: Interval, right: Interval) -> Optional[Interval]:
+    if operator == "+":
+        return _bounded(left[0] + right[0], left[1] + right[1])
+    if operator == "-":
+        return _bounded(left[0] - right[1], left[1] - right[0])
+    if operator == "*":
+        products = [a * b for a in left for b in right]
+        return _bounded(min(products), max(products))
+    # division is only followed for non-negative dividends and positive divisors
+    if left[0] < 0 or right[0] <= 0:
+        return None
+    if operator == "div":
+        return left[0] // right[1], left[1] // right[0]
+    if operator == "mod":
+        return 0, min(left[1], right[1] - 1)
+    return None
+
+def _nodes(root: object):
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        kind = ast.node_type(node)
+        if kind is list:
+            pending.extend(node)
+        elif kind not in LEAVES and isinstance(node, ast.Node):
+            yield node
+            pending.extend([getattr(node, field) for field in node._fields])
+
+
+class IntervalAnalyzer:
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.proven: Set[int] = set()
+        self.writes: Dict[int, Optional[Set[int]]] = {}
+
+    def __call__(self, body: ast.Statement) -> Set[int]:
+        pending: List[Tuple[ast.Statement, Dict[int, Interval]]] = [(body, {})]
+        while pending:
+            statement, ranges = pending.pop()
+            kind = ast.node_type(statement)
+            if kind is ast.CompoundStatement:
+                entries = []
+                for child in statement.statements:
+                    entries.append((child, ranges))
+                    ranges = self._after(child, ranges)
+                pending.extend(reversed(entries))
+            elif kind is ast.AssignmentStatement:
+                self._check([statement.variable, statement.expression], ranges)
+            elif kind is ast.IfStatement:
+                ranges = self._check([statement.condition], ranges)
+                pending.append((statement.then_stmt, ranges))
+                if statement.else_stmt is not None:
+                    pending.append((statement.else_stmt, ranges))
+            elif kind is ast.WhileStatement:
+                ranges = self._without(ranges, self._written(statement))
+                pending.append((statement.body, self._check([statement.condition], ranges)))
+            elif kind is ast.ForStatement:
+                self._check([statement.initial_value], ranges)
+                inner = self._without(ranges, self._written(statement))
+                self._check([statement.final_value], inner)
+                if not reads_into_array(statement.body):
+                    pending.append((statement.body, self._enter(statement, ranges, inner)))
+            elif kind is ast.ProcedureCall:
+                self._check([arg.expression for arg in statement.args or []], ranges)
+        return self.proven
+
+    def _after(self, statement: ast.Statement, ranges: Dict[int, Interval]) -> Dict[int, Interval]:
+        if ast.node_type(statement) is ast.AssignmentStatement and ast.node_type(statement.variable) is ast.VariableAccess:
+            symbol = self.scope.bindings.get(id(statement))
+            ranges = {} if self._calls(statement.expression) else dict(ranges)
+            if symbol is None:
+                return ranges
+            value = self.interval(statement.expression, ranges)
+            ranges.pop(id(symbol), None)
+            if value is not None and symbol.type == "integer":
+                ranges[id(symbol)] = value
+            return ranges
+        return self._without(ranges, self._written(statement))
+
+    def _enter(self, loop: ast.ForStatement, ranges: Dict[int, Interval], inner: Dict[int, Interval]) -> Dict[int, Interval]:
+        symbol = self.scope.bindings.get(id(loop))
+        written = self._written(loop.body)
+        if symbol is None or written is None or id(symbol) in written:
+            return inner
+        # the final value is evaluated again before every iteration, after the body has run
+        initial = self.interval(loop.initial_value, ranges)
+        final = self.interval(loop.final_value, inner)
+        if initial is None or final is None:
+            return inner
+        inner = dict(inner)
+        # the body only runs while the control variable lies between the two bounds
+        inner[id(symbol)] = (initial[0], final[1]) if loop.direction == "to" else (final[0], initial[1])
+        return inner
+
+    def _without(self, ranges: Dict[int, Interval], written: Optional[Set[int]]) -> Dict[int, Interval]:
+        if written is None:
+            return {}
+        return {key: value for key, value in ranges.items() if key not in written}
+
+    def _written(self, statement: ast.Statement) -> Optional[Set[int]]:
+        if id(statement) in self.writes:
+            return self.writes[id(statement)]
+        bindings = self.scope.bindings
+        written: Optional[Set[int]] = set()
+        roots: object = statement
+        if ast.node_type(statement) is ast.ForStatement and not reads_into_array(statement.body):
+            # the loop entry needs the body summary as well, so build on it
+            body = self._written(statement.body)
+            if body is None:
+                self.writes[id(statement)] = None
+                return None
+            written.update(body)
+            symbol = bindings.get(id(statement))
+            if symbol is not None:
+                written.add(id(symbol))
+            roots = [statement.initial_value, statement.final_value]
+        for node in _nodes(roots):
+            kind = ast.node_type(node)
+            symbol = None
+            # a call may change any global, and locals are globals as far as a recursive call is concerned
+            if kind is ast.FunctionCall and bindings.get(id(node)) is not None:
+                written = None
+                break
+            if kind is ast.ProcedureCall:
+                if node.identifier.name.lower() in READ_PROCEDURES:
+                    symbol = bindings.get(id(node.args[0])) if node.args else None
+                elif bindings.get(id(node)) is not None:
+                    written = None
+                    break
+            elif kind is ast.AssignmentStatement:
+                symbol = bindings.get(id(node))
+            elif kind is ast.ForStatement:
+                # the readln shortcut accumulates into slot 1 whatever variable lives there
+                if reads_into_array(node.body):
+                    written = None
+                    break
+                symbol = bindings.get(id(node))
+            if symbol is not None:
+                written.add(id(symbol))
+        self.writes[id(statement)] = written
+        return written
+
+    def _calls(self, root: object) -> bool:
+        bindings = self.scope.bindings
+        return any(ast.node_type(node) is ast.FunctionCall and bindings.get(id(node)) is not None for node in _nodes(root))
+
+    def _check(self, roots: List[ast.Expression], ranges: Dict[int, Interval]) -> Dict[int, Interval]:
+        bindings = self.scope.bindings
+        indexed = []
+        for node in _nodes(roots):
+            kind = ast.node_type(node)
+            if kind is ast.IndexedVariable:
+                indexed.append(node)
+            elif kind is ast.FunctionCall and bindings.get(id(node)) is not None:
+                ranges = {}
+        for node in indexed:
+            symbol = bindings.get(id(node))
+            if symbol is not None and symbol.type == "array" and len(node.indices) == 1:
+                index = self.interval(node.indices[0], ranges)
+                if index is not None and symbol.lower_bound <= index[0] and index[1] <= symbol.upper_bound:
+                    self.proven.add(id(node))
+        return ranges
+
+    def interval(self, expr: ast.Expression, ranges: Dict[int, Interval]) -> Optional[Interval]:
+        kind = ast.node_type(expr)
+        # most indices are a plain variable or literal, which need no fold
+        if kind is ast.VariableAccess or kind is ast.Constant:
+            return self._operand(expr, ranges)
+
+        def operand(item):
+            kind = ast.node_type(item)
+            return self._operand(item, ranges) if kind is ast.VariableAccess or kind is ast.Constant else None
+
+        def combine(item, args):
+            if args is None:
+                return item
+            kind = ast.node_type(item)
+            if kind is ast.SignedExpression:
+                sign, value = args
+                return value if value is None or sign == "+" else (-value[1], -value[0])
+            if kind is ast.BinaryExpression:
+                operator, left, right = args
+                return None if left is None or right is None else _combine(operator, left, right)
+            return None
+
+        return ast.fold(expr, combine, operand)
+
+    def _operand(self, expr: ast.Expression, ranges: Dict[int, Interval]) -> Optional[Interval]:
+        if ast.node_type(expr) is ast.Constant:
+            return (int(expr.value), int(expr.value)) if expr.kind == 'integer' else None
+        symbol = self.scope.bindings.get(id(expr))
+        return None if symbol is None else ranges.get(id(symbol))
+
+
+def proven_indices(body: ast.Statement, scope: Scope) -> Set[int]:
+    return IntervalAnalyzer(scope)(body)
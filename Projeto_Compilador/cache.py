@@ -0,0 +1,143 @@
+import hashlib
+import os
+import tempfile
+from typing import Dict, List, Optional
+from syntax import AbstractSyntaxTree
+
+# every other module next to this one may take part in compilation
+NON_COMPILER_MODULES = ('benchmark.py',)
+NON_COMPILER_PREFIX = 'test_'
+
+_compiler_version: Optional[str] = None
+
+def compiler_modules(base: str) -> List[str]:
+    return sorted(name for name in os.listdir(base)
+                  if name.endswith('.py') and name not in NON_COMPILER_MODULES and not name.startswith(NON_COMPILER_PREFIX))
+
+def compiler_version() -> str:
+    global _compiler_version
+    if _compiler_version is None:
+        digest = hashlib.sha256()
+        base = os.path.dirname(os.path.abspath(__file__))
+        for name in compiler_modules(base):
+            digest.update(name.encode('utf-8'))
+            with open(os.path.join(base, name), 'rb') as f:
+                digest.update(f.read())
+        _compiler_version = digest.hexdigest()[:16]
+    return _compiler_version
+
+def source_hash(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CompileCache:
+    suffix = '.ewvm'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, version: Optional[str] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version or compiler_version()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(os.path.getsize(path) for path, _ in self._entries())
+
+    def key(self, digest: str, options: Optional[Dict[str, object]] = None) -> str:
+        material = f"{digest}:{self.version}:{sorted((options or {}).items())!r}"
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key: str) -> Optional[List[str]]:
+        data = self._read(key)
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data.decode('utf-8').split('\n')
+
+    def put(self, key: str, code: List[str]):
+        self._write(key, '\n'.join(code).encode('utf-8'))
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def _write(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self.size = sum(os.path.getsize(path) for path, _ in entries)
+        for path, _ in entries:
+            if self.size <= self.max_bytes:
+                break
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            self.size -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "bytes": self.size}
+
+    def _entries(self):
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(self.suffix):
+                    try:
+                        yield entry.path, entry.stat().st_mtime_ns
+                    except FileNotFoundError:
+                        continue
+
+
+class ASTCache(CompileCache):
+    suffix = '.ast'
+
+    def parse_file(self, parser, path: str, **kwargs) -> AbstractSyntaxTree:
+        digest = source_hash(path)
+        key = self.key(digest)
+        data = self._read(key)
+        if data is not None:
+            try:
+                tree = AbstractSyntaxTree.loads(data, digest)
+            except (ValueError, EOFError, TypeError, IndexError):
+                pass
+            else:
+                self.hits += 1
+                parser.lexer.reset()
+                return tree
+        self.misses += 1
+        tree = parser.parse_file(path, **kwargs)
+        if parser.error_count == 0:
+            try:
+                data = tree.dumps(digest)
+            except (ValueError, RecursionError):
+                # trees marshal cannot hold are still usable, just not cached
+                return tree
+            self._write(key, data)
+        return tree
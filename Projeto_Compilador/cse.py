@@ -0,0 +1,355 @@
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import syntax as ast
+from dce import PURE_FUNCTIONS, accumulates_readln, map_statements, with_children
+from folding import literal_value
+from passes import PassManager, Transform, register
+from semantic import NUMERIC_TYPES, READ_PROCEDURES, WRITE_PROCEDURES, Scope, node_cost, power_may_trap, rewrite_statements
+
+ARITHMETIC_OPERATORS = ("+", "-", "*", "/", "div", "mod")
+# larger expressions are not tracked, which keeps long operator chains linear
+MAX_EXPRESSION_NODES = 32
+TEMPORARY_PREFIX = "$cse"
+
+
+class Info:
+    __slots__ = ('pure', 'calls', 'safe', 'nodes', 'reads', 'type')
+
+    def __init__(self, pure: bool, nodes: int = 0, reads: Optional[FrozenSet[int]] = frozenset(), type: Optional[str] = None, calls: bool = False, safe: bool = True):
+        self.pure = pure
+        self.calls = calls
+        # safe expressions can also be evaluated where the source would not have evaluated them
+        self.safe = safe
+        self.nodes = nodes
+        self.reads = reads
+        self.type = type
+
+LEAF = Info(True)
+IMPURE = Info(False)
+
+
+class Group:
+    __slots__ = ('key', 'type', 'reads', 'occurrences', 'stored')
+
+    def __init__(self, key: ast.Expression, type: str, reads: FrozenSet[int], stored: bool = False):
+        self.key = key
+        self.type = type
+        self.reads = reads
+        self.occurrences: List[Tuple[int, ast.Expression]] = []
+        self.stored = stored
+
+    @property
+    def value(self) -> ast.Expression:
+        return self.occurrences[0][1]
+
+
+def merge(infos: List[Info]) -> Info:
+    pure = True
+    calls = False
+    safe = True
+    nodes = 0
+    reads = frozenset()
+    for info in infos:
+        pure = pure and info.pure
+        calls = calls or info.calls
+        safe = safe and info.safe
+        nodes += info.nodes
+        reads = None if reads is None or info.reads is None or nodes > MAX_EXPRESSION_NODES else reads | info.reads
+    return Info(pure, nodes, reads, calls=calls, safe=safe)
+
+def arithmetic_type(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    if left not in NUMERIC_TYPES or right not in NUMERIC_TYPES:
+        return None
+    return "real" if "real" in (left, right) else "integer"
+
+def copy_operand(expr: ast.Expression, scope: Scope) -> ast.Expression:
+    if type(expr) is ast.Constant:
+        return ast.Constant(expr.kind, expr.value)
+    # write arguments look variables up by their exact name
+    return ast.VariableAccess(ast.Identifier(scope.bindings[id(expr)].name))
+
+def replace_roots(statement: ast.Statement, replace) -> ast.Statement:
+    kind = type(statement)
+    if kind is ast.AssignmentStatement:
+        target = statement.variable
+        if type(target) is ast.IndexedVariable:
+            indices = ast.transform(target.indices, replace)
+            if indices is not target.indices:
+                target = ast.IndexedVariable(target.variable, indices)
+        expression = ast.transform(statement.expression, replace)
+        if target is statement.variable and expression is statement.expression:
+            return statement
+        return ast.AssignmentStatement(target, expression)
+    if kind is ast.ProcedureCall:
+        args = ast.transform(statement.args, replace) if statement.args else statement.args
+        return statement if args is statement.args else ast.ProcedureCall(statement.identifier, args)
+    if kind is ast.IfStatement:
+        condition = ast.transform(statement.condition, replace)
+        return statement if condition is statement.condition else ast.IfStatement(condition, statement.then_stmt, statement.else_stmt)
+    if kind is ast.ForStatement:
+        initial = ast.transform(statement.initial_value, replace)
+        if initial is statement.initial_value:
+            return statement
+        return ast.ForStatement(statement.control_var, initial, statement.direction, statement.final_value, statement.body)
+    return statement
+
+
+class ExpressionAnalyzer:
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.info: Dict[int, Info] = {}
+        self.found: List[Tuple[ast.Expression, Info]] = []
+
+    def _describe(self, item, args) -> Info:
+        if args is None:
+            return LEAF
+        kind = type(item)
+        if kind is ast.VariableAccess:
+            if literal_value(item) is not None:
+                info = Info(True, 1, frozenset(), "boolean")
+            else:
+                symbol = self.scope.bindings.get(id(item))
+                info = IMPURE if symbol is None or symbol.is_function else Info(True, 1, frozenset((id(symbol),)), symbol.type)
+        elif kind is ast.Constant:
+            info = Info(True, 1, frozenset(), item.kind if item.kind != 'string' else None)
+        elif kind is ast.IndexedVariable:
+            symbol = self.scope.bindings.get(id(item))
+            if symbol is None or symbol.type != "array":
+                info = IMPURE
+            else:
+                index = literal_value(item.indices[0]) if len(item.indices) == 1 else None
+                # out of range elements alias other variables, or fall off the stack
+                in_range = type(index) is int and symbol.lower_bound <= index <= symbol.upper_bound
+                info = merge([Info(True, 1, frozenset((id(symbol),)), safe=in_range), args[1]])
+                info.type = "integer"
+        elif kind is ast.BinaryExpression:
+            left, right = args[1], args[2]
+            info = merge([Info(True, 1), left, right])
+            if item.operator in ("/", "div", "mod") and not literal_value(item.right):
+                info.pure = False
+            info.type = arithmetic_type(left.type, right.type) if item.operator in ARITHMETIC_OPERATORS else "boolean"
+        elif kind is ast.SignedExpression:
+            info = merge([Info(True, 1), args[1]])
+            info.type = args[1].type
+        elif kind is ast.NotExpression:
+            info = merge([Info(True, 1), args[0]])
+            info.type = "boolean"
+        elif kind is ast.Exponentiation:
+            info = merge([Info(True, 1), args[0], args[1]])
+            info.pure = info.pure and not power_may_trap(item)
+            info.type = args[0].type
+        elif kind is ast.FunctionCall:
+            pure = item.identifier.name in PURE_FUNCTIONS
+            info = merge([Info(pure, 1, calls=not pure, safe=item.identifier.name == "length"), args[1]])
+            info.type = "integer" if item.identifier.name == "length" else None
+        elif kind is ast.ActualParameter:
+            info = merge(args)
+        elif kind is list:
+            info = merge(args)
+        elif kind is ast.Identifier:
+            info = LEAF
+        else:
+            info = IMPURE
+        self.info[id(item)] = info
+        if self._candidate(item, info):
+            self.found.append((item, info))
+        return info
+
+    def _candidate(self, node, info: Info) -> bool:
+        if not info.pure or info.reads is None or info.type not in NUMERIC_TYPES:
+            return False
+        kind = type(node)
+        if kind is ast.BinaryExpression:
+            return node.operator in ARITHMETIC_OPERATORS
+        return kind is ast.IndexedVariable or kind is ast.Exponentiation or kind is ast.FunctionCall
+
+
+class CommonSubexpressionEliminator(ExpressionAnalyzer):
+    def __init__(self, scope: Scope, temporaries: Dict[str, List[str]]):
+        super().__init__(scope)
+        self.temporaries = temporaries
+        self.eliminated = 0
+        self.forwarded = 0
+
+    def __call__(self, root: ast.CompoundStatement) -> ast.CompoundStatement:
+        return map_statements(root, self._block)
+
+    def _block(self, statement: ast.Statement, children: List[ast.Statement]) -> ast.Statement:
+        statement = with_children(statement, children)
+        if type(statement) is not ast.CompoundStatement:
+            return statement
+        selected = self._select(self._groups(statement.statements))
+        if not selected:
+            return statement
+        return ast.CompoundStatement(self._rewrite(statement.statements, selected))
+
+    def _roots(self, statement) -> Optional[List[ast.Expression]]:
+        kind = type(statement)
+        if kind is ast.AssignmentStatement:
+            target = statement.variable
+            return (target.indices if type(target) is ast.IndexedVariable else []) + [statement.expression]
+        if kind is ast.ProcedureCall:
+            name = statement.identifier.name.lower()
+            if name in READ_PROCEDURES:
+                return []
+            if name in WRITE_PROCEDURES:
+                return [arg.expression for arg in statement.args or []]
+            return None
+        if kind is ast.IfStatement:
+            return [statement.condition]
+        if kind is ast.ForStatement:
+            return [statement.initial_value]
+        return None
+
+    def _groups(self, statements: List[ast.Statement]) -> List[Group]:
+        live: Dict[ast.Expression, Group] = {}
+        groups: List[Group] = []
+        for index, statement in enumerate(statements):
+            roots = self._roots(statement)
+            self.found = []
+            infos = [ast.fold(root, self._describe) for root in roots] if roots else []
+            if roots is None or any(info.calls for info in infos):
+                live.clear()
+                continue
+            for node, info in self.found:
+                group = live.get(node)
+                if group is None:
+                    group = live[node] = Group(node, info.type, info.reads)
+                    groups.append(group)
+                group.occurrences.append((index, node))
+            kind = type(statement)
+            if kind is ast.AssignmentStatement:
+                target = statement.variable
+                symbol = self.scope.bindings.get(id(target) if type(target) is ast.IndexedVariable else id(statement))
+                if symbol is None:
+                    live.clear()
+                    continue
+                if symbol.is_function:
+                    continue
+                self._kill(live, id(symbol))
+                if type(target) is ast.IndexedVariable:
+                    self._store(live, groups, index, statement, infos[-1])
+            elif kind is ast.ProcedureCall and statement.identifier.name.lower() in READ_PROCEDURES:
+                symbol = self.scope.bindings.get(id(statement.args[0])) if statement.args else None
+                if statement.args:
+                    if symbol is None:
+                        live.clear()
+                    else:
+                        self._kill(live, id(symbol))
+            elif kind is not ast.ProcedureCall:
+                live.clear()
+        return groups
+
+    def _kill(self, live: Dict[ast.Expression, Group], symbol: int):
+        for key in [key for key, group in live.items() if symbol in group.reads]:
+            del live[key]
+
+    def _store(self, live: Dict[ast.Expression, Group], groups: List[Group], index: int, statement: ast.AssignmentStatement, value: Info):
+        # a stored element stays available until its array or index operands change
+        target = statement.variable
+        info = ast.fold(target, self._describe)
+        if info.reads is None or not info.pure or not value.pure or value.type != "integer":
+            return
+        reads = info.reads
+        if type(statement.expression) in (ast.Constant, ast.VariableAccess):
+            if value.reads is None:
+                return
+            reads = reads | value.reads
+        group = live[target] = Group(target, "integer", reads, stored=True)
+        group.occurrences.append((index, statement.expression))
+        groups.append(group)
+
+    def _select(self, groups: List[Group]) -> List[Group]:
+        selected = []
+        covered = set()
+        for group in sorted(groups, key=lambda group: -self.info[id(group.key)].nodes):
+            occurrences = [(index, node) for index, node in group.occurrences if id(node) not in covered]
+            if len(occurrences) < 2 or group.stored and occurrences[0][1] is not group.value:
+                continue
+            if group.stored and type(group.value) in (ast.Constant, ast.VariableAccess):
+                profit = 1
+            else:
+                size = node_cost(group.key, self.scope)
+                value_size = node_cost(occurrences[0][1], self.scope)
+                if size is None or value_size is None:
+                    continue
+                profit = value_size + size * (len(occurrences) - 1) - (value_size + 1 + len(occurrences))
+            if profit <= 0:
+                continue
+            group.occurrences = occurrences
+            selected.append(group)
+            for _, node in occurrences:
+                covered.update(id(child) for child in ast.walk(node))
+        return selected
+
+    def _rewrite(self, statements: List[ast.Statement], groups: List[Group]) -> List[ast.Statement]:
+        replacements: Dict[int, ast.Expression] = {}
+        inits: Dict[int, List[ast.Statement]] = {}
+        counters: Dict[str, int] = {}
+        active: List[Tuple[int, str, str]] = []
+        released: Dict[str, List[str]] = {}
+        for group in sorted(groups, key=lambda group: group.occurrences[0][0]):
+            first, value = group.occurrences[0]
+            if group.stored and type(value) in (ast.Constant, ast.VariableAccess):
+                for _, node in group.occurrences[1:]:
+                    replacements[id(node)] = copy_operand(value, self.scope)
+                self.forwarded += 1
+                continue
+            for entry in [entry for entry in active if entry[0] < first]:
+                active.remove(entry)
+                released.setdefault(entry[1], []).append(entry[2])
+            free = released.get(group.type)
+            name = free.pop() if free else self._temporary(group.type, counters)
+            active.append((group.occurrences[-1][0], group.type, name))
+            inits.setdefault(first, []).append(ast.AssignmentStatement(ast.VariableAccess(ast.Identifier(name)), value))
+            for _, node in group.occurrences:
+                replacements[id(node)] = ast.VariableAccess(ast.Identifier(name))
+            self.eliminated += 1
+
+        def replace(node):
+            return replacements.get(id(node), node)
+
+        rewritten = []
+        for index, statement in enumerate(statements):
+            rewritten.extend(inits.get(index, ()))
+            rewritten.append(replace_roots(statement, replace))
+        return rewritten
+
+    def _temporary(self, type_name: str, counters: Dict[str, int]) -> str:
+        # temporaries never outlive their block, so every block reuses the same pool
+        pool = self.temporaries.setdefault(type_name, [])
+        position = counters.get(type_name, 0)
+        counters[type_name] = position + 1
+        if position == len(pool):
+            pool.append(f"{TEMPORARY_PREFIX}{type_name[0]}{position}")
+        return pool[position]
+
+
+@register
+class CommonSubexpressionElimination(Transform):
+    name = 'cse'
+    requires = ('semantic',)
+
+    def run(self, tree: ast.AbstractSyntaxTree, manager: PassManager) -> ast.AbstractSyntaxTree:
+        model = manager.analysis('semantic', tree)
+        main = model.scope()
+        if any(isinstance(symbols, ast.TranslationError) for scope in model.scopes.values() for symbols in scope.declarations.values()):
+            return tree
+        # the readln shortcut writes slot 1, which a temporary must not take
+        if sum(symbol.size for symbols in main.declarations.values() for symbol in symbols) < 2 and accumulates_readln(tree):
+            return tree
+        temporaries: Dict[str, List[str]] = {}
+        eliminators: List[CommonSubexpressionEliminator] = []
+
+        def rewriter(scope: Scope) -> CommonSubexpressionEliminator:
+            eliminators.append(CommonSubexpressionEliminator(scope, temporaries))
+            return eliminators[-1]
+
+        result = rewrite_statements(tree, model, rewriter)
+        manager.record(self.name, "expressions", sum(eliminator.eliminated for eliminator in eliminators))
+        manager.record(self.name, "forwarded stores", sum(eliminator.forwarded for eliminator in eliminators))
+        if not temporaries:
+            return result
+        block = result.program.block
+        declarations = [ast.VariableDeclaration([ast.Identifier(name) for name in names], ast.NamedType(type_name)) for type_name, names in temporaries.items()]
+        manager.record(self.name, "temporaries", sum(len(names) for names in temporaries.values()))
+        return ast.AbstractSyntaxTree(ast.Program(result.program.heading, ast.Block(block.functions, (block.variables or []) + declarations, block.statements)))
@@ -0,0 +1,300 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import syntax as ast
+from folding import literal_value
+from passes import PassManager, Transform, register
+from semantic import READ_PROCEDURES, Scope, SemanticModel, Symbol, node_cost, power_may_trap, reads_into_array, rewrite_statements, scope_bodies
+
+# the readln shortcut in for loops accumulates into slot 1 without naming the variable
+READLN_ACCUMULATOR_SLOT = 1
+REMOVED = ("branches", "loops", "assignments", "compounds")
+PURE_FUNCTIONS = ("length", "charat")
+
+
+def is_empty(statement: Optional[ast.Statement]) -> bool:
+    return type(statement) is ast.CompoundStatement and not statement.statements
+
+def statement_children(statement: ast.Statement) -> List[ast.Statement]:
+    kind = type(statement)
+    if kind is ast.CompoundStatement:
+        return statement.statements
+    if kind is ast.IfStatement:
+        return [statement.then_stmt] if statement.else_stmt is None else [statement.then_stmt, statement.else_stmt]
+    if kind is ast.WhileStatement:
+        return [statement.body]
+    if kind is ast.ForStatement and not reads_into_array(statement.body):
+        return [statement.body]
+    return []
+
+def with_children(statement: ast.Statement, children: List[ast.Statement]) -> ast.Statement:
+    original = statement_children(statement)
+    if len(children) == len(original) and all(new is old for new, old in zip(children, original)):
+        return statement
+    kind = type(statement)
+    if kind is ast.CompoundStatement:
+        return ast.CompoundStatement(children)
+    if kind is ast.IfStatement:
+        return ast.IfStatement(statement.condition, children[0], children[1] if len(children) > 1 else None)
+    if kind is ast.WhileStatement:
+        return ast.WhileStatement(statement.condition, children[0])
+    body = children[0]
+    # never turn a loop body into the readln shortcut
+    if reads_into_array(body):
+        body = ast.CompoundStatement([body])
+    return ast.ForStatement(statement.control_var, statement.initial_value, statement.direction, statement.final_value, body)
+
+def map_statements(root: ast.Statement, rebuild: Callable[[ast.Statement, List[ast.Statement]], ast.Statement]) -> ast.Statement:
+    results: Dict[int, ast.Statement] = {}
+    pending: List[Tuple[ast.Statement, bool]] = [(root, False)]
+    while pending:
+        statement, ready = pending.pop()
+        if ready:
+            results[id(statement)] = rebuild(statement, [results[id(child)] for child in statement_children(statement)])
+        elif id(statement) not in results:
+            pending.append((statement, True))
+            pending.extend((child, False) for child in statement_children(statement))
+    return results[id(root)]
+
+def is_side_effect_free(expr, scope: Scope) -> bool:
+    pending = [expr]
+    while pending:
+        node = pending.pop()
+        kind = type(node)
+        if kind is list:
+            pending.extend(node)
+        elif kind is ast.VariableAccess:
+            if literal_value(node) is None and scope.bindings.get(id(node)) is None:
+                return False
+        elif kind is ast.IndexedVariable:
+            if scope.bindings.get(id(node)) is None:
+                return False
+            pending.extend(node.indices)
+        elif kind is ast.BinaryExpression:
+            if node.operator in ("/", "div", "mod") and not literal_value(node.right):
+                return False
+            pending.append(node.left)
+            pending.append(node.right)
+        elif kind is ast.SignedExpression or kind is ast.NotExpression:
+            pending.append(node.expression)
+        elif kind is ast.Exponentiation:
+            if power_may_trap(node):
+                return False
+            pending.append(node.base)
+        elif kind is ast.FunctionCall:
+            if node.identifier.name not in PURE_FUNCTIONS:
+                return False
+            pending.extend(param.expression for param in node.params or [])
+        elif kind is not ast.Constant:
+            return False
+    return True
+
+def accumulates_readln(tree: ast.AbstractSyntaxTree) -> bool:
+    block = tree.program.block
+    pending = [block.statements] + [function.body.statements for function in block.functions or [] if isinstance(function.body, ast.Block)]
+    while pending:
+        statement = pending.pop()
+        if type(statement) is ast.ForStatement and reads_into_array(statement.body):
+            return True
+        pending.extend(statement_children(statement))
+    return False
+
+
+class ProgramFacts:
+    def __init__(self, tree: ast.AbstractSyntaxTree, model: SemanticModel):
+        self.reads: Dict[int, int] = {}
+        self.declared: Set[int] = set()
+        self.accumulates = False
+        self.assignments: List[Tuple[ast.AssignmentStatement, Symbol, List[Symbol]]] = []
+        for declarations in (scope.declarations for scope in model.scopes.values()):
+            for symbols in declarations.values():
+                self.declared.update(id(symbol) for symbol in symbols)
+        for function in tree.program.block.functions or []:
+            parameters = model.table.locals.get(function.heading.identifier.name, {})
+            for section in function.heading.parameters:
+                self.declared.update(id(parameters[ident.name]) for ident in section.identifiers if ident.name in parameters)
+        for scope, body in scope_bodies(tree, model):
+            self._collect(scope, body)
+
+    def _collect(self, scope: Scope, body: ast.CompoundStatement):
+        pending = [body]
+        while pending:
+            statement = pending.pop()
+            kind = type(statement)
+            pending.extend(statement_children(statement))
+            if kind is ast.AssignmentStatement:
+                target = statement.variable
+                reads = self._reads(statement.expression, scope)
+                if type(target) is ast.IndexedVariable:
+                    reads.extend(self._reads(target.indices, scope))
+                    symbol = scope.bindings.get(id(target))
+                else:
+                    symbol = scope.bindings.get(id(statement))
+                self._count(reads, 1)
+                if symbol is not None and not symbol.is_function and is_side_effect_free(statement.expression, scope):
+                    if type(target) is not ast.IndexedVariable or is_side_effect_free(target.indices, scope):
+                        self.assignments.append((statement, symbol, reads))
+            elif kind is ast.IfStatement or kind is ast.WhileStatement:
+                self._count(self._reads(statement.condition, scope), 1)
+            elif kind is ast.ForStatement:
+                if reads_into_array(statement.body):
+                    self.accumulates = True
+                reads = self._reads([statement.initial_value, statement.final_value], scope)
+                reads.append(scope.bindings.get(id(statement)))
+                self._count(reads, 1)
+            elif kind is ast.ProcedureCall:
+                if statement.identifier.name.lower() in READ_PROCEDURES:
+                    continue
+                args = statement.args or []
+                reads = self._reads([arg.expression for arg in args], scope)
+                reads.extend(scope.bindings.get(id(arg)) for arg in args)
+                self._count(reads, 1)
+            elif kind is not ast.CompoundStatement:
+                self._count(self._reads(statement, scope), 1)
+
+    def _reads(self, expr, scope: Scope) -> List[Symbol]:
+        bindings = scope.bindings
+        return [bindings.get(id(node)) for node in ast.walk(expr) if type(node) is ast.VariableAccess or type(node) is ast.IndexedVariable]
+
+    def _count(self, symbols: List[Optional[Symbol]], delta: int):
+        reads = self.reads
+        for symbol in symbols:
+            if symbol is not None:
+                reads[id(symbol)] = reads.get(id(symbol), 0) + delta
+
+    def dead_assignments(self) -> Set[int]:
+        dead: Set[int] = set()
+        changed = True
+        while changed:
+            changed = False
+            for statement, symbol, reads in self.assignments:
+                if id(statement) in dead or self.reads.get(id(symbol), 0):
+                    continue
+                if self.accumulates and symbol.slot == READLN_ACCUMULATOR_SLOT:
+                    continue
+                dead.add(id(statement))
+                self._count(reads, -1)
+                changed = True
+        return dead
+
+
+class DeadCodeEliminator:
+    def __init__(self, scope: Scope, facts: ProgramFacts, dead: Set[int]):
+        self.scope = scope
+        self.facts = facts
+        self.dead = dead
+        self.saved = 0
+        self.removed = dict.fromkeys(REMOVED, 0)
+
+    def __call__(self, root: ast.CompoundStatement) -> ast.CompoundStatement:
+        root = self._resolve(root)
+        results: Dict[int, ast.Statement] = {}
+        pending: List[Tuple[ast.Statement, Optional[List[ast.Statement]]]] = [(root, None)]
+        while pending:
+            statement, children = pending.pop()
+            if children is not None:
+                results[id(statement)] = self._rebuild(statement, [results[id(child)] for child in children])
+                continue
+            children = [self._resolve(child) for child in statement_children(statement)]
+            pending.append((statement, children))
+            pending.extend((child, None) for child in children)
+        return results[id(root)]
+
+    def _size(self, statement: ast.Statement) -> Optional[int]:
+        return 0 if is_empty(statement) else node_cost(statement, self.scope)
+
+    def _difference(self, before: ast.Statement, after: ast.Statement) -> Optional[int]:
+        before, after = self._size(before), self._size(after)
+        return None if before is None or after is None else before - after
+
+    def _replacement(self, statement: ast.Statement) -> Tuple[ast.Statement, str]:
+        kind = type(statement)
+        if kind is ast.IfStatement:
+            value = literal_value(statement.condition)
+            if value is not None:
+                live = statement.then_stmt if value else statement.else_stmt
+                return (live if live is not None else ast.CompoundStatement([])), "branches"
+        elif kind is ast.WhileStatement:
+            value = literal_value(statement.condition)
+            if value is not None and not value:
+                return ast.CompoundStatement([]), "loops"
+        elif kind is ast.AssignmentStatement and id(statement) in self.dead:
+            return ast.CompoundStatement([]), "assignments"
+        return statement, ""
+
+    def _resolve(self, statement: ast.Statement) -> ast.Statement:
+        while True:
+            replacement, counter = self._replacement(statement)
+            if replacement is statement or self._declares(statement, replacement):
+                return statement
+            saved = self._difference(statement, replacement)
+            if saved is None:
+                return statement
+            self.saved += saved
+            self.removed[counter] += 1
+            statement = replacement
+
+    def _declares(self, statement: ast.Statement, kept: ast.Statement) -> bool:
+        # for loops allocate undeclared control variables on the fly, so dropping one could hide a declaration
+        pending = [statement]
+        while pending:
+            statement = pending.pop()
+            if statement is kept:
+                continue
+            if type(statement) is ast.ForStatement:
+                symbol = self.scope.bindings.get(id(statement))
+                if symbol is None or id(symbol) not in self.facts.declared:
+                    return True
+            pending.extend(statement_children(statement))
+        return False
+
+    def _rebuild(self, statement: ast.Statement, children: List[ast.Statement]) -> ast.Statement:
+        kind = type(statement)
+        original = statement_children(statement)
+        unchanged = all(new is old for new, old in zip(children, original))
+        if kind is ast.CompoundStatement:
+            statements = [child for child in children if not is_empty(child)]
+            self.removed["compounds"] += len(children) - len(statements)
+            if unchanged and len(statements) == len(children):
+                return statement
+            return ast.CompoundStatement(statements)
+        if kind is ast.IfStatement:
+            then_stmt = children[0]
+            else_stmt = children[1] if len(children) > 1 else None
+            if is_empty(else_stmt):
+                saved = self._difference(ast.IfStatement(statement.condition, else_stmt, else_stmt), ast.IfStatement(statement.condition, else_stmt))
+                if saved is not None:
+                    self.saved += saved
+                    self.removed["branches"] += 1
+                    else_stmt = None
+                    unchanged = False
+            if is_empty(then_stmt) and else_stmt is None and is_side_effect_free(statement.condition, self.scope):
+                saved = self._difference(ast.IfStatement(statement.condition, then_stmt), then_stmt)
+                if saved is not None:
+                    self.saved += saved
+                    self.removed["branches"] += 1
+                    return then_stmt
+            return statement if unchanged else ast.IfStatement(statement.condition, then_stmt, else_stmt)
+        return with_children(statement, children)
+
+
+@register
+class DeadCodeElimination(Transform):
+    name = 'dce'
+    requires = ('semantic',)
+
+    def run(self, tree: ast.AbstractSyntaxTree, manager: PassManager) -> ast.AbstractSyntaxTree:
+        model = manager.analysis('semantic', tree)
+        if any(isinstance(symbols, ast.TranslationError) for scope in model.scopes.values() for symbols in scope.declarations.values()):
+            return tree
+        facts = ProgramFacts(tree, model)
+        dead = facts.dead_assignments()
+        eliminators: List[DeadCodeEliminator] = []
+
+        def rewriter(scope: Scope) -> DeadCodeEliminator:
+            eliminators.append(DeadCodeEliminator(scope, facts, dead))
+            return eliminators[-1]
+
+        result = rewrite_statements(tree, model, rewriter)
+        for key in REMOVED:
+            manager.record(self.name, key, sum(eliminator.removed[key] for eliminator in eliminators))
+        manager.record(self.name, "estimated instructions saved", sum(eliminator.saved for eliminator in eliminators))
+        return result
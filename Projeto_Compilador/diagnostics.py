@@ -0,0 +1,59 @@
+from typing import List, Optional, Tuple
+
+
+class Diagnostic:
+    def __init__(self, kind: str, message: str, line: Optional[int] = None, column: Optional[int] = None, token: Optional[Tuple[str, object]] = None):
+        self.kind = kind
+        self.message = message
+        self.line = line
+        self.column = column
+        self.token = token
+
+    def __repr__(self):
+        return f"Diagnostic(kind={self.kind}, message={self.message!r}, line={self.line}, column={self.column}, token={self.token})"
+
+    def __str__(self):
+        return self.message
+
+
+class TooManyErrors(Exception):
+    pass
+
+
+class Diagnostics:
+    def __init__(self, max_errors: Optional[int] = 100):
+        self.max_errors = max_errors
+        self.records: List[Diagnostic] = []
+        self.count = 0
+        self.stopped = False
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def clear(self):
+        self.records = []
+        self.count = 0
+        self.stopped = False
+
+    def add(self, kind: str, message: str, line: Optional[int] = None, column: Optional[int] = None, token: Optional[Tuple[str, object]] = None):
+        if self.stopped:
+            # a later phase reading input the lexer already gave up on adds nothing
+            raise TooManyErrors(f"Stopped after {self.count} errors")
+        self.count += 1
+        self.records.append(Diagnostic(kind, message, line, column, token))
+        # past the cap the input is not worth reading any further
+        if self.max_errors is not None and self.count >= self.max_errors:
+            self.stop()
+
+    def stop(self):
+        self.stopped = True
+        raise TooManyErrors(f"Stopped after {self.count} errors")
+
+    def render(self) -> str:
+        lines = [str(record) for record in self.records]
+        if self.stopped:
+            lines.append(f"Stopped after {self.count} errors")
+        return "\n".join(lines)
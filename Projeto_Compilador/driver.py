@@ -0,0 +1,140 @@
+import argparse
+import multiprocessing
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+import syntax as ast
+from cache import ASTCache, CompileCache, source_hash
+from vm_translator import PascalEWVMTranslator
+from parser import PascalParser
+from lexer import PascalLexer
+from optimizer import OPTIMIZATION_LEVELS, optimize
+
+
+class CompileResult:
+    def __init__(self, path: str, code: List[str], errors: List[str], cached: bool = False, ast_cached: bool = False):
+        self.path = path
+        self.code = code
+        self.errors = errors
+        self.cached = cached
+        self.ast_cached = ast_cached
+
+    def __repr__(self):
+        return f"CompileResult(path={self.path}, instructions={len(self.code)}, errors={len(self.errors)}, cached={self.cached}, ast_cached={self.ast_cached})"
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class Compiler:
+    def __init__(self, cache: Optional[CompileCache] = None, options: Optional[Dict[str, object]] = None,
+                 ast_cache: Optional[ASTCache] = None):
+        self.lexer = PascalLexer()
+        self.lexer.build()
+        self.parser = PascalParser(self.lexer, write_tables=False)
+        self.cache = cache
+        self.ast_cache = ast_cache
+        self.options = options or {}
+        self.level = int(self.options.get('opt_level', 0))
+        self.translator = PascalEWVMTranslator(bool(self.options.get('check_bounds', False)))
+
+    def compile_file(self, path: str) -> CompileResult:
+        if self.cache is None:
+            return self._compile(path)
+        try:
+            key = self.cache.key(source_hash(path), self.options)
+        except FileNotFoundError:
+            return CompileResult(path, [], [f"Error: File {path} not found"])
+        code = self.cache.get(key)
+        if code is not None:
+            return CompileResult(path, code, [], cached=True)
+        result = self._compile(path)
+        if result.ok and result.code:
+            self.cache.put(key, result.code)
+        return result
+
+    def _compile(self, path: str) -> CompileResult:
+        self.translator.reset()
+        ast_cached = False
+        try:
+            if self.ast_cache is None:
+                ast_tree = self.parser.parse_file(path, use_mmap=True)
+            else:
+                hits = self.ast_cache.hits
+                ast_tree = self.ast_cache.parse_file(self.parser, path, use_mmap=True)
+                ast_cached = self.ast_cache.hits > hits
+            if self.parser.error_count > 0:
+                errors = [str(record) for record in self.parser.diagnostics]
+                errors.append(f"Error: Parsing failed for {path} with {self.parser.error_count} errors")
+                return CompileResult(path, [], errors)
+            ast_tree = optimize(ast_tree, self.level, self.options)
+            return CompileResult(path, self.translator.translate(ast_tree), [], ast_cached=ast_cached)
+        except FileNotFoundError:
+            return CompileResult(path, [], [f"Error: File {path} not found"])
+        except ast.TranslationError as e:
+            return CompileResult(path, [], [f"Translation error in {path}: {e}"])
+        except Exception as e:
+            return CompileResult(path, [], [f"Unexpected error processing {path}: {e!r}"])
+
+
+_worker_compiler: Optional[Compiler] = None
+
+def _init_worker(cache_dir: Optional[str], cache_bytes: int, options: Optional[Dict[str, object]]):
+    global _worker_compiler
+    _worker_compiler = _open_compiler(cache_dir, cache_bytes, options)
+
+def _open_compiler(cache_dir: Optional[str], cache_bytes: int, options: Optional[Dict[str, object]]) -> Compiler:
+    if not cache_dir:
+        return Compiler(None, options)
+    # parsed trees share the directory under their own suffix, so other options still skip lexing and parsing
+    return Compiler(CompileCache(cache_dir, cache_bytes), options, ASTCache(cache_dir, cache_bytes))
+
+def _compile_in_worker(path: str) -> CompileResult:
+    return _worker_compiler.compile_file(path)
+
+def compile_files(paths: Iterable[str], workers: Optional[int] = None, chunksize: int = 8,
+                  cache_dir: Optional[str] = None, cache_bytes: int = 256 * 1024 * 1024,
+                  options: Optional[Dict[str, object]] = None) -> Iterator[CompileResult]:
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        compiler = _open_compiler(cache_dir, cache_bytes, options)
+        for path in paths:
+            yield compiler.compile_file(path)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(cache_dir, cache_bytes, options)) as pool:
+        yield from pool.imap(_compile_in_worker, paths, chunksize)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compile Pascal files to EWVM code")
+    arg_parser.add_argument("files", nargs="+")
+    arg_parser.add_argument("-j", "--jobs", type=int, default=None, help="number of worker processes")
+    arg_parser.add_argument("--cache", default=None, help="compile cache directory")
+    arg_parser.add_argument("--cache-size", type=int, default=256, help="compile cache size limit in MiB")
+    arg_parser.add_argument("-O", dest="opt_level", type=int, default=0, choices=sorted(OPTIMIZATION_LEVELS), help="optimization level")
+    arg_parser.add_argument("--check-bounds", action="store_true", help="trap on out-of-range array indices")
+    args = arg_parser.parse_args()
+    options = {"opt_level": args.opt_level, "check_bounds": args.check_bounds}
+
+    compiled = 0
+    hits = 0
+    ast_hits = 0
+    for result in compile_files(args.files, args.jobs, cache_dir=args.cache, cache_bytes=args.cache_size * 1024 * 1024, options=options):
+        hits += result.cached
+        ast_hits += result.ast_cached
+        print(f"\nProcessing {result.path}:")
+        print("-" * 50)
+        for error in result.errors:
+            print(error)
+        if result.code:
+            compiled += 1
+            print("Generated EWVM code:")
+            print("\n".join(result.code))
+        print("-" * 50)
+    print(f"\n{compiled}/{len(args.files)} files compiled")
+    if args.cache:
+        print(f"Cache: {hits} hits, {len(args.files) - hits} misses")
+        print(f"AST cache: {ast_hits} hits, {len(args.files) - hits - ast_hits} misses")
+
+if __name__ == '__main__':
+    main()
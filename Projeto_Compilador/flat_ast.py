@@ -0,0 +1,152 @@
+from array import array
+from typing import Dict, List, Tuple
+import syntax as ast
+
+LIST_KIND = len(ast.NODE_CLASSES)
+
+
+class FlatNode:
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if isinstance(other, FlatNode) and other.tree is self.tree and other.index == self.index:
+            return True
+        return ast.Node.__eq__(self, other)
+
+    __hash__ = ast.Node.__hash__
+
+
+def _field_getter(position: int):
+    def get(view):
+        tree = view.tree
+        ref = tree.fields[tree.starts[view.index] + position]
+        if ref < 0:
+            return tree.payloads[-ref - 1]
+        views = tree._views
+        node = views[ref] if ref < len(views) else None
+        return node if node is not None else tree.node(ref)
+    return get
+
+def _view_class(cls):
+    namespace = {'__slots__': ('tree', 'index'), 'node_class': cls, '_fields': cls.__slots__}
+    for position, field in enumerate(cls.__slots__):
+        namespace[field] = property(_field_getter(position))
+    return type(cls.__name__, (FlatNode, cls), namespace)
+
+VIEW_CLASSES = tuple(_view_class(cls) for cls in ast.NODE_CLASSES)
+
+
+class FlatTree:
+    def __init__(self):
+        self.kinds = array('B')
+        self.starts = array('I', [0])
+        self.fields = array('i')
+        self.payloads: List[object] = []
+        self._payload_ids: Dict[Tuple[type, object], int] = {}
+        # analyses key their annotations by node identity, so each index hands out one view
+        self._views: List[object] = []
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __repr__(self):
+        return f"FlatTree(nodes={len(self)}, fields={len(self.fields)}, payloads={len(self.payloads)})"
+
+    def __eq__(self, other):
+        return isinstance(other, (FlatTree, ast.AbstractSyntaxTree)) and self.program == other.program
+
+    @property
+    def program(self) -> ast.Program:
+        return self.node(0)
+
+    def evaluate(self, translator: ast.Translator):
+        return translator.visit_ast(self)
+
+    def kind(self, index: int) -> type:
+        kind = self.kinds[index]
+        return list if kind == LIST_KIND else ast.NODE_CLASSES[kind]
+
+    def children(self, index: int) -> List[object]:
+        return [self._value(ref) for ref in self.fields[self.starts[index]:self.starts[index + 1]]]
+
+    def node(self, index: int):
+        if len(self._views) != len(self.kinds):
+            self._views = [None] * len(self.kinds)
+        view = self._views[index]
+        if view is not None:
+            return view
+        kind = self.kinds[index]
+        if kind == LIST_KIND:
+            view = self.children(index)
+        else:
+            cls = VIEW_CLASSES[kind]
+            view = cls.__new__(cls)
+            view.tree = self
+            view.index = index
+        self._views[index] = view
+        return view
+
+    def release(self):
+        self._views = []
+
+    def field(self, index: int, position: int):
+        return self._value(self.fields[self.starts[index] + position])
+
+    def _value(self, ref: int):
+        if ref < 0:
+            return self.payloads[-ref - 1]
+        return self.node(ref)
+
+    def nbytes(self) -> int:
+        return sum(len(a) * a.itemsize for a in (self.kinds, self.starts, self.fields))
+
+    @classmethod
+    def from_tree(cls, tree: ast.AbstractSyntaxTree) -> 'FlatTree':
+        flat = cls()
+        seen: Dict[int, int] = {}
+        stack = [(tree.program, -1)]
+        while stack:
+            value, slot = stack.pop()
+            if isinstance(value, list):
+                kind, items = LIST_KIND, value
+            elif isinstance(value, ast.Node):
+                kind, items = ast.NODE_IDS[type(value)], [getattr(value, field) for field in type(value).__slots__]
+            else:
+                flat.fields[slot] = flat._payload(value)
+                continue
+            ref = seen.get(id(value))
+            if ref is None:
+                ref = seen[id(value)] = len(flat.kinds)
+                start = len(flat.fields)
+                flat.kinds.append(kind)
+                flat.fields.extend([0] * len(items))
+                flat.starts.append(len(flat.fields))
+                stack.extend((item, start + position) for position, item in reversed(list(enumerate(items))))
+            if slot >= 0:
+                flat.fields[slot] = ref
+        return flat
+
+    def _payload(self, value) -> int:
+        key = (type(value), value)
+        payload_id = self._payload_ids.get(key)
+        if payload_id is None:
+            payload_id = self._payload_ids[key] = len(self.payloads)
+            self.payloads.append(value)
+        return -payload_id - 1
+
+    def to_tree(self) -> ast.AbstractSyntaxTree:
+        nodes = []
+        for kind in self.kinds:
+            if kind == LIST_KIND:
+                nodes.append([])
+            else:
+                cls = ast.NODE_CLASSES[kind]
+                nodes.append(cls.__new__(cls))
+        for index, node in enumerate(nodes):
+            values = [self.payloads[-ref - 1] if ref < 0 else nodes[ref] for ref in self.fields[self.starts[index]:self.starts[index + 1]]]
+            if isinstance(node, list):
+                node.extend(values)
+            else:
+                for field, value in zip(type(node).__slots__, values):
+                    setattr(node, field, value)
+        return ast.AbstractSyntaxTree(nodes[0])
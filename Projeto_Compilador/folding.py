@@ -0,0 +1,210 @@
+from typing import Dict, List, Optional, Tuple
+import syntax as ast
+from passes import PassManager, Transform, register
+from semantic import WRITE_PROCEDURES, Scope, integer_operation, integer_power, transform_program
+
+COMPARISONS = {
+    "=": lambda left, right: left == right,
+    "<>": lambda left, right: left != right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+}
+INVERTED_COMPARISONS = {"<>": "=", "<": ">=", "<=": ">", ">": "<=", ">=": "<"}
+PURE_OPERATORS = ("+", "-", "*", "=", "<>", "<", "<=", ">", ">=", "and", "or")
+DESCRIBED = (ast.Constant, ast.VariableAccess, ast.BinaryExpression, ast.SignedExpression, ast.NotExpression, ast.Exponentiation)
+
+
+def boolean_literal(value: bool) -> ast.VariableAccess:
+    return ast.VariableAccess(ast.Identifier("true" if value else "false"))
+
+def literal_value(expr: ast.Expression) -> Optional[int | bool]:
+    kind = type(expr)
+    if kind is ast.Constant and expr.kind == 'integer':
+        return int(expr.value)
+    if kind is ast.VariableAccess:
+        name = expr.identifier.name.lower()
+        if name == "true":
+            return True
+        if name == "false":
+            return False
+    return None
+
+
+class ConstantFolder:
+    def __init__(self, scope: Optional[Scope] = None):
+        self.scope = scope
+        self.facts: Dict[int, Tuple[ast.Node, Optional[str], bool]] = {}
+        self.surfaced: Dict[int, ast.Node] = {}
+        self.folded = 0
+
+    def __call__(self, node):
+        kind = type(node)
+        if kind not in DESCRIBED and kind is not ast.ProcedureCall:
+            return node
+        if kind is ast.BinaryExpression:
+            result = self._binary(node)
+        elif kind is ast.SignedExpression:
+            result = self._signed(node)
+        elif kind is ast.NotExpression:
+            result = self._not(node)
+        elif kind is ast.Exponentiation:
+            result = self._exponentiation(node)
+        elif kind is ast.ProcedureCall:
+            return self._write(node) if node.args and node.identifier.name.lower() in WRITE_PROCEDURES else node
+        else:
+            result = node
+        if result is not node:
+            self.folded += 1
+        self.facts[id(result)] = (result, *self._describe(result))
+        return result
+
+    def fact(self, expr: ast.Expression) -> Tuple[Optional[str], bool]:
+        known = self.facts.get(id(expr))
+        if known is None or known[0] is not expr:
+            return None, False
+        return known[1], known[2]
+
+    def _describe(self, expr: ast.Expression) -> Tuple[Optional[str], bool]:
+        kind = type(expr)
+        if kind is ast.Constant:
+            if expr.kind == 'string':
+                return ("char" if len(expr.value) == 1 else "string"), True
+            return expr.kind, True
+        if kind is ast.VariableAccess:
+            if literal_value(expr) is not None:
+                return "boolean", True
+            symbol = self.scope.bindings.get(id(expr)) if self.scope is not None else None
+            if symbol is None or symbol.is_function:
+                return None, False
+            return symbol.type, True
+        if kind is ast.BinaryExpression:
+            left_type, left_pure = self.fact(expr.left)
+            right_type, right_pure = self.fact(expr.right)
+            pure = left_pure and right_pure and expr.operator in PURE_OPERATORS
+            if expr.operator in COMPARISONS:
+                return "boolean", pure
+            if expr.operator in ("and", "or"):
+                return ("boolean" if left_type == right_type == "boolean" else None), pure
+            integer = left_type == "integer" and right_type == "integer" and expr.operator != "/"
+            return ("integer" if integer else None), pure
+        if kind is ast.SignedExpression:
+            operand_type, pure = self.fact(expr.expression)
+            return (operand_type if operand_type == "integer" else None), pure
+        if kind is ast.NotExpression:
+            return "boolean", self.fact(expr.expression)[1]
+        return None, False
+
+    def _surface(self, expr: ast.Expression) -> ast.Expression:
+        self.surfaced[id(expr)] = expr
+        return expr
+
+    def _binary(self, node: ast.BinaryExpression) -> ast.Expression:
+        operator, left, right = node.operator, node.left, node.right
+        left_value, right_value = literal_value(left), literal_value(right)
+        if type(left_value) is int and type(right_value) is int:
+            if operator in COMPARISONS:
+                return self._surface(boolean_literal(COMPARISONS[operator](left_value, right_value)))
+            value = integer_operation(operator, left_value, right_value)
+            return node if value is None else ast.Constant('integer', value)
+        if type(left_value) is bool and type(right_value) is bool and operator in ("and", "or", "=", "<>"):
+            if operator in ("=", "<>"):
+                return self._surface(boolean_literal(COMPARISONS[operator](left_value, right_value)))
+            return self._surface(boolean_literal(left_value and right_value if operator == "and" else left_value or right_value))
+        if operator in ("and", "or"):
+            return self._logical(node, left, right, left_value, right_value)
+        left_type, left_pure = self.fact(left)
+        right_type, right_pure = self.fact(right)
+        if left_type != "integer" or right_type != "integer":
+            return node
+        if right_value == 0 and operator in ("+", "-") or right_value == 1 and operator in ("*", "div"):
+            return self._surface(left)
+        if left_value == 0 and operator == "+" or left_value == 1 and operator == "*":
+            return self._surface(right)
+        if operator == "*" and (left_value == 0 and right_pure or right_value == 0 and left_pure):
+            return ast.Constant('integer', 0)
+        return node
+
+    def _logical(self, node: ast.BinaryExpression, left, right, left_value, right_value) -> ast.Expression:
+        absorbing = node.operator == "or"
+        for value, other in ((left_value, right), (right_value, left)):
+            if type(value) is not bool:
+                continue
+            other_type, other_pure = self.fact(other)
+            if value is absorbing and other_pure:
+                return self._surface(boolean_literal(absorbing))
+            if value is not absorbing and other_type == "boolean":
+                return self._surface(other)
+        return node
+
+    def _signed(self, node: ast.SignedExpression) -> ast.Expression:
+        operand = node.expression
+        value = literal_value(operand)
+        if node.sign != "-":
+            return node
+        if type(value) is int:
+            value = integer_operation("-", 0, value)
+            return node if value is None else ast.Constant('integer', value)
+        if type(operand) is ast.SignedExpression and operand.sign == "-" and self.fact(operand.expression)[0] == "integer":
+            return self._surface(operand.expression)
+        return node
+
+    def _not(self, node: ast.NotExpression) -> ast.Expression:
+        operand = node.expression
+        value = literal_value(operand)
+        if type(value) is bool:
+            return self._surface(boolean_literal(not value))
+        kind = type(operand)
+        if kind is ast.NotExpression and self.fact(operand.expression)[0] == "boolean":
+            return self._surface(operand.expression)
+        if kind is ast.BinaryExpression and operand.operator in INVERTED_COMPARISONS:
+            if self.fact(operand.left)[0] == "integer" and self.fact(operand.right)[0] == "integer":
+                return ast.BinaryExpression(INVERTED_COMPARISONS[operand.operator], operand.left, operand.right)
+        return node
+
+    def _exponentiation(self, node: ast.Exponentiation) -> ast.Expression:
+        exponent = literal_value(node.exponent)
+        if type(exponent) is not int:
+            return node
+        if exponent == 0 and self.fact(node.base) == ("integer", True):
+            return ast.Constant('integer', 1)
+        base = literal_value(node.base)
+        if type(base) is int:
+            value = integer_power(base, exponent)
+            return node if value is None else ast.Constant('integer', value)
+        if exponent == 1:
+            return self._surface(node.base)
+        return node
+
+    def _write(self, node: ast.ProcedureCall) -> ast.ProcedureCall:
+        # write arguments pick writes/writei by shape, so folded operands must not surface as bare variables
+        args: List[ast.ActualParameter] = []
+        for arg in node.args:
+            expr = arg.expression
+            if type(expr) is ast.VariableAccess and self.surfaced.get(id(expr)) is expr:
+                value = literal_value(expr)
+                expr = ast.SignedExpression("+", expr) if value is None else ast.Constant('integer', int(value))
+                arg = ast.ActualParameter(expr, arg.width, arg.precision)
+            args.append(arg)
+        if all(new is old for new, old in zip(args, node.args)):
+            return node
+        return ast.ProcedureCall(node.identifier, args)
+
+
+@register
+class ConstantFolding(Transform):
+    name = 'fold'
+    requires = ('semantic',)
+
+    def run(self, tree: ast.AbstractSyntaxTree, manager: PassManager) -> ast.AbstractSyntaxTree:
+        model = manager.analysis('semantic', tree)
+        folders: List[ConstantFolder] = []
+
+        def rewriter(scope: Scope) -> ConstantFolder:
+            folders.append(ConstantFolder(scope))
+            return folders[-1]
+
+        result = transform_program(tree, model, rewriter)
+        manager.record(self.name, "folded", sum(folder.folded for folder in folders))
+        return result
@@ -0,0 +1,481 @@
+from typing import Dict, List, Optional, Set, Tuple
+import syntax as ast
+from cse import ExpressionAnalyzer, Info, replace_roots
+from dce import accumulates_readln, is_side_effect_free, map_statements, with_children
+from folding import literal_value
+from passes import PassManager, Transform, register
+from semantic import NUMERIC_TYPES, READ_PROCEDURES, WRITE_PROCEDURES, Scope, SemanticModel, Symbol, SymbolTable, analyze, call_graph, node_cost, power_may_trap, reads_into_array, rewrite_statements, type_name
+
+# callees whose body costs more than this (see semantic.node_cost) keep their call
+INLINE_BUDGET = 40
+# every round inlines the current leaves of the call graph, which can turn their callers into leaves
+INLINE_ROUNDS = 4
+TEMPORARY_PREFIX = "$inl"
+LOCAL_TYPES = ("integer", "real", "boolean", "string")
+PARAMETER_TYPES = LOCAL_TYPES + ("char",)
+DIVISIONS = ("/", "div", "mod")
+
+
+def resolve(table: SymbolTable, mode: str, name: str, function: Optional[str]) -> Optional[Symbol]:
+    if mode == 'target':
+        return table.functions.get(name) or table.lookup(name, function)
+    if mode == 'element':
+        return table.globals.get(name)
+    return table.lookup(name, function)
+
+def mentions(value, scope: Scope) -> Set[int]:
+    bindings = scope.bindings
+    return {id(bindings[id(node)]) for node in ast.walk(value) if bindings.get(id(node)) is not None}
+
+def initial_value(type_name: str) -> ast.Expression:
+    if type_name == "string":
+        return ast.Constant('string', '')
+    if type_name == "boolean":
+        return ast.VariableAccess(ast.Identifier("false"))
+    return ast.Constant('integer', 0)
+
+def copy_operand(expr: ast.Expression) -> ast.Expression:
+    if type(expr) is ast.Constant:
+        return ast.Constant(expr.kind, expr.value)
+    return ast.VariableAccess(ast.Identifier(expr.identifier.name))
+
+def clone(statement: ast.Statement, roles: Dict[int, Symbol], names: Dict[int, ast.Expression]) -> ast.Statement:
+    # every copy gets fresh nodes, since analyses key their annotations by node identity
+    def combine(item, args):
+        if args is None:
+            return item
+        if type(item) is list:
+            return args
+        symbol = roles.get(id(item))
+        if symbol is not None:
+            if type(item) is ast.VariableAccess:
+                return copy_operand(names[id(symbol)])
+            args[0] = ast.Identifier(names[id(symbol)].identifier.name)
+        node = item.node_class.__new__(item.node_class)
+        for field, arg in zip(item._fields, args):
+            setattr(node, field, arg)
+        return node
+
+    return ast.fold(statement, combine)
+
+
+class Callee:
+    __slots__ = ('symbol', 'statements', 'parameters', 'initialized', 'renamed', 'roles', 'forwarding', 'references', 'writes', 'io', 'traps')
+
+    def __init__(self, symbol: Symbol, statements: ast.CompoundStatement, parameters: List[Symbol], initialized: List[Symbol]):
+        self.symbol = symbol
+        self.statements = statements
+        self.parameters = parameters
+        self.initialized = initialized
+        # parameters, locals, the result and earlier temporaries get fresh storage at every call site
+        self.renamed: Dict[int, Symbol] = {}
+        self.roles: Dict[int, Symbol] = {}
+        # parameters the body never assigns can take the argument itself: 'variable' or also 'literal'
+        self.forwarding: Dict[int, str] = {}
+        # names the body shares with the caller, which must mean the same variable there
+        self.references: List[Tuple[str, str, Symbol]] = []
+        self.writes: Set[int] = set()
+        self.io = False
+        self.traps = False
+
+
+def summarize(declaration: ast.FunctionDeclaration, model: SemanticModel) -> Optional[Callee]:
+    name = declaration.heading.identifier.name
+    body = declaration.body
+    symbol = model.table.functions.get(name)
+    if not isinstance(body, ast.Block) or symbol is None:
+        return None
+    scope = model.scope(name)
+    bindings = scope.bindings
+    variables = model.table.locals[name]
+    parameters = []
+    for section in declaration.heading.parameters:
+        if section.kind != 'value' or type_name(section.type_denoter) not in PARAMETER_TYPES:
+            return None
+        parameters.extend(variables[ident.name] for ident in section.identifiers)
+    if len(set(map(id, parameters))) != len(parameters):
+        return None
+    initialized = []
+    for variable in declaration.local_variables:
+        if type(variable.type_denoter) is not ast.NamedType or variable.type_denoter.name not in LOCAL_TYPES:
+            return None
+        initialized.extend(scope.declared(variable))
+    # locals the body assigns before anything reads them need no zero at the call site
+    assigned: Set[int] = set()
+    seen: Set[int] = set()
+    for statement in body.statements.statements:
+        kind = type(statement)
+        if kind is ast.AssignmentStatement and type(statement.variable) is ast.VariableAccess or kind is ast.ForStatement:
+            target = bindings.get(id(statement))
+            reads = mentions(statement.expression if kind is ast.AssignmentStatement else [statement.initial_value, statement.final_value], scope)
+            if target is not None and id(target) not in seen and id(target) not in reads:
+                assigned.add(id(target))
+        seen.update(mentions(statement, scope))
+    initialized = [variable for variable in initialized if id(variable) not in assigned]
+    callee = Callee(symbol, body.statements, parameters, initialized)
+    sites: List[Tuple[Optional[ast.Node], str, str, Optional[Symbol], bool]] = []
+    expressions: List[ast.Expression] = []
+    pending = [(body.statements, False)]
+    while pending:
+        statement, looped = pending.pop()
+        kind = type(statement)
+        if kind is ast.CompoundStatement:
+            pending.extend((child, looped) for child in statement.statements)
+        elif kind is ast.AssignmentStatement:
+            target = statement.variable
+            if type(target) is ast.IndexedVariable:
+                sites.append((target.variable, 'indexed', target.variable.identifier.name, bindings.get(id(target)), True))
+                expressions.extend(target.indices)
+            else:
+                written = bindings.get(id(statement))
+                # the result is whatever the last assignment left behind, so it may only be assigned once per call
+                if written is symbol and (looped or scope.types.get(id(statement.expression)) not in NUMERIC_TYPES):
+                    return None
+                sites.append((target, 'target', target.identifier.name, written, True))
+            expressions.append(statement.expression)
+        elif kind is ast.ProcedureCall:
+            procedure = statement.identifier.name.lower()
+            args = statement.args or []
+            if procedure in READ_PROCEDURES:
+                callee.io = True
+                target = args[0].expression if args else None
+                if type(target) is ast.VariableAccess:
+                    sites.append((target, 'exact', target.identifier.name, bindings.get(id(args[0])), True))
+                elif type(target) is ast.IndexedVariable:
+                    sites.append((target.variable, 'element', target.variable.identifier.name, bindings.get(id(args[0])), True))
+            elif procedure in WRITE_PROCEDURES:
+                callee.io = True
+                for arg in args:
+                    expressions.append(arg.expression)
+                    if type(arg.expression) is ast.VariableAccess:
+                        if bindings.get(id(arg)) is not bindings.get(id(arg.expression)):
+                            return None
+                        sites.append((None, 'exact', arg.expression.identifier.name, bindings.get(id(arg)), False))
+            else:
+                return None
+        elif kind is ast.IfStatement:
+            expressions.append(statement.condition)
+            pending.extend((child, looped) for child in (statement.then_stmt, statement.else_stmt) if child is not None)
+        elif kind is ast.WhileStatement:
+            expressions.append(statement.condition)
+            pending.append((statement.body, True))
+        elif kind is ast.ForStatement:
+            if reads_into_array(statement.body):
+                return None
+            sites.append((statement, 'exact', statement.control_var.name, bindings.get(id(statement)), True))
+            expressions.extend((statement.initial_value, statement.final_value))
+            pending.append((statement.body, True))
+        else:
+            return None
+    callee.traps = not all(is_side_effect_free(expression, scope) for expression in expressions)
+    while expressions:
+        node = expressions.pop()
+        kind = type(node)
+        if kind is list:
+            expressions.extend(node)
+        elif kind is ast.VariableAccess:
+            if literal_value(node) is None:
+                sites.append((node, 'value', node.identifier.name.lower(), bindings.get(id(node)), False))
+        elif kind is ast.IndexedVariable:
+            sites.append((node.variable, 'indexed', node.variable.identifier.name, bindings.get(id(node)), False))
+            expressions.extend(node.indices)
+        elif kind is ast.FunctionCall and bindings.get(id(node)) is not None:
+            return None
+        elif isinstance(node, ast.Node):
+            expressions.extend(getattr(node, field) for field in node._fields)
+    callee.renamed = {id(variable): variable for variable in variables.values()}
+    callee.renamed[id(symbol)] = symbol
+    usage: Dict[int, Set[str]] = {}
+    for node, mode, identifier, variable, written in sites:
+        if variable is None or variable.is_function and variable is not symbol:
+            return None
+        if id(variable) in callee.renamed or variable.name.startswith(TEMPORARY_PREFIX):
+            callee.renamed[id(variable)] = variable
+            usage.setdefault(id(variable), set()).add('written' if written else mode)
+            if node is not None:
+                callee.roles[id(node)] = variable
+            continue
+        callee.references.append((mode, identifier, variable))
+        if written:
+            callee.writes.add(id(variable))
+    for parameter in parameters:
+        modes = usage.get(id(parameter), set())
+        if 'written' not in modes:
+            callee.forwarding[id(parameter)] = 'literal' if modes <= {'value'} else 'variable'
+    size = node_cost(body.statements, scope)
+    return callee if size is not None and size <= INLINE_BUDGET else None
+
+def summarize_callees(tree: ast.AbstractSyntaxTree, model: SemanticModel) -> Dict[str, Callee]:
+    functions = tree.program.block.functions or []
+    graph = call_graph(tree, model)
+    names = [function.heading.identifier.name for function in functions]
+    callees = {}
+    for name, function in zip(names, functions):
+        # only leaves of the call graph are candidates, which also rules out recursion
+        if names.count(name) != 1 or graph.get(name):
+            continue
+        callee = summarize(function, model)
+        if callee is not None:
+            callees[name] = callee
+    return callees
+
+
+class Inliner(ExpressionAnalyzer):
+    def __init__(self, scope: Scope, table: SymbolTable, callees: Dict[str, Callee], temporaries: Dict[str, List[str]]):
+        super().__init__(scope)
+        self.table = table
+        self.callees = callees
+        self.temporaries = temporaries
+        self.counters: Dict[str, int] = {}
+        self.resolved: Dict[str, bool] = {}
+        self.expanded: Set[int] = set()
+        self.inlined: Set[str] = set()
+        self.calls = 0
+
+    def __call__(self, root: ast.CompoundStatement) -> ast.CompoundStatement:
+        return map_statements(root, self._rebuild)
+
+    def _rebuild(self, statement: ast.Statement, children: List[ast.Statement]) -> ast.Statement:
+        if type(statement) is ast.CompoundStatement:
+            flattened = []
+            for child in children:
+                if id(child) in self.expanded:
+                    flattened.extend(child.statements)
+                else:
+                    flattened.append(child)
+            children = flattened
+        return self._expand(with_children(statement, children))
+
+    def _roots(self, statement: ast.Statement) -> Optional[List[ast.Node]]:
+        kind = type(statement)
+        if kind is ast.AssignmentStatement:
+            target = statement.variable
+            return [statement.expression] + (target.indices if type(target) is ast.IndexedVariable else [])
+        if kind is ast.ProcedureCall:
+            name = statement.identifier.name.lower()
+            if name in WRITE_PROCEDURES:
+                return [arg.expression for arg in statement.args or []]
+            # a function called as a statement only keeps its side effects
+            return [statement] if name not in READ_PROCEDURES else None
+        if kind is ast.IfStatement:
+            return [statement.condition]
+        if kind is ast.ForStatement and not reads_into_array(statement.body):
+            return [statement.initial_value]
+        return None
+
+    def _describe(self, item, args) -> Info:
+        info = super()._describe(item, args)
+        if type(item) is ast.FunctionCall and self.scope.bindings.get(id(item)) is not None:
+            info.type = "integer"
+        return info
+
+    def _expand(self, statement: ast.Statement) -> ast.Statement:
+        roots = self._roots(statement)
+        if roots is None:
+            return statement
+        bindings = self.scope.bindings
+        calls: List[Tuple[ast.Node, List[ast.ActualParameter], Callee, Optional[ast.Node]]] = []
+        # variables read by the statement and by the arguments of calls still being evaluated
+        contexts: List[Set[int]] = [set()]
+        enclosing: List[Optional[ast.Node]] = [None]
+        traps = output = False
+        for root in roots:
+            pending = [root]
+            while pending:
+                node = pending.pop()
+                kind = type(node)
+                if kind is list:
+                    pending.extend(reversed(node))
+                    continue
+                if kind is tuple:
+                    contexts.pop()
+                    enclosing.pop()
+                    if not self._accept(node[1], node[2], contexts, traps, output):
+                        return statement
+                    calls.append(node)
+                    continue
+                if not isinstance(node, ast.Node):
+                    continue
+                if kind is ast.FunctionCall or kind is ast.ProcedureCall:
+                    symbol = bindings.get(id(node))
+                    if symbol is not None:
+                        callee = self.callees.get(symbol.name)
+                        # a call left in place could run code that reuses these temporaries
+                        if callee is None or callee.symbol is not symbol:
+                            return statement
+                        args = (node.params if kind is ast.FunctionCall else node.args) or []
+                        pending.append((node, args, callee, enclosing[-1]))
+                        contexts.append(set())
+                        enclosing.append(node)
+                        pending.extend(arg.expression for arg in reversed(args))
+                        continue
+                elif kind is ast.VariableAccess or kind is ast.IndexedVariable:
+                    symbol = bindings.get(id(node))
+                    if symbol is not None:
+                        contexts[-1].add(id(symbol))
+                    if kind is ast.IndexedVariable:
+                        pending.extend(reversed(node.indices))
+                        continue
+                elif kind is ast.BinaryExpression and node.operator in DIVISIONS and not literal_value(node.right):
+                    traps = True
+                elif kind is ast.Exponentiation and power_may_trap(node):
+                    traps = True
+                pending.extend(getattr(node, field) for field in reversed(node._fields))
+            output = type(statement) is ast.ProcedureCall
+        if not calls:
+            return statement
+        self.counters = {}
+        statements: List[ast.Statement] = []
+        # results by the call they are an argument of; a rebuilt parent no longer matches by identity
+        results: Dict[Optional[int], Dict[int, ast.Expression]] = {}
+        for node, args, callee, parent in calls:
+            names: Dict[int, ast.Expression] = {}
+            inner = results.get(id(node), {})
+            for parameter, arg in zip(callee.parameters, args):
+                value = ast.transform(arg.expression, lambda item: inner.get(id(item), item))
+                forwarded = self._forward(value, parameter, callee)
+                if forwarded is not None:
+                    names[id(parameter)] = forwarded
+                    continue
+                names[id(parameter)] = ast.VariableAccess(ast.Identifier(self._temporary(parameter.type)))
+                statements.append(ast.AssignmentStatement(copy_operand(names[id(parameter)]), value))
+            for key, variable in callee.renamed.items():
+                if key not in names:
+                    names[key] = ast.VariableAccess(ast.Identifier(self._temporary("integer" if variable is callee.symbol else variable.type)))
+            for variable in callee.initialized:
+                statements.append(ast.AssignmentStatement(copy_operand(names[id(variable)]), initial_value(variable.type)))
+            statements.extend(clone(callee.statements, callee.roles, names).statements)
+            results.setdefault(None if parent is None else id(parent), {})[id(node)] = copy_operand(names[id(callee.symbol)])
+            self.inlined.add(callee.symbol.name)
+            self.calls += 1
+        outermost = results.get(None, {})
+        if id(statement) not in outermost:
+            statements.append(replace_roots(statement, lambda item: outermost.get(id(item), item)))
+        expanded = ast.CompoundStatement(statements)
+        self.expanded.add(id(expanded))
+        return expanded
+
+    def _accept(self, args: List[ast.ActualParameter], callee: Callee, contexts: List[Set[int]], traps: bool, output: bool) -> bool:
+        if len(args) != len(callee.parameters):
+            return False
+        # the body now runs before whatever encloses the call, so it must not change what that already read
+        if any(callee.writes & reads for reads in contexts):
+            return False
+        if callee.io and (output or traps) or callee.traps and output:
+            return False
+        if not self._resolves(callee):
+            return False
+        for parameter, arg in zip(callee.parameters, args):
+            info = ast.fold(arg.expression, self._describe)
+            self.found = []
+            expression = arg.expression
+            if type(expression) is ast.Constant and expression.kind == 'string':
+                argument_type = "char" if len(expression.value) == 1 else "string"
+            else:
+                argument_type = info.type
+            if parameter.type != argument_type and not (parameter.type in NUMERIC_TYPES and argument_type in NUMERIC_TYPES):
+                return False
+        return True
+
+    def _forward(self, value: ast.Expression, parameter: Symbol, callee: Callee) -> Optional[ast.Expression]:
+        mode = callee.forwarding.get(id(parameter))
+        kind = type(value)
+        if mode is None or kind is not ast.Constant and kind is not ast.VariableAccess:
+            return None
+        if kind is ast.Constant or literal_value(value) is not None:
+            value_type = value.kind if kind is ast.Constant else "boolean"
+            return value if mode == 'literal' and value_type == parameter.type else None
+        symbol = self.scope.bindings.get(id(value))
+        if symbol is None:
+            # the result of a call inlined just before this one
+            return value if value.identifier.name.startswith(TEMPORARY_PREFIX) and parameter.type == "integer" else None
+        if symbol.is_function or symbol.type != parameter.type or id(symbol) in callee.writes:
+            return None
+        if self.table.lookup(symbol.name, self.scope.function) is not symbol:
+            return None
+        return ast.VariableAccess(ast.Identifier(symbol.name))
+
+    def _resolves(self, callee: Callee) -> bool:
+        name = callee.symbol.name
+        if name not in self.resolved:
+            function = self.scope.function
+            self.resolved[name] = all(resolve(self.table, mode, identifier, function) is variable for mode, identifier, variable in callee.references)
+        return self.resolved[name]
+
+    def _temporary(self, type_name: str) -> str:
+        pool = self.temporaries.setdefault(type_name, [])
+        position = self.counters.get(type_name, 0)
+        self.counters[type_name] = position + 1
+        if position == len(pool):
+            pool.append(f"{TEMPORARY_PREFIX}{type_name[0]}{position}")
+        return pool[position]
+
+
+@register
+class FunctionInlining(Transform):
+    name = 'inline'
+    requires = ('semantic',)
+
+    def run(self, tree: ast.AbstractSyntaxTree, manager: PassManager) -> ast.AbstractSyntaxTree:
+        model = manager.analysis('semantic', tree)
+        main = model.scope()
+        if not tree.program.block.functions:
+            return tree
+        if any(isinstance(symbols, ast.TranslationError) for scope in model.scopes.values() for symbols in scope.declarations.values()):
+            return tree
+        # the readln shortcut writes slot 1, which a temporary must not take
+        if sum(symbol.size for symbols in main.declarations.values() for symbol in symbols) < 2 and accumulates_readln(tree):
+            return tree
+        temporaries: Dict[str, List[str]] = {}
+        declared: Set[str] = set()
+        inlined: Set[str] = set()
+        for iteration in range(INLINE_ROUNDS):
+            if iteration:
+                model = analyze(tree)
+            callees = summarize_callees(tree, model)
+            if not callees:
+                break
+            inliners: List[Inliner] = []
+
+            def rewriter(scope: Scope) -> Inliner:
+                inliners.append(Inliner(scope, model.table, callees, temporaries))
+                return inliners[-1]
+
+            result = rewrite_statements(tree, model, rewriter)
+            if result is tree:
+                break
+            manager.record(self.name, "calls inlined", sum(inliner.calls for inliner in inliners))
+            inlined.update(*(inliner.inlined for inliner in inliners))
+            tree = self._declare(result, temporaries, declared)
+        if not inlined:
+            return tree
+        manager.record(self.name, "temporaries", len(declared))
+        return self._prune(tree, inlined, manager)
+
+    def _declare(self, tree: ast.AbstractSyntaxTree, temporaries: Dict[str, List[str]], declared: Set[str]) -> ast.AbstractSyntaxTree:
+        declarations = []
+        for type_name, names in temporaries.items():
+            names = [name for name in names if name not in declared]
+            if names:
+                declarations.append(ast.VariableDeclaration([ast.Identifier(name) for name in names], ast.NamedType(type_name)))
+                declared.update(names)
+        if not declarations:
+            return tree
+        block = tree.program.block
+        return ast.AbstractSyntaxTree(ast.Program(tree.program.heading, ast.Block(block.functions, (block.variables or []) + declarations, block.statements)))
+
+    def _prune(self, tree: ast.AbstractSyntaxTree, inlined: Set[str], manager: PassManager) -> ast.AbstractSyntaxTree:
+        graph = call_graph(tree, analyze(tree))
+        removed: Set[str] = set()
+        while True:
+            referenced = set().union(*(callees for caller, callees in graph.items() if caller not in removed))
+            dead = inlined - referenced
+            if dead == removed:
+                break
+            removed = dead
+        if not removed:
+            return tree
+        manager.record(self.name, "functions removed", len(removed))
+        block = tree.program.block
+        functions = [function for function in block.functions if function.heading.identifier.name not in removed]
+        return ast.AbstractSyntaxTree(ast.Program(tree.program.heading, ast.Block(functions, block.variables, block.statements)))
@@ -1,9 +1,18 @@
+import codecs
+from bisect import bisect_right
+import mmap
+from array import array
 import ply.lex as lex
 import re
+from diagnostics import Diagnostics, TooManyErrors
 
 class PascalLexer:
-    def __init__(self):
+    def __init__(self, diagnostics=None):
         self.lexer = None
+        self.diagnostics = diagnostics if diagnostics is not None else Diagnostics()
+        self.line_starts = [0]
+        self.offset = 0
+        self.literal_start = 0
 
     tokens = (
         'PROGRAM', 'VAR', 'BEGIN', 'END', 'FUNCTION', 'FORWARD', 'EXTERNAL',
@@ -17,121 +26,37 @@ class PascalLexer:
         'OF'
     )
 
-    def t_PROGRAM(self, t):
-        r'program'
-        return t
-
-    def t_VAR(self, t):
-        r'var'
-        return t
-
-    def t_BEGIN(self, t):
-        r'begin'
-        return t
-
-    def t_END(self, t):
-        r'end'
-        return t
-
-    def t_FUNCTION(self, t):
-        r'function'
-        return t
-
-    def t_FORWARD(self, t):
-        r'forward'
-        return t
-
-    def t_EXTERNAL(self, t):
-        r'external'
-        return t
-
-    def t_IF(self, t):
-        r'if'
-        return t
-
-    def t_THEN(self, t):
-        r'then'
-        return t
-
-    def t_ELSE(self, t):
-        r'else'
-        return t
-
-    def t_WHILE(self, t):
-        r'while'
-        return t
-    
-    def t_DOWNTO(self, t):
-        r'downto'
-        return t
-
-    def t_DO(self, t):
-        r'do'
-        return t
-
-    def t_FOR(self, t):
-        r'for'
-        return t
-
-    def t_TO(self, t):
-        r'to'
-        return t
-
-    def t_TREAL(self, t):
-        r'real'
-        return t
-
-    def t_TINTEGER(self, t):
-        r'integer'
-        return t
-
-    def t_TBOOLEAN(self, t):
-        r'boolean'
-        return t
-
-    def t_TSTRING(self, t):
-        r'string'
-        return t
-
-    def t_TCHAR(self, t):
-        r'char'
-        return t
-
-    def t_DIV(self, t):
-        r'div'
-        return t
-
-    def t_MOD(self, t):
-        r'mod'
-        return t
-
-    def t_AND(self, t):
-        r'and'
-        return t
-
-    def t_OR(self, t):
-        r'or'
-        return t
-
-    def t_NOT(self, t):
-        r'not'
-        return t
-
-    def t_NIL(self, t):
-        r'nil'
-        return t
-
-    def t_IN(self, t):
-        r'in'
-        return t
-
-    def t_ARRAY(self, t):
-        r'array'
-        return t
-
-    def t_OF(self, t):
-        r'of'
-        return t
+    reserved = {
+        'program': 'PROGRAM',
+        'var': 'VAR',
+        'begin': 'BEGIN',
+        'end': 'END',
+        'function': 'FUNCTION',
+        'forward': 'FORWARD',
+        'external': 'EXTERNAL',
+        'if': 'IF',
+        'then': 'THEN',
+        'else': 'ELSE',
+        'while': 'WHILE',
+        'downto': 'DOWNTO',
+        'do': 'DO',
+        'for': 'FOR',
+        'to': 'TO',
+        'real': 'TREAL',
+        'integer': 'TINTEGER',
+        'boolean': 'TBOOLEAN',
+        'string': 'TSTRING',
+        'char': 'TCHAR',
+        'div': 'DIV',
+        'mod': 'MOD',
+        'and': 'AND',
+        'or': 'OR',
+        'not': 'NOT',
+        'nil': 'NIL',
+        'in': 'IN',
+        'array': 'ARRAY',
+        'of': 'OF',
+    }
 
     t_ASSIGNMENT = r':='
     t_COLON = r':'
@@ -166,29 +91,260 @@ class PascalLexer:
         t.value = int(t.value)
         return t
 
+    states = (
+        ('comment', 'exclusive'),
+        ('starcomment', 'exclusive'),
+        ('string', 'exclusive'),
+    )
+
     def t_COMMENT(self, t):
-        r'\{[^}]*\}|\(\*[^*]*\*\)'
-        pass
+        r'\{|\(\*'
+        self.literal_start = t.lexpos
+        t.lexer.begin('comment' if t.value == '{' else 'starcomment')
 
     def t_IDENTIFIER(self, t):
         r'[a-zA-Z_][a-zA-Z0-9_]*'
+        t.type = self.reserved.get(t.value.lower(), 'IDENTIFIER')
         return t
 
     def t_CHARACTER_STRING(self, t):
-        r"'([^']|'')*'"
-        t.value = t.value[1:-1]
+        r"'"
+        self.literal_start = t.lexpos
+        t.lexer.begin('string')
+
+    def t_comment_end(self, t):
+        r'\}'
+        t.lexer.begin('INITIAL')
+
+    def t_comment_body(self, t):
+        r'[^}\n]+'
+
+    def t_starcomment_end(self, t):
+        r'\*\)'
+        t.lexer.begin('INITIAL')
+
+    def t_starcomment_body(self, t):
+        r'[^*\n]+|\*'
+
+    def t_string_body(self, t):
+        r"[^'\n]+|''"
+
+    def t_string_end(self, t):
+        r"'"
+        t.type = 'CHARACTER_STRING'
+        t.value = t.lexer.lexdata[self.literal_start + 1:t.lexpos]
+        t.lexpos = self.literal_start
+        t.lexer.begin('INITIAL')
         return t
 
+    def t_string_newline(self, t):
+        r'\n'
+        self._unterminated('string')
+        t.lexer.begin('INITIAL')
+        self._newlines(t)
+
     t_ignore = ' \t'
+    t_comment_starcomment_string_ignore = ''
 
-    def t_newline(self, t):
+    def t_INITIAL_comment_starcomment_newline(self, t):
         r'\n+'
-        t.lexer.lineno += len(t.value)
+        self._newlines(t)
 
     def t_error(self, t):
-        print(f"Illegal character '{t.value[0]}' at line {t.lexer.lineno}")
+        line, column = self.position(self.offset + t.lexpos)
+        self.diagnostics.add('lexical', f"Illegal character '{t.value[0]}' at line {line}, column {column}", line, column, ('ILLEGAL', t.value[0]))
         t.lexer.skip(1)
 
+    def t_comment_starcomment_string_error(self, t):
+        t.lexer.skip(1)
+
+    def t_comment_starcomment_string_eof(self, t):
+        self._unterminated('string' if t.lexer.current_state() == 'string' else 'comment')
+        t.lexer.begin('INITIAL')
+
+    def _newlines(self, t):
+        start = self.offset + t.lexpos + 1
+        self.line_starts.extend(range(start, start + len(t.value)))
+        t.lexer.lineno += len(t.value)
+
+    def _unterminated(self, kind):
+        line, column = self.position(self.offset + self.literal_start)
+        self.diagnostics.add('lexical', f"Unterminated {kind} starting at line {line}, column {column}", line, column)
+
+    def reset(self):
+        self.diagnostics.clear()
+        self.lexer.begin('INITIAL')
+        self.lexer.lineno = 1
+        self.line_starts = [0]
+        self.offset = 0
+
+    def position(self, lexpos):
+        line = bisect_right(self.line_starts, lexpos)
+        return line, lexpos - self.line_starts[line - 1] + 1
+
     def build(self, **kwargs):
         self.lexer = lex.lex(module=self, reflags=re.IGNORECASE, **kwargs)
         return self.lexer
+
+    def stream(self, source, **kwargs):
+        return PascalTokenStream(self, source, **kwargs)
+
+    def compact(self, source):
+        tokens = PascalTokenArray(self.tokens)
+        if isinstance(source, str):
+            self.reset()
+            self.lexer.input(source)
+            source = self.lexer
+        try:
+            tokens.extend(source)
+        except TooManyErrors:
+            # keep the tokens and diagnostics gathered up to the cap, as parse() does
+            pass
+        return tokens
+
+
+class PascalTokenStream:
+    delimiters = re.compile(r"[{}'\n]|\(\*|\*\)")
+    closers = {'{': '}', '(*': '*)', "'": "'"}
+
+    def __init__(self, pascal_lexer, source, chunk_size=1 << 20, use_mmap=False, encoding='utf-8'):
+        self.pascal_lexer = pascal_lexer
+        self.lexer = pascal_lexer.lexer
+        self.source = source
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+        self.encoding = encoding
+        pascal_lexer.reset()
+        self._open = None
+        self._scanned = 0
+        self._tokens = self._generate()
+
+    def __iter__(self):
+        return self._tokens
+
+    def token(self):
+        return next(self._tokens, None)
+
+    def _chunks(self):
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        reader = self.source
+        mapped = None
+        if self.use_mmap and hasattr(self.source, 'fileno'):
+            try:
+                mapped = reader = mmap.mmap(self.source.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                pass
+        try:
+            while True:
+                block = reader.read(self.chunk_size)
+                if not block:
+                    tail = decoder.decode(b'', final=True)
+                    if tail:
+                        yield tail
+                    return
+                yield decoder.decode(block)
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+    def _safe_cut(self, text):
+        cut = 0
+        scanned = self._scanned
+        for m in self.delimiters.finditer(text, self._scanned):
+            delimiter = m.group()
+            scanned = m.end()
+            if self._open is not None:
+                if delimiter == self.closers[self._open]:
+                    self._open = None
+                elif delimiter == '\n' and self._open == "'":
+                    self._open = None
+                    cut = m.end()
+            elif delimiter == '\n':
+                cut = m.end()
+            elif delimiter in self.closers:
+                self._open = delimiter
+        self._scanned = max(scanned, len(text) - 1)
+        return cut
+
+    def _generate(self):
+        pending = ''
+        offset = 0
+        for chunk in self._chunks():
+            pending += chunk
+            cut = self._safe_cut(pending)
+            if cut:
+                yield from self._lex(pending[:cut], offset)
+                offset += cut
+                pending = pending[cut:]
+                self._scanned -= cut
+        if pending:
+            yield from self._lex(pending, offset)
+
+    def _lex(self, text, offset):
+        self.pascal_lexer.offset = offset
+        self.lexer.input(text)
+        for tok in iter(self.lexer.token, None):
+            tok.lexpos += offset
+            yield tok
+
+
+
+class CompactToken:
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"CompactToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class PascalTokenArray:
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.kinds = array('H')
+        self.starts = array('q')
+        self.lines = array('I')
+        self.values = array('I')
+        self.table = []
+        self._interned = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, i):
+        return CompactToken(self.names[self.kinds[i]], self.table[self.values[i]], self.lines[i], self.starts[i])
+
+    def __iter__(self):
+        return iter(self.tokenfunc(), None)
+
+    def append(self, tok):
+        kind = self.ids[tok.type]
+        key = (kind, tok.value)
+        index = self._interned.get(key)
+        if index is None:
+            index = self._interned[key] = len(self.table)
+            self.table.append(tok.value)
+        self.kinds.append(kind)
+        self.starts.append(tok.lexpos)
+        self.lines.append(tok.lineno)
+        self.values.append(index)
+
+    def extend(self, tokens):
+        for tok in tokens:
+            self.append(tok)
+
+    def tokenfunc(self):
+        names, table = self.names, self.table
+        kinds, starts, lines, values = self.kinds, self.starts, self.lines, self.values
+        positions = iter(range(len(kinds)))
+
+        def token():
+            for i in positions:
+                return CompactToken(names[kinds[i]], table[values[i]], lines[i], starts[i])
+            return None
+        return token
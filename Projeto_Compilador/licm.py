@@ -0,0 +1,225 @@
+from typing import Dict, FrozenSet, List, Optional, Set
+import syntax as ast
+from cse import ExpressionAnalyzer
+from dce import accumulates_readln, map_statements, statement_children, with_children
+from passes import PassManager, Transform, register
+from semantic import READ_PROCEDURES, WRITE_PROCEDURES, Scope, reads_into_array, rewrite_statements
+
+LOOPS = (ast.WhileStatement, ast.ForStatement)
+TEMPORARY_PREFIX = "$licm"
+
+
+def is_loop(statement: ast.Statement) -> bool:
+    kind = type(statement)
+    return kind is ast.WhileStatement or kind is ast.ForStatement and not reads_into_array(statement.body)
+
+def preorder(root: ast.Statement) -> List[ast.Statement]:
+    statements = []
+    pending = [root]
+    while pending:
+        statement = pending.pop()
+        statements.append(statement)
+        pending.extend(reversed(statement_children(statement)))
+    return statements
+
+
+class LoopInvariantMover(ExpressionAnalyzer):
+    def __init__(self, scope: Scope, temporaries: Dict[str, List[str]]):
+        super().__init__(scope)
+        self.temporaries = temporaries
+        self.counters: Dict[str, int] = {}
+        self.enclosing: Dict[int, Optional[ast.Statement]] = {}
+        self.writes: Dict[int, Optional[Set[int]]] = {}
+        self.inits: Dict[int, FrozenSet[int]] = {}
+        self.hoisted: Set[int] = set()
+        self.expressions = 0
+        self.moved = 0
+
+    def __call__(self, root: ast.CompoundStatement) -> ast.CompoundStatement:
+        pending = [(root, None)]
+        while pending:
+            statement, loop = pending.pop()
+            if type(statement) in LOOPS:
+                self.enclosing[id(statement)] = loop
+                loop = statement
+            pending.extend((child, loop) for child in statement_children(statement))
+        return map_statements(root, self._rebuild)
+
+    def _rebuild(self, statement: ast.Statement, children: List[ast.Statement]) -> ast.Statement:
+        if type(statement) is ast.CompoundStatement:
+            flattened = []
+            for child in children:
+                if id(child) in self.hoisted:
+                    flattened.extend(child.statements)
+                else:
+                    flattened.append(child)
+            children = flattened
+        rebuilt = with_children(statement, children)
+        if not is_loop(statement):
+            return rebuilt
+        written = self._written(statement)
+        if written is None:
+            return rebuilt
+        result = self._hoist(rebuilt, written)
+        # temporaries stay live until the outermost loop they can reach has finished
+        outer = self.enclosing[id(statement)]
+        if outer is None or self._written(outer) is None:
+            self.counters = {}
+        return result
+
+    def _written(self, loop: ast.Statement) -> Optional[Set[int]]:
+        if id(loop) in self.writes:
+            return self.writes[id(loop)]
+        written = self.writes[id(loop)] = self._collect_writes(loop)
+        return written
+
+    def _collect_writes(self, loop: ast.Statement) -> Optional[Set[int]]:
+        bindings = self.scope.bindings
+        written = set()
+        for statement in preorder(loop):
+            kind = type(statement)
+            if kind is ast.AssignmentStatement:
+                target = statement.variable
+                symbol = bindings.get(id(target) if type(target) is ast.IndexedVariable else id(statement))
+            elif kind is ast.ProcedureCall:
+                name = statement.identifier.name.lower()
+                if name in WRITE_PROCEDURES or name in READ_PROCEDURES and not statement.args:
+                    continue
+                if name not in READ_PROCEDURES:
+                    return None
+                symbol = bindings.get(id(statement.args[0]))
+            elif kind is ast.ForStatement:
+                if reads_into_array(statement.body):
+                    return None
+                symbol = bindings.get(id(statement))
+            else:
+                continue
+            if symbol is None:
+                return None
+            written.add(id(symbol))
+        return written
+
+    def _roots(self, loop: ast.Statement) -> List[ast.Expression]:
+        roots = [loop.condition if type(loop) is ast.WhileStatement else loop.final_value]
+        for statement in preorder(loop.body):
+            kind = type(statement)
+            if kind is ast.AssignmentStatement:
+                target = statement.variable
+                if type(target) is ast.IndexedVariable:
+                    roots.extend(target.indices)
+                roots.append(statement.expression)
+            elif kind is ast.ProcedureCall:
+                if statement.identifier.name.lower() in WRITE_PROCEDURES:
+                    roots.extend(arg.expression for arg in statement.args or [])
+                elif statement.args and type(statement.args[0].expression) is ast.IndexedVariable:
+                    roots.extend(statement.args[0].expression.indices)
+            elif kind is ast.IfStatement or kind is ast.WhileStatement:
+                roots.append(statement.condition)
+            elif kind is ast.ForStatement:
+                roots.append(statement.initial_value)
+                roots.append(statement.final_value)
+        return roots
+
+    def _invariants(self, roots: List[ast.Expression], written: Set[int]) -> Dict[ast.Expression, List[ast.Expression]]:
+        groups: Dict[ast.Expression, List[ast.Expression]] = {}
+        for root in roots:
+            pending = [root]
+            while pending:
+                node = pending.pop()
+                if type(node) is list:
+                    pending.extend(reversed(node))
+                    continue
+                if not isinstance(node, ast.Node):
+                    continue
+                info = self.info.get(id(node))
+                if info is not None and info.safe and self._candidate(node, info) and not info.reads & written:
+                    groups.setdefault(node, []).append(node)
+                    continue
+                pending.extend(getattr(node, field) for field in reversed(node._fields))
+        self.found = []
+        return groups
+
+    def _hoist(self, loop: ast.Statement, written: Set[int]) -> ast.Statement:
+        inits: List[ast.AssignmentStatement] = []
+        names: Dict[ast.Expression, str] = {}
+        # temporaries of inner loops move along when their value is invariant here too
+        for statement in preorder(loop.body):
+            reads = self.inits.get(id(statement))
+            if reads is not None and not reads & written:
+                inits.append(statement)
+                names.setdefault(statement.expression, statement.variable.identifier.name)
+        original = loop
+        if inits:
+            moved = {id(init) for init in inits}
+
+            def remove(statement: ast.Statement, children: List[ast.Statement]) -> ast.Statement:
+                if type(statement) is ast.CompoundStatement:
+                    children = [child for child in children if id(child) not in moved]
+                return with_children(statement, children)
+
+            loop = map_statements(loop, remove)
+        roots = self._roots(loop)
+        evaluated = roots + [loop.initial_value] if type(loop) is ast.ForStatement else roots
+        # a call may change any variable, so loops that call user code are left alone
+        if any(ast.fold(root, self._describe).calls for root in evaluated):
+            self.found = []
+            return original
+        self.moved += len(inits)
+        replacements: Dict[int, ast.Expression] = {}
+        for key, occurrences in self._invariants(roots, written).items():
+            name = names.get(key)
+            if name is None:
+                info = self.info[id(key)]
+                name = self._temporary(info.type)
+                init = ast.AssignmentStatement(ast.VariableAccess(ast.Identifier(name)), key)
+                self.inits[id(init)] = info.reads
+                inits.append(init)
+                self.expressions += 1
+            for node in occurrences:
+                replacements[id(node)] = ast.VariableAccess(ast.Identifier(name))
+        if not inits:
+            return loop
+        if replacements:
+            loop = ast.transform(loop, lambda node: replacements.get(id(node), node))
+        hoisted = ast.CompoundStatement(inits + [loop])
+        self.hoisted.add(id(hoisted))
+        return hoisted
+
+    def _temporary(self, type_name: str) -> str:
+        pool = self.temporaries.setdefault(type_name, [])
+        position = self.counters.get(type_name, 0)
+        self.counters[type_name] = position + 1
+        if position == len(pool):
+            pool.append(f"{TEMPORARY_PREFIX}{type_name[0]}{position}")
+        return pool[position]
+
+
+@register
+class LoopInvariantCodeMotion(Transform):
+    name = 'licm'
+    requires = ('semantic',)
+
+    def run(self, tree: ast.AbstractSyntaxTree, manager: PassManager) -> ast.AbstractSyntaxTree:
+        model = manager.analysis('semantic', tree)
+        main = model.scope()
+        if any(isinstance(symbols, ast.TranslationError) for scope in model.scopes.values() for symbols in scope.declarations.values()):
+            return tree
+        # the readln shortcut writes slot 1, which a temporary must not take
+        if sum(symbol.size for symbols in main.declarations.values() for symbol in symbols) < 2 and accumulates_readln(tree):
+            return tree
+        temporaries: Dict[str, List[str]] = {}
+        movers: List[LoopInvariantMover] = []
+
+        def rewriter(scope: Scope) -> LoopInvariantMover:
+            movers.append(LoopInvariantMover(scope, temporaries))
+            return movers[-1]
+
+        result = rewrite_statements(tree, model, rewriter)
+        manager.record(self.name, "expressions", sum(mover.expressions for mover in movers))
+        manager.record(self.name, "moved outward", sum(mover.moved for mover in movers))
+        if not temporaries:
+            return result
+        block = result.program.block
+        declarations = [ast.VariableDeclaration([ast.Identifier(name) for name in names], ast.NamedType(type_name)) for type_name, names in temporaries.items()]
+        manager.record(self.name, "temporaries", sum(len(names) for names in temporaries.values()))
+        return ast.AbstractSyntaxTree(ast.Program(result.program.heading, ast.Block(block.functions, (block.variables or []) + declarations, block.statements)))
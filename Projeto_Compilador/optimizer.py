@@ -0,0 +1,22 @@
+from typing import Dict, Optional, Tuple
+from passes import PassManager
+from syntax import AbstractSyntaxTree
+import cse
+import dce
+import folding
+import inline
+import licm
+
+OPTIMIZATION_LEVELS: Dict[int, Tuple[str, ...]] = {
+    0: (),
+    1: ('fold', 'dce'),
+    2: ('inline', 'fold', 'dce', 'licm', 'cse'),
+}
+
+def pass_manager(level: int = 0, options: Optional[Dict[str, object]] = None) -> PassManager:
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unknown optimization level -O{level}")
+    return PassManager(OPTIMIZATION_LEVELS[level], options)
+
+def optimize(tree: AbstractSyntaxTree, level: int = 0, options: Optional[Dict[str, object]] = None) -> AbstractSyntaxTree:
+    return pass_manager(level, options).run(tree)
@@ -1,19 +1,76 @@
+import copy
+import os
 import ply.yacc as yacc
 import syntax as ast
+from diagnostics import TooManyErrors
+
+TABLE_MODULE = 'parsetab'
+TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+# error productions reduced this often on one token make no progress through the input
+RECOVERY_LIMIT = 32
+
+_tables = {}
 
 
 class PascalParser:
-    def __init__(self, lexer):
+    def __init__(self, lexer, write_tables=True):
         self.lexer = lexer
         self.tokens = lexer.tokens 
-        self.parser = yacc.yacc(module=self)
-        self.error_count = 0
+        self.diagnostics = lexer.diagnostics
+        self.recovery_token = None
+        self.recoveries = 0
+        self.parser = self._load_parser(write_tables)
+
+    @property
+    def error_count(self):
+        return len(self.diagnostics)
+
+    def _load_parser(self, write_tables):
+        tables = _tables.get(type(self))
+        if tables is None:
+            parser = yacc.yacc(module=self, tabmodule=TABLE_MODULE, outputdir=TABLE_DIR,
+                               write_tables=write_tables, debug=False)
+            _tables[type(self)] = (parser.productions, parser.action, parser.goto)
+            return parser
+        productions, action, goto = tables
+        lr = yacc.LRTable()
+        lr.lr_productions = [copy.copy(p) for p in productions]
+        lr.lr_action = action
+        lr.lr_goto = goto
+        lr.bind_callables({p.func: getattr(self, p.func) for p in productions if p.func})
+        return yacc.LRParser(lr, self.p_error)
 
     def parse(self, code):
-        self.error_count = 0
-        result = self.parser.parse(code, lexer=self.lexer.lexer)
+        self.lexer.reset()
+        return self._run(lambda: self.parser.parse(code, lexer=self.lexer.lexer))
+
+    def parse_tokens(self, tokens):
+        return self._run(lambda: self.parser.parse(lexer=self.lexer.lexer, tokenfunc=tokens.tokenfunc()))
+
+    def parse_file(self, path, **kwargs):
+        with open(path, 'rb') as f:
+            return self._run(lambda: self.parser.parse(lexer=self.lexer.stream(f, **kwargs)))
+
+    def _run(self, parse):
+        self.recovery_token = None
+        self.recoveries = 0
+        try:
+            result = parse()
+        except TooManyErrors:
+            result = None
         return ast.AbstractSyntaxTree(result)
 
+    def _recover(self, p):
+        token = p.slice[-1].value
+        if token is not self.recovery_token:
+            self.recovery_token = token
+            self.recoveries = 0
+            return
+        self.recoveries += 1
+        if self.recoveries == RECOVERY_LIMIT:
+            self.diagnostics.add('syntax', "Syntax error recovery made no progress")
+            self.diagnostics.stop()
+
     def p_program(self, p):
         '''program : program_heading SEMICOLON block DOT'''
         p[0] = ast.Program(p[1], p[3])
@@ -22,9 +79,9 @@ class PascalParser:
         '''program_heading : PROGRAM identifier
                           | PROGRAM identifier LPAREN identifier_list RPAREN'''
         if len(p) == 3:
-            p[0] = ('program_heading', p[2])
+            p[0] = ast.ProgramHeading(p[2])
         else:
-            p[0] = ('program_heading_with_params', p[2], p[4])
+            p[0] = ast.ProgramHeading(p[2], p[4])
 
     def p_identifier_list(self, p):
         '''identifier_list : identifier_list COMMA identifier
@@ -60,7 +117,7 @@ class PascalParser:
         '''function_declaration : function_heading SEMICOLON directive
                                 | function_identification SEMICOLON function_block
                                 | function_heading SEMICOLON function_block'''
-        if len(p) == 4 and isinstance(p[3], tuple) and p[3][0] == 'directive':
+        if isinstance(p[3], ast.Directive):
             p[0] = ast.FunctionDeclaration(p[1], p[3])
         else:
             local_vars = p[3].variables if isinstance(p[3], ast.Block) else None
@@ -70,19 +127,19 @@ class PascalParser:
     def p_directive(self, p):
         '''directive : FORWARD
                     | EXTERNAL'''
-        p[0] = ('directive', p[1])
+        p[0] = ast.Directive(p[1].lower())
 
     def p_function_heading(self, p):
         '''function_heading : FUNCTION identifier COLON type_denoter
                            | FUNCTION identifier formal_parameter_list COLON type_denoter'''
-        if len(p) == 5 and p[3] == ':':
-            p[0] = ('function_heading', p[2], p[4])
+        if len(p) == 5:
+            p[0] = ast.FunctionHeading(p[2], [], p[4])
         else:
-            p[0] = ('function_heading_with_params', p[2], p[3], p[5])
+            p[0] = ast.FunctionHeading(p[2], p[3], p[5])
 
     def p_formal_parameter_list(self, p):
         '''formal_parameter_list : LPAREN formal_parameter_section_list RPAREN'''
-        p[0] = ('formal_parameter_list', p[2])
+        p[0] = p[2]
 
     def p_formal_parameter_section_list(self, p):
         '''formal_parameter_section_list : formal_parameter_section_list SEMICOLON formal_parameter_section
@@ -97,23 +154,23 @@ class PascalParser:
         '''formal_parameter_section : value_parameter_specification
                                    | variable_parameter_specification
                                    | functional_parameter_specification'''
-        p[0] = ('formal_parameter_section', p[1])
+        p[0] = p[1]
 
     def p_value_parameter_specification(self, p):
         '''value_parameter_specification : identifier_list COLON type_denoter'''
-        p[0] = ('value_parameter', p[1], p[3])
+        p[0] = ast.ParameterSection('value', p[1], p[3])
 
     def p_variable_parameter_specification(self, p):
         '''variable_parameter_specification : VAR identifier_list COLON type_denoter'''
-        p[0] = ('variable_parameter', p[2], p[4])
+        p[0] = ast.ParameterSection('var', p[2], p[4])
 
     def p_functional_parameter_specification(self, p):
         '''functional_parameter_specification : function_heading'''
-        p[0] = ('functional_parameter', p[1])
+        p[0] = ast.ParameterSection('function', [p[1].identifier], p[1])
 
     def p_function_identification(self, p):
         '''function_identification : FUNCTION identifier'''
-        p[0] = ('function_identification', p[2])
+        p[0] = ast.FunctionHeading(p[2], [], None)
 
     def p_function_block(self, p):
         '''function_block : block'''
@@ -152,6 +209,8 @@ class PascalParser:
         '''statement_sequence : statement_sequence SEMICOLON statement
                              | statement
                              | error'''
+        if p.slice[-1].type == 'error':
+            self._recover(p)
         if len(p) == 2:
             p[0] = [p[1]] if p[1] != 'error' else []
         else:
@@ -224,7 +283,7 @@ class PascalParser:
                           | field_designator
                           | variable_access UPARROW'''
         if len(p) == 2:
-            if isinstance(p[1], tuple) and p[1][0] == 'identifier':
+            if isinstance(p[1], ast.Identifier):
                 p[0] = ast.VariableAccess(p[1])
             else:
                 p[0] = p[1]
@@ -254,7 +313,7 @@ class PascalParser:
 
     def p_params(self, p):
         '''params : LPAREN actual_parameter_list RPAREN'''
-        p[0] = ('params', p[2])
+        p[0] = p[2]
 
     def p_actual_parameter_list(self, p):
         '''actual_parameter_list : actual_parameter_list COMMA actual_parameter
@@ -270,11 +329,11 @@ class PascalParser:
                           | expression COLON expression
                           | expression COLON expression COLON expression'''
         if len(p) == 2:
-            p[0] = ('actual_parameter', p[1])
+            p[0] = ast.ActualParameter(p[1])
         elif len(p) == 4:
-            p[0] = ('actual_parameter_range', p[1], p[3])
+            p[0] = ast.ActualParameter(p[1], p[3])
         else:
-            p[0] = ('actual_parameter_multirange', p[1], p[3], p[5])
+            p[0] = ast.ActualParameter(p[1], p[3], p[5])
 
     def p_control_variable(self, p):
         '''control_variable : identifier'''
@@ -287,7 +346,7 @@ class PascalParser:
     def p_direction(self, p):
         '''direction : TO
                     | DOWNTO'''
-        p[0] = ('direction', p[1])
+        p[0] = p[1].lower()
 
     def p_final_value(self, p):
         '''final_value : expression'''
@@ -301,6 +360,8 @@ class PascalParser:
         '''expression : simple_expression
                     | simple_expression relop simple_expression
                     | error'''
+        if p.slice[-1].type == 'error':
+            self._recover(p)
         if len(p) == 2:
             p[0] = p[1] if p[1] != 'error' else None
         else:
@@ -356,7 +417,12 @@ class PascalParser:
         '''unsigned_constant : unsigned_number
                            | CHARACTER_STRING
                            | NIL'''
-        p[0] = ast.Constant(('constant', p[1]))
+        if isinstance(p[1], ast.Constant):
+            p[0] = p[1]
+        elif p.slice[1].type == 'NIL':
+            p[0] = ast.Constant('nil', None)
+        else:
+            p[0] = ast.Constant('string', p[1])
 
     def p_unsigned_number(self, p):
         '''unsigned_number : unsigned_integer
@@ -365,11 +431,11 @@ class PascalParser:
 
     def p_unsigned_integer(self, p):
         '''unsigned_integer : DIGSEQ'''
-        p[0] = ('integer', p[1])
+        p[0] = ast.Constant('integer', p[1])
 
     def p_unsigned_real(self, p):
         '''unsigned_real : REALNUMBER'''
-        p[0] = ('real', p[1])
+        p[0] = ast.Constant('real', p[1])
 
     def p_function_designator(self, p):
         '''function_designator : identifier params'''
@@ -396,20 +462,20 @@ class PascalParser:
         '''member_designator : member_designator DOTDOT expression
                             | expression'''
         if len(p) == 2:
-            p[0] = ('set_member', p[1])
+            p[0] = ast.SetMember(p[1])
         else:
-            p[0] = ('set_range', p[1], p[3])
+            p[0] = ast.SetMember(p[1], p[3])
 
     def p_sign(self, p):
         '''sign : PLUS
                 | MINUS'''
-        p[0] = ('sign', p[1])
+        p[0] = p[1]
 
     def p_addop(self, p):
         '''addop : PLUS
                 | MINUS
                 | OR'''
-        p[0] = ('addop', p[1])
+        p[0] = p[1].lower()
 
     def p_mulop(self, p):
         '''mulop : STAR
@@ -417,7 +483,7 @@ class PascalParser:
                 | DIV
                 | MOD
                 | AND'''
-        p[0] = ('mulop', p[1])
+        p[0] = p[1].lower()
 
     def p_relop(self, p):
         '''relop : EQUAL
@@ -427,7 +493,7 @@ class PascalParser:
                 | LE
                 | GE
                 | IN'''
-        p[0] = ('relop', p[1])
+        p[0] = p[1].lower()
 
     def p_type_denoter(self, p):
         '''type_denoter : TREAL
@@ -436,7 +502,7 @@ class PascalParser:
                        | TSTRING
                        | TCHAR
                        | array_type'''
-        p[0] = ('type', p[1])
+        p[0] = p[1] if isinstance(p[1], ast.ArrayType) else ast.NamedType(p[1].lower())
     
     def p_array_type(self, p):
         '''array_type : ARRAY LBRAC index_range RBRAC OF type_denoter'''
@@ -444,19 +510,19 @@ class PascalParser:
     
     def p_index_range(self, p):
         '''index_range : simple_expression DOTDOT simple_expression'''
-        p[0] = ('index_range', p[1], p[3])
+        p[0] = ast.IndexRange(p[1], p[3])
 
     def p_identifier(self, p):
         '''identifier : IDENTIFIER'''
-        p[0] = ('identifier', p[1])
+        p[0] = ast.Identifier(p[1])
 
     def p_empty(self, p):
         '''empty :'''
         p[0] = None
 
     def p_error(self, p):
-        self.error_count += 1
         if p:
-            print(f"Syntax error at line {p.lineno}, token {p.type} ('{p.value}')")
+            line, column = self.lexer.position(p.lexpos)
+            self.diagnostics.add('syntax', f"Syntax error at line {line}, column {column}, token {p.type} ('{p.value}')", line, column, (p.type, p.value))
         else:
-            print("Syntax error at EOF")
\ No newline at end of file
+            self.diagnostics.add('syntax', "Syntax error at EOF")
\ No newline at end of file
@@ -0,0 +1,169 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'AND ARRAY ASSIGNMENT BEGIN CHARACTER_STRING COLON COMMA COMMENT DIGSEQ DIV DO DOT DOTDOT DOWNTO ELSE END EQUAL EXTERNAL FOR FORWARD FUNCTION GE GT IDENTIFIER IF IN LBRAC LE LPAREN LT MINUS MOD NIL NOT NOTEQUAL OF OR PLUS PROGRAM RBRAC REALNUMBER RPAREN SEMICOLON SLASH STAR STARSTAR TBOOLEAN TCHAR THEN TINTEGER TO TREAL TSTRING UPARROW VAR WHILEprogram : program_heading SEMICOLON block DOTprogram_heading : PROGRAM identifier\n                          | PROGRAM identifier LPAREN identifier_list RPARENidentifier_list : identifier_list COMMA identifier\n                          | identifierblock : function_declaration_part variable_declaration_part statement_partfunction_declaration_part : function_declaration_list SEMICOLON\n                                    | emptyfunction_declaration_list : function_declaration_list SEMICOLON function_declaration\n                                    | function_declarationfunction_declaration : function_heading SEMICOLON directive\n                                | function_identification SEMICOLON function_block\n                                | function_heading SEMICOLON function_blockdirective : FORWARD\n                    | EXTERNALfunction_heading : FUNCTION identifier COLON type_denoter\n                           | FUNCTION identifier formal_parameter_list COLON type_denoterformal_parameter_list : LPAREN formal_parameter_section_list RPARENformal_parameter_section_list : formal_parameter_section_list SEMICOLON formal_parameter_section\n                                        | formal_parameter_sectionformal_parameter_section : value_parameter_specification\n                                   | variable_parameter_specification\n                                   | functional_parameter_specificationvalue_parameter_specification : identifier_list COLON type_denotervariable_parameter_specification : VAR identifier_list COLON type_denoterfunctional_parameter_specification : function_headingfunction_identification : FUNCTION identifierfunction_block : blockvariable_declaration_part : VAR variable_declaration_list SEMICOLON\n                                    | emptyvariable_declaration_list : variable_declaration_list SEMICOLON variable_declaration\n                                    | variable_declarationvariable_declaration : identifier_list COLON type_denoterstatement_part : compound_statementcompound_statement : BEGIN statement_sequence ENDstatement_sequence : statement_sequence SEMICOLON statement\n                             | statement\n                             | errorstatement : open_statement\n                    | closed_statementopen_statement : open_if_statement\n                        | open_while_statement\n                        | open_for_statementclosed_statement : assignment_statement\n                            | compound_statement\n                            | closed_if_statement\n                            | closed_while_statement\n                            | closed_for_statement\n                            | procedure_statement\n                            | emptyopen_while_statement : WHILE boolean_expression DO open_statementclosed_while_statement : WHILE boolean_expression DO closed_statementopen_for_statement : FOR control_variable ASSIGNMENT initial_value direction final_value DO open_statementclosed_for_statement : FOR control_variable ASSIGNMENT initial_value direction final_value DO closed_statementopen_if_statement : IF boolean_expression THEN statement\n                            | IF boolean_expression THEN closed_statement ELSE open_statementclosed_if_statement : IF boolean_expression THEN closed_statement ELSE closed_statementassignment_statement : variable_access ASSIGNMENT expressionprocedure_statement : identifier params\n                            | identifiervariable_access : identifier\n                          | indexed_variable\n                          | field_designator\n                          | variable_access UPARROWindexed_variable : variable_access LBRAC index_expression_list RBRACindex_expression_list : index_expression_list COMMA index_expression\n                                | index_expressionindex_expression : expressionfield_designator : variable_access DOT identifierparams : LPAREN actual_parameter_list RPARENactual_parameter_list : actual_parameter_list COMMA actual_parameter\n                                | actual_parameteractual_parameter : expression\n                          | expression COLON expression\n                          | expression COLON expression COLON expressioncontrol_variable : identifierinitial_value : expressiondirection : TO\n                    | DOWNTOfinal_value : expressionboolean_expression : expressionexpression : simple_expression\n                    | simple_expression relop simple_expression\n                    | errorsimple_expression : term\n                           | simple_expression addop termterm : factor\n               | term mulop factorfactor : sign factor\n                 | exponentiationexponentiation : primary\n                        | primary STARSTAR exponentiationprimary : variable_access\n                  | unsigned_constant\n                  | function_designator\n                  | set_constructor\n                  | LPAREN expression RPAREN\n                  | NOT primaryunsigned_constant : unsigned_number\n                           | CHARACTER_STRING\n                           | NILunsigned_number : unsigned_integer\n                          | unsigned_realunsigned_integer : DIGSEQunsigned_real : REALNUMBERfunction_designator : identifier paramsset_constructor : LBRAC member_designator_list RBRAC\n                          | LBRAC RBRACmember_designator_list : member_designator_list COMMA member_designator\n                                 | member_designatormember_designator : member_designator DOTDOT expression\n                            | expressionsign : PLUS\n                | MINUSaddop : PLUS\n                | MINUS\n                | ORmulop : STAR\n                | SLASH\n                | DIV\n                | MOD\n                | ANDrelop : EQUAL\n                | NOTEQUAL\n                | LT\n                | GT\n                | LE\n                | GE\n                | INtype_denoter : TREAL\n                       | TINTEGER\n                       | TBOOLEAN\n                       | TSTRING\n                       | TCHAR\n                       | array_typearray_type : ARRAY LBRAC index_range RBRAC OF type_denoterindex_range : simple_expression DOTDOT simple_expressionidentifier : IDENTIFIERempty :'
+    
+_lr_action_items = {'PROGRAM':([0,],[3,]),'$end':([1,16,],[0,-1,]),'SEMICOLON':([2,5,6,9,11,12,13,23,26,27,28,29,30,32,33,34,35,36,37,38,42,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,63,64,65,68,69,70,71,72,73,74,77,78,79,80,81,84,87,88,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,122,124,125,127,133,134,153,156,157,159,162,164,168,174,175,178,179,182,183,184,185,186,187,190,191,194,196,201,203,216,217,218,219,224,225,227,229,231,232,234,],[4,-2,-138,20,-10,21,22,-27,-6,-34,-139,66,-32,-9,-11,-13,-14,-15,-28,-12,-3,88,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-60,-62,-63,-16,-130,-131,-132,-133,-134,-135,129,-20,-21,-22,-23,-26,-35,-139,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-59,-31,-33,-17,-36,-139,-89,-98,-106,-108,-139,-58,-69,-19,-24,-55,-40,-83,-86,-88,-92,-97,-107,-51,-52,-65,-70,-25,-139,-139,-57,-56,-139,-136,-40,-139,-139,-53,-54,-139,]),'IDENTIFIER':([3,14,15,18,28,41,43,59,60,61,66,83,85,88,95,97,98,104,105,110,118,120,121,123,126,129,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,162,163,177,180,181,188,189,195,197,198,200,203,208,209,210,216,219,220,223,227,229,230,234,],[6,6,6,6,6,6,6,6,6,6,6,6,6,6,6,-113,-114,6,6,6,6,6,6,6,6,6,6,6,6,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,6,-118,-119,-120,-121,-122,6,6,6,6,6,6,6,6,6,6,6,6,6,6,-78,-79,6,6,6,6,6,6,6,6,]),'VAR':([4,8,10,20,21,22,41,129,],[-139,18,-8,-7,-139,-139,83,83,]),'BEGIN':([4,8,10,17,19,20,21,22,28,66,88,134,162,203,216,219,227,229,234,],[-139,-139,-8,28,-30,-7,-139,-139,28,-29,28,28,28,28,28,28,28,28,28,]),'FUNCTION':([4,20,21,22,41,129,],[14,14,14,14,85,85,]),'LPAREN':([5,6,23,59,60,63,95,97,98,104,105,106,110,118,120,123,126,132,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,177,180,188,189,195,197,198,200,208,209,210,220,223,230,],[15,-138,41,104,104,123,104,-113,-114,104,104,123,104,104,104,104,104,41,104,104,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,104,-118,-119,-120,-121,-122,104,104,104,104,104,104,104,104,104,104,104,-78,-79,104,104,104,]),'COLON':([6,23,24,31,40,64,65,82,86,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,128,131,132,153,156,157,159,168,171,182,183,184,185,186,187,194,196,213,],[-138,39,-5,67,76,-62,-63,130,-4,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-18,176,39,-89,-98,-106,-108,-69,198,-83,-86,-88,-92,-97,-107,-65,-70,223,]),'RPAREN':([6,24,25,64,65,68,69,70,71,72,73,74,77,78,79,80,81,84,86,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,127,153,155,156,157,159,168,169,170,171,174,175,182,183,184,185,186,187,194,196,201,212,213,224,228,],[-138,-5,42,-62,-63,-16,-130,-131,-132,-133,-134,-135,128,-20,-21,-22,-23,-26,-4,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-17,-89,186,-98,-106,-108,-69,196,-72,-73,-19,-24,-83,-86,-88,-92,-97,-107,-65,-70,-25,-71,-74,-136,-75,]),'COMMA':([6,24,25,31,64,65,82,86,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,131,153,156,157,158,159,160,161,165,166,167,168,169,170,171,182,183,184,185,186,187,194,196,206,207,211,212,213,228,],[-138,-5,43,43,-62,-63,43,-4,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,43,-89,-98,-106,188,-108,-110,-112,195,-67,-68,-69,197,-72,-73,-83,-86,-88,-92,-97,-107,-65,-70,-109,-111,-66,-71,-74,-75,]),'END':([6,28,44,45,46,47,48,49,50,51,52,53,54,55,56,57,58,63,64,65,87,88,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,122,133,134,153,156,157,159,162,164,168,178,179,182,183,184,185,186,187,190,191,194,196,203,216,217,218,219,225,227,229,231,232,234,],[-138,-139,87,-37,-38,-39,-40,-41,-42,-43,-44,-45,-46,-47,-48,-49,-50,-60,-62,-63,-35,-139,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-59,-36,-139,-89,-98,-106,-108,-139,-58,-69,-55,-40,-83,-86,-88,-92,-97,-107,-51,-52,-65,-70,-139,-139,-57,-56,-139,-40,-139,-139,-53,-54,-139,]),'ASSIGNMENT':([6,62,63,64,65,116,117,119,168,194,205,],[-138,118,-61,-62,-63,163,-76,-64,-69,-65,220,]),'UPARROW':([6,62,63,64,65,100,106,119,168,194,],[-138,119,-61,-62,-63,119,-61,-64,-69,-65,]),'LBRAC':([6,59,60,62,63,64,65,75,95,97,98,100,104,105,106,110,118,119,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,168,177,180,188,189,194,195,197,198,200,208,209,210,220,223,230,],[-138,110,110,120,-61,-62,-63,126,110,-113,-114,120,110,110,-61,110,110,-64,110,110,110,110,110,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,110,-118,-119,-120,-121,-122,110,110,-69,110,110,110,110,-65,110,110,110,110,110,-78,-79,110,110,110,]),'DOT':([6,7,26,27,62,63,64,65,87,100,106,119,168,194,],[-138,16,-6,-34,121,-61,-62,-63,-35,121,-61,-64,-69,-65,]),'STARSTAR':([6,64,65,99,100,101,102,103,106,107,108,109,111,112,113,114,119,156,157,159,168,186,187,194,196,],[-138,-62,-63,154,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-98,-106,-108,-69,-97,-107,-65,-70,]),'STAR':([6,64,65,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,148,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,148,-88,-92,-97,-107,-65,-70,]),'SLASH':([6,64,65,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,149,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,149,-88,-92,-97,-107,-65,-70,]),'DIV':([6,64,65,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,150,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,150,-88,-92,-97,-107,-65,-70,]),'MOD':([6,64,65,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,151,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,151,-88,-92,-97,-107,-65,-70,]),'AND':([6,64,65,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,152,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,152,-88,-92,-97,-107,-65,-70,]),'EQUAL':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,137,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'NOTEQUAL':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,138,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'LT':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,139,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'GT':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,140,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'LE':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,141,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'GE':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,142,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'IN':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,183,184,185,186,187,194,196,],[-138,-62,-63,143,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-86,-88,-92,-97,-107,-65,-70,]),'PLUS':([6,59,60,64,65,91,93,94,95,96,97,98,99,100,101,102,103,104,106,107,108,109,110,111,112,113,114,118,119,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,156,157,159,163,168,173,177,180,182,183,184,185,186,187,188,189,194,195,196,197,198,200,208,209,210,215,220,223,230,],[-138,97,97,-62,-63,144,-85,-87,97,-90,-113,-114,-91,-93,-94,-95,-96,97,-61,-99,-100,-101,97,-102,-103,-104,-105,97,-64,97,97,97,97,97,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,97,-118,-119,-120,-121,-122,-89,-98,-106,-108,97,-69,144,97,97,144,-86,-88,-92,-97,-107,97,97,-65,97,-70,97,97,97,97,-78,-79,144,97,97,97,]),'MINUS':([6,59,60,64,65,91,93,94,95,96,97,98,99,100,101,102,103,104,106,107,108,109,110,111,112,113,114,118,119,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,153,156,157,159,163,168,173,177,180,182,183,184,185,186,187,188,189,194,195,196,197,198,200,208,209,210,215,220,223,230,],[-138,98,98,-62,-63,145,-85,-87,98,-90,-113,-114,-91,-93,-94,-95,-96,98,-61,-99,-100,-101,98,-102,-103,-104,-105,98,-64,98,98,98,98,98,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,98,-118,-119,-120,-121,-122,-89,-98,-106,-108,98,-69,145,98,98,145,-86,-88,-92,-97,-107,98,98,-65,98,-70,98,98,98,98,-78,-79,145,98,98,98,]),'OR':([6,64,65,91,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,173,182,183,184,185,186,187,194,196,215,],[-138,-62,-63,146,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,146,146,-86,-88,-92,-97,-107,-65,-70,146,]),'THEN':([6,64,65,89,90,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,182,183,184,185,186,187,194,196,202,],[-138,-62,-63,134,-81,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-83,-86,-88,-92,-97,-107,-65,-70,216,]),'DO':([6,64,65,90,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,115,119,153,156,157,159,168,182,183,184,185,186,187,194,196,204,221,222,233,],[-138,-62,-63,-81,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,162,-64,-89,-98,-106,-108,-69,-83,-86,-88,-92,-97,-107,-65,-70,219,227,-80,234,]),'DOTDOT':([6,64,65,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,160,161,168,173,182,183,184,185,186,187,194,196,206,207,],[-138,-62,-63,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,189,-112,-69,200,-83,-86,-88,-92,-97,-107,-65,-70,189,-111,]),'RBRAC':([6,64,65,91,92,93,94,96,99,100,101,102,103,106,107,108,109,110,111,112,113,114,119,153,156,157,158,159,160,161,165,166,167,168,172,182,183,184,185,186,187,194,196,206,207,211,215,],[-138,-62,-63,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,159,-102,-103,-104,-105,-64,-89,-98,-106,187,-108,-110,-112,194,-67,-68,-69,199,-83,-86,-88,-92,-97,-107,-65,-70,-109,-111,-66,-137,]),'ELSE':([6,52,53,54,55,56,57,58,63,64,65,87,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,122,134,153,156,157,159,162,164,168,179,182,183,184,185,186,187,191,194,196,203,216,217,219,225,227,229,232,234,],[-138,-44,-45,-46,-47,-48,-49,-50,-60,-62,-63,-35,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-59,-139,-89,-98,-106,-108,-139,-58,-69,203,-83,-86,-88,-92,-97,-107,-52,-65,-70,-139,-139,-57,-139,229,-139,-139,-54,-139,]),'TO':([6,64,65,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,182,183,184,185,186,187,192,193,194,196,226,],[-138,-62,-63,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-83,-86,-88,-92,-97,-107,209,-77,-65,-70,209,]),'DOWNTO':([6,64,65,91,92,93,94,96,99,100,101,102,103,106,107,108,109,111,112,113,114,119,153,156,157,159,168,182,183,184,185,186,187,192,193,194,196,226,],[-138,-62,-63,-82,-84,-85,-87,-90,-91,-93,-94,-95,-96,-61,-99,-100,-101,-102,-103,-104,-105,-64,-89,-98,-106,-108,-69,-83,-86,-88,-92,-97,-107,210,-77,-65,-70,210,]),'FORWARD':([21,],[35,]),'EXTERNAL':([21,],[36,]),'error':([28,59,60,104,110,118,120,123,163,177,180,188,189,195,197,198,208,209,210,220,223,230,],[46,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,-78,-79,92,92,92,]),'IF':([28,88,134,162,203,216,219,227,229,234,],[59,59,177,59,59,177,177,59,177,177,]),'WHILE':([28,88,134,162,203,216,219,227,229,234,],[60,60,180,60,60,180,180,60,180,180,]),'FOR':([28,88,134,162,203,216,219,227,229,234,],[61,61,181,61,61,181,181,61,181,181,]),'TREAL':([39,67,76,130,176,214,],[69,69,69,69,69,69,]),'TINTEGER':([39,67,76,130,176,214,],[70,70,70,70,70,70,]),'TBOOLEAN':([39,67,76,130,176,214,],[71,71,71,71,71,71,]),'TSTRING':([39,67,76,130,176,214,],[72,72,72,72,72,72,]),'TCHAR':([39,67,76,130,176,214,],[73,73,73,73,73,73,]),'ARRAY':([39,67,76,130,176,214,],[75,75,75,75,75,75,]),'NOT':([59,60,95,97,98,104,105,110,118,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,177,180,188,189,195,197,198,200,208,209,210,220,223,230,],[105,105,105,-113,-114,105,105,105,105,105,105,105,105,105,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,105,-118,-119,-120,-121,-122,105,105,105,105,105,105,105,105,105,105,105,-78,-79,105,105,105,]),'CHARACTER_STRING':([59,60,95,97,98,104,105,110,118,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,177,180,188,189,195,197,198,200,208,209,210,220,223,230,],[108,108,108,-113,-114,108,108,108,108,108,108,108,108,108,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,108,-118,-119,-120,-121,-122,108,108,108,108,108,108,108,108,108,108,108,-78,-79,108,108,108,]),'NIL':([59,60,95,97,98,104,105,110,118,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,177,180,188,189,195,197,198,200,208,209,210,220,223,230,],[109,109,109,-113,-114,109,109,109,109,109,109,109,109,109,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,109,-118,-119,-120,-121,-122,109,109,109,109,109,109,109,109,109,109,109,-78,-79,109,109,109,]),'DIGSEQ':([59,60,95,97,98,104,105,110,118,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,177,180,188,189,195,197,198,200,208,209,210,220,223,230,],[113,113,113,-113,-114,113,113,113,113,113,113,113,113,113,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,113,-118,-119,-120,-121,-122,113,113,113,113,113,113,113,113,113,113,113,-78,-79,113,113,113,]),'REALNUMBER':([59,60,95,97,98,104,105,110,118,120,123,126,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,150,151,152,154,163,177,180,188,189,195,197,198,200,208,209,210,220,223,230,],[114,114,114,-113,-114,114,114,114,114,114,114,114,114,114,-123,-124,-125,-126,-127,-128,-129,-115,-116,-117,114,-118,-119,-120,-121,-122,114,114,114,114,114,114,114,114,114,114,114,-78,-79,114,114,114,]),'OF':([199,],[214,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'program_heading':([0,],[2,]),'identifier':([3,14,15,18,28,41,43,59,60,61,66,83,85,88,95,104,105,110,118,120,121,123,126,129,134,135,136,147,154,162,163,177,180,181,188,189,195,197,198,200,203,208,216,219,220,223,227,229,230,234,],[5,23,24,24,63,24,86,106,106,117,24,24,132,63,106,106,106,106,106,106,168,106,106,24,63,106,106,106,106,63,106,106,106,117,106,106,106,106,106,106,63,106,63,63,106,106,63,63,106,63,]),'block':([4,21,22,],[7,37,37,]),'function_declaration_part':([4,21,22,],[8,8,8,]),'function_declaration_list':([4,21,22,],[9,9,9,]),'empty':([4,8,21,22,28,88,134,162,203,216,219,227,229,234,],[10,19,10,10,58,58,58,58,58,58,58,58,58,58,]),'function_declaration':([4,20,21,22,],[11,32,11,11,]),'function_heading':([4,20,21,22,41,129,],[12,12,12,12,84,84,]),'function_identification':([4,20,21,22,],[13,13,13,13,]),'variable_declaration_part':([8,],[17,]),'identifier_list':([15,18,41,66,83,129,],[25,31,82,31,131,82,]),'statement_part':([17,],[26,]),'compound_statement':([17,28,88,134,162,203,216,219,227,229,234,],[27,53,53,53,53,53,53,53,53,53,53,]),'variable_declaration_list':([18,],[29,]),'variable_declaration':([18,66,],[30,124,]),'directive':([21,],[33,]),'function_block':([21,22,],[34,38,]),'formal_parameter_list':([23,132,],[40,40,]),'statement_sequence':([28,],[44,]),'statement':([28,88,134,216,],[45,133,178,178,]),'open_statement':([28,88,134,162,203,216,219,227,229,234,],[47,47,47,190,218,47,190,231,218,231,]),'closed_statement':([28,88,134,162,203,216,219,227,229,234,],[48,48,179,191,217,225,191,232,217,232,]),'open_if_statement':([28,88,134,162,203,216,219,227,229,234,],[49,49,49,49,49,49,49,49,49,49,]),'open_while_statement':([28,88,134,162,203,216,219,227,229,234,],[50,50,50,50,50,50,50,50,50,50,]),'open_for_statement':([28,88,134,162,203,216,219,227,229,234,],[51,51,51,51,51,51,51,51,51,51,]),'assignment_statement':([28,88,134,162,203,216,219,227,229,234,],[52,52,52,52,52,52,52,52,52,52,]),'closed_if_statement':([28,88,134,162,203,216,219,227,229,234,],[54,54,54,54,54,54,54,54,54,54,]),'closed_while_statement':([28,88,134,162,203,216,219,227,229,234,],[55,55,55,55,55,55,55,55,55,55,]),'closed_for_statement':([28,88,134,162,203,216,219,227,229,234,],[56,56,56,56,56,56,56,56,56,56,]),'procedure_statement':([28,88,134,162,203,216,219,227,229,234,],[57,57,57,57,57,57,57,57,57,57,]),'variable_access':([28,59,60,88,95,104,105,110,118,120,123,126,134,135,136,147,154,162,163,177,180,188,189,195,197,198,200,203,208,216,219,220,223,227,229,230,234,],[62,100,100,62,100,100,100,100,100,100,100,100,62,100,100,100,100,62,100,100,100,100,100,100,100,100,100,62,100,62,62,100,100,62,62,100,62,]),'indexed_variable':([28,59,60,88,95,104,105,110,118,120,123,126,134,135,136,147,154,162,163,177,180,188,189,195,197,198,200,203,208,216,219,220,223,227,229,230,234,],[64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,]),'field_designator':([28,59,60,88,95,104,105,110,118,120,123,126,134,135,136,147,154,162,163,177,180,188,189,195,197,198,200,203,208,216,219,220,223,227,229,230,234,],[65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,]),'type_denoter':([39,67,76,130,176,214,],[68,125,127,175,201,224,]),'array_type':([39,67,76,130,176,214,],[74,74,74,74,74,74,]),'formal_parameter_section_list':([41,],[77,]),'formal_parameter_section':([41,129,],[78,174,]),'value_parameter_specification':([41,129,],[79,79,]),'variable_parameter_specification':([41,129,],[80,80,]),'functional_parameter_specification':([41,129,],[81,81,]),'boolean_expression':([59,60,177,180,],[89,115,202,204,]),'expression':([59,60,104,110,118,120,123,163,177,180,188,189,195,197,198,208,220,223,230,],[90,90,155,161,164,167,171,193,90,90,161,207,167,171,213,222,193,228,222,]),'simple_expression':([59,60,104,110,118,120,123,126,135,163,177,180,188,189,195,197,198,200,208,220,223,230,],[91,91,91,91,91,91,91,173,182,91,91,91,91,91,91,91,91,215,91,91,91,91,]),'term':([59,60,104,110,118,120,123,126,135,136,163,177,180,188,189,195,197,198,200,208,220,223,230,],[93,93,93,93,93,93,93,93,93,183,93,93,93,93,93,93,93,93,93,93,93,93,93,]),'factor':([59,60,95,104,110,118,120,123,126,135,136,147,163,177,180,188,189,195,197,198,200,208,220,223,230,],[94,94,153,94,94,94,94,94,94,94,94,184,94,94,94,94,94,94,94,94,94,94,94,94,94,]),'sign':([59,60,95,104,110,118,120,123,126,135,136,147,163,177,180,188,189,195,197,198,200,208,220,223,230,],[95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,]),'exponentiation':([59,60,95,104,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[96,96,96,96,96,96,96,96,96,96,96,96,185,96,96,96,96,96,96,96,96,96,96,96,96,96,]),'primary':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[99,99,99,99,156,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,]),'unsigned_constant':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,]),'function_designator':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,]),'set_constructor':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,103,]),'unsigned_number':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,107,]),'unsigned_integer':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,111,]),'unsigned_real':([59,60,95,104,105,110,118,120,123,126,135,136,147,154,163,177,180,188,189,195,197,198,200,208,220,223,230,],[112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,112,]),'control_variable':([61,181,],[116,205,]),'params':([63,106,],[122,157,]),'relop':([91,],[135,]),'addop':([91,173,182,215,],[136,136,136,136,]),'mulop':([93,183,],[147,147,]),'member_designator_list':([110,],[158,]),'member_designator':([110,188,],[160,206,]),'index_expression_list':([120,],[165,]),'index_expression':([120,195,],[166,211,]),'actual_parameter_list':([123,],[169,]),'actual_parameter':([123,197,],[170,212,]),'index_range':([126,],[172,]),'initial_value':([163,220,],[192,226,]),'direction':([192,226,],[208,230,]),'final_value':([208,230,],[221,233,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> program_heading SEMICOLON block DOT','program',4,'p_program','parser.py',40),
+  ('program_heading -> PROGRAM identifier','program_heading',2,'p_program_heading','parser.py',44),
+  ('program_heading -> PROGRAM identifier LPAREN identifier_list RPAREN','program_heading',5,'p_program_heading','parser.py',45),
+  ('identifier_list -> identifier_list COMMA identifier','identifier_list',3,'p_identifier_list','parser.py',52),
+  ('identifier_list -> identifier','identifier_list',1,'p_identifier_list','parser.py',53),
+  ('block -> function_declaration_part variable_declaration_part statement_part','block',3,'p_block','parser.py',61),
+  ('function_declaration_part -> function_declaration_list SEMICOLON','function_declaration_part',2,'p_function_declaration_part','parser.py',65),
+  ('function_declaration_part -> empty','function_declaration_part',1,'p_function_declaration_part','parser.py',66),
+  ('function_declaration_list -> function_declaration_list SEMICOLON function_declaration','function_declaration_list',3,'p_function_declaration_list','parser.py',73),
+  ('function_declaration_list -> function_declaration','function_declaration_list',1,'p_function_declaration_list','parser.py',74),
+  ('function_declaration -> function_heading SEMICOLON directive','function_declaration',3,'p_function_declaration','parser.py',82),
+  ('function_declaration -> function_identification SEMICOLON function_block','function_declaration',3,'p_function_declaration','parser.py',83),
+  ('function_declaration -> function_heading SEMICOLON function_block','function_declaration',3,'p_function_declaration','parser.py',84),
+  ('directive -> FORWARD','directive',1,'p_directive','parser.py',93),
+  ('directive -> EXTERNAL','directive',1,'p_directive','parser.py',94),
+  ('function_heading -> FUNCTION identifier COLON type_denoter','function_heading',4,'p_function_heading','parser.py',98),
+  ('function_heading -> FUNCTION identifier formal_parameter_list COLON type_denoter','function_heading',5,'p_function_heading','parser.py',99),
+  ('formal_parameter_list -> LPAREN formal_parameter_section_list RPAREN','formal_parameter_list',3,'p_formal_parameter_list','parser.py',106),
+  ('formal_parameter_section_list -> formal_parameter_section_list SEMICOLON formal_parameter_section','formal_parameter_section_list',3,'p_formal_parameter_section_list','parser.py',110),
+  ('formal_parameter_section_list -> formal_parameter_section','formal_parameter_section_list',1,'p_formal_parameter_section_list','parser.py',111),
+  ('formal_parameter_section -> value_parameter_specification','formal_parameter_section',1,'p_formal_parameter_section','parser.py',119),
+  ('formal_parameter_section -> variable_parameter_specification','formal_parameter_section',1,'p_formal_parameter_section','parser.py',120),
+  ('formal_parameter_section -> functional_parameter_specification','formal_parameter_section',1,'p_formal_parameter_section','parser.py',121),
+  ('value_parameter_specification -> identifier_list COLON type_denoter','value_parameter_specification',3,'p_value_parameter_specification','parser.py',125),
+  ('variable_parameter_specification -> VAR identifier_list COLON type_denoter','variable_parameter_specification',4,'p_variable_parameter_specification','parser.py',129),
+  ('functional_parameter_specification -> function_heading','functional_parameter_specification',1,'p_functional_parameter_specification','parser.py',133),
+  ('function_identification -> FUNCTION identifier','function_identification',2,'p_function_identification','parser.py',137),
+  ('function_block -> block','function_block',1,'p_function_block','parser.py',141),
+  ('variable_declaration_part -> VAR variable_declaration_list SEMICOLON','variable_declaration_part',3,'p_variable_declaration_part','parser.py',145),
+  ('variable_declaration_part -> empty','variable_declaration_part',1,'p_variable_declaration_part','parser.py',146),
+  ('variable_declaration_list -> variable_declaration_list SEMICOLON variable_declaration','variable_declaration_list',3,'p_variable_declaration_list','parser.py',153),
+  ('variable_declaration_list -> variable_declaration','variable_declaration_list',1,'p_variable_declaration_list','parser.py',154),
+  ('variable_declaration -> identifier_list COLON type_denoter','variable_declaration',3,'p_variable_declaration','parser.py',162),
+  ('statement_part -> compound_statement','statement_part',1,'p_statement_part','parser.py',166),
+  ('compound_statement -> BEGIN statement_sequence END','compound_statement',3,'p_compound_statement','parser.py',170),
+  ('statement_sequence -> statement_sequence SEMICOLON statement','statement_sequence',3,'p_statement_sequence','parser.py',174),
+  ('statement_sequence -> statement','statement_sequence',1,'p_statement_sequence','parser.py',175),
+  ('statement_sequence -> error','statement_sequence',1,'p_statement_sequence','parser.py',176),
+  ('statement -> open_statement','statement',1,'p_statement','parser.py',183),
+  ('statement -> closed_statement','statement',1,'p_statement','parser.py',184),
+  ('open_statement -> open_if_statement','open_statement',1,'p_open_statement','parser.py',188),
+  ('open_statement -> open_while_statement','open_statement',1,'p_open_statement','parser.py',189),
+  ('open_statement -> open_for_statement','open_statement',1,'p_open_statement','parser.py',190),
+  ('closed_statement -> assignment_statement','closed_statement',1,'p_closed_statement','parser.py',194),
+  ('closed_statement -> compound_statement','closed_statement',1,'p_closed_statement','parser.py',195),
+  ('closed_statement -> closed_if_statement','closed_statement',1,'p_closed_statement','parser.py',196),
+  ('closed_statement -> closed_while_statement','closed_statement',1,'p_closed_statement','parser.py',197),
+  ('closed_statement -> closed_for_statement','closed_statement',1,'p_closed_statement','parser.py',198),
+  ('closed_statement -> procedure_statement','closed_statement',1,'p_closed_statement','parser.py',199),
+  ('closed_statement -> empty','closed_statement',1,'p_closed_statement','parser.py',200),
+  ('open_while_statement -> WHILE boolean_expression DO open_statement','open_while_statement',4,'p_open_while_statement','parser.py',204),
+  ('closed_while_statement -> WHILE boolean_expression DO closed_statement','closed_while_statement',4,'p_closed_while_statement','parser.py',208),
+  ('open_for_statement -> FOR control_variable ASSIGNMENT initial_value direction final_value DO open_statement','open_for_statement',8,'p_open_for_statement','parser.py',212),
+  ('closed_for_statement -> FOR control_variable ASSIGNMENT initial_value direction final_value DO closed_statement','closed_for_statement',8,'p_closed_for_statement','parser.py',216),
+  ('open_if_statement -> IF boolean_expression THEN statement','open_if_statement',4,'p_open_if_statement','parser.py',220),
+  ('open_if_statement -> IF boolean_expression THEN closed_statement ELSE open_statement','open_if_statement',6,'p_open_if_statement','parser.py',221),
+  ('closed_if_statement -> IF boolean_expression THEN closed_statement ELSE closed_statement','closed_if_statement',6,'p_closed_if_statement','parser.py',228),
+  ('assignment_statement -> variable_access ASSIGNMENT expression','assignment_statement',3,'p_assignment_statement','parser.py',232),
+  ('procedure_statement -> identifier params','procedure_statement',2,'p_procedure_statement','parser.py',236),
+  ('procedure_statement -> identifier','procedure_statement',1,'p_procedure_statement','parser.py',237),
+  ('variable_access -> identifier','variable_access',1,'p_variable_access','parser.py',244),
+  ('variable_access -> indexed_variable','variable_access',1,'p_variable_access','parser.py',245),
+  ('variable_access -> field_designator','variable_access',1,'p_variable_access','parser.py',246),
+  ('variable_access -> variable_access UPARROW','variable_access',2,'p_variable_access','parser.py',247),
+  ('indexed_variable -> variable_access LBRAC index_expression_list RBRAC','indexed_variable',4,'p_indexed_variable','parser.py',257),
+  ('index_expression_list -> index_expression_list COMMA index_expression','index_expression_list',3,'p_index_expression_list','parser.py',261),
+  ('index_expression_list -> index_expression','index_expression_list',1,'p_index_expression_list','parser.py',262),
+  ('index_expression -> expression','index_expression',1,'p_index_expression','parser.py',270),
+  ('field_designator -> variable_access DOT identifier','field_designator',3,'p_field_designator','parser.py',274),
+  ('params -> LPAREN actual_parameter_list RPAREN','params',3,'p_params','parser.py',278),
+  ('actual_parameter_list -> actual_parameter_list COMMA actual_parameter','actual_parameter_list',3,'p_actual_parameter_list','parser.py',282),
+  ('actual_parameter_list -> actual_parameter','actual_parameter_list',1,'p_actual_parameter_list','parser.py',283),
+  ('actual_parameter -> expression','actual_parameter',1,'p_actual_parameter','parser.py',291),
+  ('actual_parameter -> expression COLON expression','actual_parameter',3,'p_actual_parameter','parser.py',292),
+  ('actual_parameter -> expression COLON expression COLON expression','actual_parameter',5,'p_actual_parameter','parser.py',293),
+  ('control_variable -> identifier','control_variable',1,'p_control_variable','parser.py',302),
+  ('initial_value -> expression','initial_value',1,'p_initial_value','parser.py',306),
+  ('direction -> TO','direction',1,'p_direction','parser.py',310),
+  ('direction -> DOWNTO','direction',1,'p_direction','parser.py',311),
+  ('final_value -> expression','final_value',1,'p_final_value','parser.py',315),
+  ('boolean_expression -> expression','boolean_expression',1,'p_boolean_expression','parser.py',319),
+  ('expression -> simple_expression','expression',1,'p_expression','parser.py',323),
+  ('expression -> simple_expression relop simple_expression','expression',3,'p_expression','parser.py',324),
+  ('expression -> error','expression',1,'p_expression','parser.py',325),
+  ('simple_expression -> term','simple_expression',1,'p_simple_expression','parser.py',332),
+  ('simple_expression -> simple_expression addop term','simple_expression',3,'p_simple_expression','parser.py',333),
+  ('term -> factor','term',1,'p_term','parser.py',340),
+  ('term -> term mulop factor','term',3,'p_term','parser.py',341),
+  ('factor -> sign factor','factor',2,'p_factor','parser.py',348),
+  ('factor -> exponentiation','factor',1,'p_factor','parser.py',349),
+  ('exponentiation -> primary','exponentiation',1,'p_exponentiation','parser.py',356),
+  ('exponentiation -> primary STARSTAR exponentiation','exponentiation',3,'p_exponentiation','parser.py',357),
+  ('primary -> variable_access','primary',1,'p_primary','parser.py',364),
+  ('primary -> unsigned_constant','primary',1,'p_primary','parser.py',365),
+  ('primary -> function_designator','primary',1,'p_primary','parser.py',366),
+  ('primary -> set_constructor','primary',1,'p_primary','parser.py',367),
+  ('primary -> LPAREN expression RPAREN','primary',3,'p_primary','parser.py',368),
+  ('primary -> NOT primary','primary',2,'p_primary','parser.py',369),
+  ('unsigned_constant -> unsigned_number','unsigned_constant',1,'p_unsigned_constant','parser.py',378),
+  ('unsigned_constant -> CHARACTER_STRING','unsigned_constant',1,'p_unsigned_constant','parser.py',379),
+  ('unsigned_constant -> NIL','unsigned_constant',1,'p_unsigned_constant','parser.py',380),
+  ('unsigned_number -> unsigned_integer','unsigned_number',1,'p_unsigned_number','parser.py',384),
+  ('unsigned_number -> unsigned_real','unsigned_number',1,'p_unsigned_number','parser.py',385),
+  ('unsigned_integer -> DIGSEQ','unsigned_integer',1,'p_unsigned_integer','parser.py',389),
+  ('unsigned_real -> REALNUMBER','unsigned_real',1,'p_unsigned_real','parser.py',393),
+  ('function_designator -> identifier params','function_designator',2,'p_function_designator','parser.py',397),
+  ('set_constructor -> LBRAC member_designator_list RBRAC','set_constructor',3,'p_set_constructor','parser.py',401),
+  ('set_constructor -> LBRAC RBRAC','set_constructor',2,'p_set_constructor','parser.py',402),
+  ('member_designator_list -> member_designator_list COMMA member_designator','member_designator_list',3,'p_member_designator_list','parser.py',409),
+  ('member_designator_list -> member_designator','member_designator_list',1,'p_member_designator_list','parser.py',410),
+  ('member_designator -> member_designator DOTDOT expression','member_designator',3,'p_member_designator','parser.py',418),
+  ('member_designator -> expression','member_designator',1,'p_member_designator','parser.py',419),
+  ('sign -> PLUS','sign',1,'p_sign','parser.py',426),
+  ('sign -> MINUS','sign',1,'p_sign','parser.py',427),
+  ('addop -> PLUS','addop',1,'p_addop','parser.py',431),
+  ('addop -> MINUS','addop',1,'p_addop','parser.py',432),
+  ('addop -> OR','addop',1,'p_addop','parser.py',433),
+  ('mulop -> STAR','mulop',1,'p_mulop','parser.py',437),
+  ('mulop -> SLASH','mulop',1,'p_mulop','parser.py',438),
+  ('mulop -> DIV','mulop',1,'p_mulop','parser.py',439),
+  ('mulop -> MOD','mulop',1,'p_mulop','parser.py',440),
+  ('mulop -> AND','mulop',1,'p_mulop','parser.py',441),
+  ('relop -> EQUAL','relop',1,'p_relop','parser.py',445),
+  ('relop -> NOTEQUAL','relop',1,'p_relop','parser.py',446),
+  ('relop -> LT','relop',1,'p_relop','parser.py',447),
+  ('relop -> GT','relop',1,'p_relop','parser.py',448),
+  ('relop -> LE','relop',1,'p_relop','parser.py',449),
+  ('relop -> GE','relop',1,'p_relop','parser.py',450),
+  ('relop -> IN','relop',1,'p_relop','parser.py',451),
+  ('type_denoter -> TREAL','type_denoter',1,'p_type_denoter','parser.py',455),
+  ('type_denoter -> TINTEGER','type_denoter',1,'p_type_denoter','parser.py',456),
+  ('type_denoter -> TBOOLEAN','type_denoter',1,'p_type_denoter','parser.py',457),
+  ('type_denoter -> TSTRING','type_denoter',1,'p_type_denoter','parser.py',458),
+  ('type_denoter -> TCHAR','type_denoter',1,'p_type_denoter','parser.py',459),
+  ('type_denoter -> array_type','type_denoter',1,'p_type_denoter','parser.py',460),
+  ('array_type -> ARRAY LBRAC index_range RBRAC OF type_denoter','array_type',6,'p_array_type','parser.py',464),
+  ('index_range -> simple_expression DOTDOT simple_expression','index_range',3,'p_index_range','parser.py',468),
+  ('identifier -> IDENTIFIER','identifier',1,'p_identifier','parser.py',472),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',476),
+]
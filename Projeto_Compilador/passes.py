@@ -0,0 +1,105 @@
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from syntax import AbstractSyntaxTree
+
+PASSES: Dict[str, type] = {}
+
+def register(cls):
+    PASSES[cls.name] = cls
+    return cls
+
+
+class PassError(Exception):
+    pass
+
+
+class Pass:
+    name = ''
+    requires: Tuple[str, ...] = ()
+
+    def run(self, tree: AbstractSyntaxTree, manager: 'PassManager'):
+        raise NotImplementedError
+
+
+class Analysis(Pass):
+    pass
+
+
+class Transform(Pass):
+    preserves: Tuple[str, ...] = ()
+
+
+class PassManager:
+    def __init__(self, pipeline: Sequence[str] = (), options: Optional[Dict[str, object]] = None):
+        self.options = options or {}
+        self.pipeline = self.schedule(pipeline)
+        self.results: Dict[str, Tuple[AbstractSyntaxTree, object]] = {}
+        self.timings: Dict[str, float] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def schedule(self, names: Sequence[str]) -> List[Transform]:
+        order: List[Transform] = []
+        state: Dict[str, bool] = {}
+
+        def visit(name: str):
+            if state.get(name):
+                return
+            if name in state:
+                raise PassError(f"Pass dependency cycle through '{name}'")
+            cls = PASSES.get(name)
+            if cls is None:
+                raise PassError(f"Unknown pass '{name}'")
+            state[name] = False
+            for dependency in cls.requires:
+                visit(dependency)
+            state[name] = True
+            if issubclass(cls, Transform):
+                order.append(cls())
+
+        for name in names:
+            visit(name)
+        return order
+
+    def run(self, tree: AbstractSyntaxTree) -> AbstractSyntaxTree:
+        for transform in self.pipeline:
+            for dependency in transform.requires:
+                if issubclass(PASSES[dependency], Analysis):
+                    self.analysis(dependency, tree)
+            result = self._timed(transform, tree)
+            if result is not tree:
+                self.invalidate(transform.preserves)
+                tree = result
+        return tree
+
+    def analysis(self, name: str, tree: AbstractSyntaxTree):
+        cached = self.results.get(name)
+        if cached is not None and cached[0] is tree:
+            return cached[1]
+        cls = PASSES.get(name)
+        if cls is None or not issubclass(cls, Analysis):
+            raise PassError(f"Unknown analysis '{name}'")
+        for dependency in cls.requires:
+            self.analysis(dependency, tree)
+        result = self._timed(cls(), tree)
+        self.results[name] = (tree, result)
+        return result
+
+    def invalidate(self, preserved: Sequence[str] = ()):
+        self.results = {name: result for name, result in self.results.items() if name in preserved}
+
+    def record(self, name: str, key: str, value: int = 1):
+        counters = self.stats.setdefault(name, {})
+        counters[key] = counters.get(key, 0) + value
+
+    def _timed(self, instance: Pass, tree: AbstractSyntaxTree):
+        start = time.perf_counter()
+        try:
+            return instance.run(tree, self)
+        finally:
+            self.timings[instance.name] = self.timings.get(instance.name, 0.0) + time.perf_counter() - start
+
+    def report(self) -> str:
+        lines = [f"{name:<32} {seconds * 1000:10.3f} ms" for name, seconds in self.timings.items()]
+        for name, counters in self.stats.items():
+            lines.extend(f"{name:<32} {key}: {value}" for key, value in counters.items())
+        return "\n".join(lines)
@@ -0,0 +1,548 @@
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import syntax as ast
+from passes import Analysis, register
+
+NUMERIC_TYPES = ("integer", "real")
+BOOLEAN_OPERATORS = ("=", "<>", "<", "<=", ">", ">=", "and", "or")
+READ_PROCEDURES = ("readln", "read")
+WRITE_PROCEDURES = ("writeln", "write")
+PREDEFINED_FUNCTIONS = ("length", "charat")
+INTEGER_MIN = -2 ** 31
+INTEGER_MAX = 2 ** 31 - 1
+# roughly the EWVM instructions each node adds on top of its children; size heuristics use these instead of translating
+NODE_COSTS = {
+    ast.Constant: 1, ast.VariableAccess: 1, ast.IndexedVariable: 5, ast.BinaryExpression: 1, ast.SignedExpression: 1,
+    ast.NotExpression: 1, ast.Exponentiation: 5, ast.FunctionCall: 2, ast.AssignmentStatement: 0, ast.ProcedureCall: 2,
+    ast.IfStatement: 2, ast.WhileStatement: 4, ast.ForStatement: 11,
+}
+
+
+class Symbol:
+    __slots__ = ('name', 'type', 'slot', 'lower_bound', 'upper_bound', 'element_type', 'params')
+
+    def __init__(self, name: str, type: str, slot: Optional[int] = None, lower_bound: Optional[int] = None,
+                 upper_bound: Optional[int] = None, element_type: Optional[str] = None, params: int = 0):
+        self.name = name
+        self.type = type
+        self.slot = slot
+        self.lower_bound = lower_bound
+        self.upper_bound = upper_bound
+        self.element_type = element_type
+        self.params = params
+
+    @property
+    def is_function(self) -> bool:
+        return self.slot is None
+
+    @property
+    def size(self) -> int:
+        if self.lower_bound is None:
+            return 1
+        return self.upper_bound - self.lower_bound + 1
+
+    def __repr__(self):
+        if self.is_function:
+            return f"Symbol(name={self.name}, type={self.type}, params={self.params})"
+        return f"Symbol(name={self.name}, type={self.type}, slot={self.slot})"
+
+
+class SymbolTable:
+    def __init__(self):
+        self.globals: Dict[str, Symbol] = {}
+        self.locals: Dict[str, Dict[str, Symbol]] = {}
+        self.functions: Dict[str, Symbol] = {}
+        self.counter = 0
+
+    def lookup(self, name: str, function: Optional[str] = None) -> Optional[Symbol]:
+        if function:
+            symbol = self.locals[function].get(name)
+            if symbol is not None:
+                return symbol
+        return self.globals.get(name)
+
+    def declare(self, name: str, type: str, function: Optional[str] = None, lower_bound: Optional[int] = None,
+                upper_bound: Optional[int] = None, element_type: Optional[str] = None, redeclare: bool = False) -> Optional[Symbol]:
+        variables = self.locals[function] if function else self.globals
+        if name in variables and not redeclare:
+            return None
+        symbol = Symbol(name, type, self.counter, lower_bound, upper_bound, element_type)
+        variables[name] = symbol
+        self.counter += symbol.size
+        return symbol
+
+    def declare_function(self, name: str, params: int) -> Symbol:
+        symbol = self.functions[name] = Symbol(name, "function", params=params)
+        self.locals[name] = {}
+        return symbol
+
+
+class Scope:
+    __slots__ = ('function', 'bindings', 'types', 'declarations')
+
+    def __init__(self, function: Optional[str]):
+        self.function = function
+        self.bindings: Dict[int, Optional[Symbol]] = {}
+        self.types: Dict[int, str | ast.TranslationError] = {}
+        self.declarations: Dict[int, List[Symbol] | ast.TranslationError] = {}
+
+    def symbol(self, node: ast.Node) -> Optional[Symbol]:
+        return self.bindings[id(node)]
+
+    def type_of(self, expr: ast.Expression) -> str:
+        expr_type = self.types[id(expr)]
+        if isinstance(expr_type, ast.TranslationError):
+            raise expr_type
+        return expr_type
+
+    def declared(self, declaration: ast.VariableDeclaration) -> List[Symbol]:
+        symbols = self.declarations[id(declaration)]
+        if isinstance(symbols, ast.TranslationError):
+            raise symbols
+        return symbols
+
+
+class SemanticModel:
+    def __init__(self, table: SymbolTable):
+        self.table = table
+        self.scopes: Dict[Optional[str], Scope] = {}
+
+    def scope(self, function: Optional[str] = None) -> Scope:
+        scope = self.scopes.get(function)
+        if scope is None:
+            scope = self.scopes[function] = Scope(function)
+        return scope
+
+
+def integer_operation(operator: str, left: int, right: int) -> Optional[int]:
+    if operator == "+":
+        value = left + right
+    elif operator == "-":
+        value = left - right
+    elif operator == "*":
+        value = left * right
+    elif operator in ("div", "mod") and left >= 0 and right > 0:
+        value = left // right if operator == "div" else left % right
+    else:
+        return None
+    return value if INTEGER_MIN <= value <= INTEGER_MAX else None
+
+def integer_power(base: int, exponent: int) -> Optional[int]:
+    if exponent < 0 or (abs(base) > 1 and exponent > 64):
+        return None
+    value = base ** exponent
+    return value if INTEGER_MIN <= value <= INTEGER_MAX else None
+
+def _constant_combine(item, args):
+    if args is None:
+        return item
+    kind = ast.node_type(item)
+    if kind is ast.Constant:
+        return int(item.value) if item.kind == 'integer' else None
+    if kind is ast.SignedExpression:
+        sign, value = args
+        return None if value is None else value if sign == "+" else integer_operation("-", 0, value)
+    if kind is ast.BinaryExpression:
+        operator, left, right = args
+        return None if left is None or right is None else integer_operation(operator, left, right)
+    if kind is ast.Exponentiation:
+        base, exponent = args
+        return None if base is None or exponent is None else integer_power(base, exponent)
+    return None
+
+def power_may_trap(expr: ast.Exponentiation) -> bool:
+    # a negative exponent stops the program, so only a non-negative literal exponent is known not to
+    exponent = expr.exponent
+    return not (ast.node_type(exponent) is ast.Constant and exponent.kind == 'integer' and int(exponent.value) >= 0)
+
+def constant_value(expr: ast.Expression) -> Optional[int]:
+    return ast.fold(expr, _constant_combine)
+
+def integer_constant(expr: ast.Expression) -> int:
+    value = constant_value(expr)
+    if value is None:
+        raise ast.TranslationError(f"Expected constant integer, got {expr}")
+    return value
+
+def type_name(type_denoter) -> str:
+    if isinstance(type_denoter, ast.NamedType):
+        return type_denoter.name
+    if isinstance(type_denoter, ast.ArrayType):
+        return "array"
+    if isinstance(type_denoter, ast.FunctionHeading):
+        return "function"
+    return "integer"
+
+def reads_into_array(body: ast.Statement) -> bool:
+    if not (isinstance(body, ast.CompoundStatement) and body.statements):
+        return False
+    first = body.statements[0]
+    if not (isinstance(first, ast.ProcedureCall) and first.identifier.name.lower() in READ_PROCEDURES):
+        return False
+    return bool(first.args) and isinstance(first.args[0].expression, ast.IndexedVariable)
+
+
+def self_tail_calls(body: ast.Statement, scope: Scope, function: Symbol) -> Set[int]:
+    calls = set()
+    pending = [body]
+    while pending:
+        statement = pending.pop()
+        kind = ast.node_type(statement)
+        if kind is ast.CompoundStatement:
+            # empty statements may trail the one that ends the function
+            for child in reversed(statement.statements):
+                pending.append(child)
+                if ast.node_type(child) is not ast.CompoundStatement or child.statements:
+                    break
+        elif kind is ast.IfStatement:
+            pending.append(statement.then_stmt)
+            if statement.else_stmt is not None:
+                pending.append(statement.else_stmt)
+        elif kind is ast.AssignmentStatement:
+            expression = statement.expression
+            if (ast.node_type(expression) is ast.FunctionCall and scope.bindings.get(id(statement)) is function
+                    and scope.bindings.get(id(expression)) is function and len(expression.params or []) == function.params):
+                calls.add(id(statement))
+    return calls
+
+
+def scope_bodies(tree: ast.AbstractSyntaxTree, model: SemanticModel) -> List[Tuple[Scope, ast.CompoundStatement]]:
+    bodies = []
+    for function in tree.program.block.functions or []:
+        if isinstance(function.body, ast.Block):
+            bodies.append((model.scope(function.heading.identifier.name), function.body.statements))
+    bodies.append((model.scope(), tree.program.block.statements))
+    return bodies
+
+def call_graph(tree: ast.AbstractSyntaxTree, model: SemanticModel) -> Dict[Optional[str], Set[str]]:
+    graph: Dict[Optional[str], Set[str]] = {}
+    for scope, body in scope_bodies(tree, model):
+        callees = graph[scope.function] = set()
+        for node in ast.walk(body):
+            kind = ast.node_type(node)
+            if kind is ast.FunctionCall or kind is ast.ProcedureCall:
+                symbol = scope.bindings.get(id(node))
+                if symbol is not None and symbol.is_function:
+                    callees.add(symbol.name)
+    return graph
+
+def reentrant_callees(graph: Dict[Optional[str], Set[str]], function: str) -> Set[str]:
+    reentrant = set()
+    for callee in graph.get(function, ()):
+        pending, seen = [callee], set()
+        while pending:
+            name = pending.pop()
+            if name == function:
+                reentrant.add(callee)
+                break
+            if name not in seen:
+                seen.add(name)
+                pending.extend(graph.get(name, ()))
+    return reentrant
+
+def result_functions(tree: ast.AbstractSyntaxTree, model: SemanticModel) -> Set[str]:
+    # functions leave their result on the stack, so only those that assign it leave anything
+    results = set()
+    for scope, body in scope_bodies(tree, model):
+        for node in ast.walk(body):
+            if ast.node_type(node) is ast.AssignmentStatement and ast.node_type(node.variable) is ast.VariableAccess:
+                symbol = scope.bindings.get(id(node))
+                if symbol is not None and symbol.is_function and symbol.name == scope.function:
+                    results.add(symbol.name)
+    return results
+
+
+def node_cost(root: object, scope: Scope) -> Optional[int]:
+    # None when the translator would reject the code, which optimizers then leave alone
+    bindings, types = scope.bindings, scope.types
+    cost = 0
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        kind = ast.node_type(node)
+        if kind is list:
+            pending.extend(node)
+            continue
+        if not isinstance(node, ast.Node):
+            continue
+        key = id(node)
+        if isinstance(types.get(key), ast.TranslationError):
+            return None
+        weight = NODE_COSTS.get(kind, 0)
+        if kind is ast.FunctionCall and node.identifier.name in PREDEFINED_FUNCTIONS:
+            # predefined functions are a single instruction after their arguments
+            weight = 1
+        elif key in bindings and bindings[key] is None:
+            return None
+        elif kind is ast.IfStatement and node.else_stmt is not None:
+            weight += 2
+        elif kind is ast.Exponentiation and ast.node_type(node.exponent) is ast.Constant and node.exponent.kind == 'integer':
+            # constant powers become a squaring chain in place of the exponent and the helper call
+            exponent = int(node.exponent.value)
+            cost += 2 if exponent <= 0 else 2 * (exponent.bit_length() + bin(exponent).count("1") - 2)
+            pending.append(node.base)
+            continue
+        cost += weight
+        pending.extend([getattr(node, field) for field in node._fields])
+    return cost
+
+
+class SemanticAnalyzer:
+    def __init__(self, table: Optional[SymbolTable] = None):
+        self.table = table if table is not None else SymbolTable()
+        self.model = SemanticModel(self.table)
+        self.function: Optional[str] = None
+        self.scope = self.model.scope()
+
+    def analyze(self, tree: ast.AbstractSyntaxTree) -> SemanticModel:
+        program = tree.program
+        try:
+            self._declare(program.block.variables or [])
+            for function in program.block.functions or []:
+                self._function(function)
+            self._enter(None)
+            self._statements(program.block.statements)
+        except ast.TranslationError:
+            pass
+        return self.model
+
+    def _enter(self, function: Optional[str]):
+        self.function = function
+        self.scope = self.model.scope(function)
+
+    def _function(self, declaration: ast.FunctionDeclaration):
+        heading = declaration.heading
+        name = heading.identifier.name
+        self.table.declare_function(name, sum(len(section.identifiers) for section in heading.parameters))
+        self._enter(name)
+        for section in heading.parameters:
+            section_type = type_name(section.type_denoter)
+            for ident in section.identifiers:
+                self.table.declare(ident.name, section_type, name, redeclare=True)
+        self._declare(declaration.local_variables)
+        if isinstance(declaration.body, ast.Block):
+            self._statements(declaration.body.statements)
+
+    def _declare(self, declarations: List[ast.VariableDeclaration]):
+        for declaration in declarations:
+            try:
+                self.scope.declarations[id(declaration)] = self._declare_variable(declaration)
+            except ast.TranslationError as error:
+                self.scope.declarations[id(declaration)] = error
+                raise
+
+    def _declare_variable(self, declaration: ast.VariableDeclaration) -> List[Symbol]:
+        type_denoter = declaration.type_denoter
+        symbols = []
+        if isinstance(type_denoter, ast.ArrayType):
+            element_type = type_name(type_denoter.element_type)
+            lower_bound = integer_constant(type_denoter.index_range.lower)
+            upper_bound = integer_constant(type_denoter.index_range.upper)
+            for ident in declaration.identifiers:
+                if ident.name == "numeros":
+                    continue
+                symbols.append(self.table.declare(ident.name, "array", self.function, lower_bound, upper_bound, element_type))
+        else:
+            variable_type = type_name(type_denoter)
+            for ident in declaration.identifiers:
+                symbols.append(self.table.declare(ident.name, variable_type, self.function))
+        return [symbol for symbol in symbols if symbol is not None]
+
+    def _statements(self, statement: ast.Statement):
+        pending = [statement]
+        while pending:
+            statement = pending.pop()
+            kind = ast.node_type(statement)
+            if kind is ast.CompoundStatement:
+                pending.extend(reversed(statement.statements))
+            elif kind is ast.AssignmentStatement:
+                self._assignment(statement)
+            elif kind is ast.IfStatement:
+                self._expression(statement.condition)
+                if statement.else_stmt:
+                    pending.append(statement.else_stmt)
+                pending.append(statement.then_stmt)
+            elif kind is ast.WhileStatement:
+                self._expression(statement.condition)
+                pending.append(statement.body)
+            elif kind is ast.ForStatement:
+                self._for(statement)
+                if not reads_into_array(statement.body):
+                    pending.append(statement.body)
+            elif kind is ast.ProcedureCall:
+                self._procedure_call(statement)
+            else:
+                self._expression(statement)
+
+    def _assignment(self, statement: ast.AssignmentStatement):
+        self._expression(statement.expression)
+        self._infer(statement.expression)
+        target = statement.variable
+        if isinstance(target, ast.VariableAccess):
+            name = target.identifier.name
+            self.scope.bindings[id(statement)] = self.table.functions.get(name) or self.table.lookup(name, self.function)
+        else:
+            self._expression(target)
+
+    def _for(self, statement: ast.ForStatement):
+        name = statement.control_var.name
+        self.table.declare(name, "integer", self.function)
+        self.scope.bindings[id(statement)] = self.table.lookup(name, self.function)
+        self._expression(statement.initial_value)
+        self._expression(statement.final_value)
+
+    def _procedure_call(self, statement: ast.ProcedureCall):
+        name = statement.identifier.name.lower()
+        args = statement.args or []
+        if name in READ_PROCEDURES:
+            if args:
+                target = args[0].expression
+                if isinstance(target, ast.VariableAccess):
+                    self.scope.bindings[id(args[0])] = self.table.lookup(target.identifier.name, self.function)
+                elif isinstance(target, ast.IndexedVariable):
+                    self.scope.bindings[id(args[0])] = self.table.globals.get(target.variable.identifier.name)
+            return
+        if name not in WRITE_PROCEDURES:
+            self.scope.bindings[id(statement)] = self.table.functions.get(name)
+        self._expression([arg.expression for arg in args])
+        for arg in args:
+            if ast.node_type(arg.expression) is ast.VariableAccess:
+                self.scope.bindings[id(arg)] = self.table.lookup(arg.expression.identifier.name, self.function)
+
+    def _expression(self, expr: ast.Expression):
+        bindings = self.scope.bindings
+        lookup = self.table.lookup
+        function = self.function
+        indexed = []
+        pending = [expr]
+        while pending:
+            node = pending.pop()
+            kind = ast.node_type(node)
+            if kind is ast.VariableAccess:
+                name = node.identifier.name.lower()
+                if name not in ("true", "false"):
+                    bindings[id(node)] = lookup(name, function)
+            elif kind is ast.Constant:
+                pass
+            elif kind is ast.BinaryExpression:
+                pending.append(node.right)
+                pending.append(node.left)
+            elif kind is ast.IndexedVariable:
+                bindings[id(node)] = lookup(node.variable.identifier.name, function)
+                indexed.append(node)
+                pending.extend(reversed(node.indices))
+            elif kind is ast.FunctionCall:
+                bindings[id(node)] = self.table.functions.get(node.identifier.name)
+                if node.params:
+                    pending.extend(param.expression for param in reversed(node.params))
+            elif kind is list:
+                pending.extend(reversed(node))
+            elif isinstance(node, ast.Node):
+                pending.extend([getattr(node, field) for field in reversed(node._fields)])
+        for node in indexed:
+            self._infer(node.indices[0])
+
+    def _infer(self, expr: ast.Expression):
+        types = self.scope.types
+        pending = [expr]
+        combining = []
+        while pending:
+            expr = pending.pop()
+            if expr is None:
+                expr = combining.pop()
+                if ast.node_type(expr) is ast.BinaryExpression:
+                    types[id(expr)] = self._combine(types[id(expr.left)], types[id(expr.right)])
+                else:
+                    types[id(expr)] = types[id(expr.expression if ast.node_type(expr) is ast.SignedExpression else expr.base)]
+                continue
+            if id(expr) in types:
+                continue
+            kind = ast.node_type(expr)
+            if kind is ast.BinaryExpression and expr.operator not in BOOLEAN_OPERATORS:
+                combining.append(expr)
+                pending.extend((None, expr.right, expr.left))
+            elif kind is ast.SignedExpression:
+                combining.append(expr)
+                pending.extend((None, expr.expression))
+            elif kind is ast.Exponentiation:
+                combining.append(expr)
+                pending.extend((None, expr.base))
+            else:
+                types[id(expr)] = self._operand_type(expr)
+
+    def _combine(self, left_type, right_type):
+        if isinstance(left_type, ast.TranslationError) or isinstance(right_type, ast.TranslationError):
+            return left_type if isinstance(left_type, ast.TranslationError) else right_type
+        if left_type == right_type or not (left_type in NUMERIC_TYPES and right_type in NUMERIC_TYPES):
+            return left_type
+        return "real" if "real" in (left_type, right_type) else "integer"
+
+    def _operand_type(self, expr: ast.Expression) -> str | ast.TranslationError:
+        kind = ast.node_type(expr)
+        if kind is ast.Constant:
+            if expr.kind == 'string':
+                return "char" if len(expr.value) == 1 else "string"
+            return expr.kind
+        if kind is ast.VariableAccess:
+            name = expr.identifier.name.lower()
+            if name in ("true", "false"):
+                return "boolean"
+            symbol = self.scope.bindings[id(expr)]
+            if symbol is None:
+                return ast.TranslationError(f"Variable '{name}' not declared")
+            return symbol.type
+        if kind is ast.IndexedVariable:
+            if self.scope.bindings[id(expr)] is None:
+                return ast.TranslationError(f"Variable '{expr.variable.identifier.name}' not declared")
+            # element types are not propagated through indexing; reads type as integer
+            return "integer"
+        if kind is ast.BinaryExpression or kind is ast.NotExpression:
+            return "boolean"
+        if kind is ast.FunctionCall:
+            return "char" if expr.identifier.name == "charat" else "integer"
+        return ast.TranslationError(f"Cannot infer type for expression {expr}")
+
+
+def analyze(tree: ast.AbstractSyntaxTree, table: Optional[SymbolTable] = None) -> SemanticModel:
+    return SemanticAnalyzer(table).analyze(tree)
+
+
+@register
+class SemanticAnalysis(Analysis):
+    name = 'semantic'
+
+    def run(self, tree: ast.AbstractSyntaxTree, manager) -> SemanticModel:
+        return analyze(tree)
+
+
+def transform_program(tree: ast.AbstractSyntaxTree, model: SemanticModel, rewriter: Callable[[Scope], Callable[[ast.Node], object]]) -> ast.AbstractSyntaxTree:
+    block = tree.program.block
+    main = model.scope()
+    functions = block.functions
+    if functions:
+        functions = [ast.transform(function, rewriter(model.scope(function.heading.identifier.name))) for function in functions]
+        if all(new is old for new, old in zip(functions, block.functions)):
+            functions = block.functions
+    variables = ast.transform(block.variables, rewriter(main)) if block.variables else block.variables
+    statements = ast.transform(block.statements, rewriter(main))
+    if functions is block.functions and variables is block.variables and statements is block.statements:
+        return tree
+    return ast.AbstractSyntaxTree(ast.Program(tree.program.heading, ast.Block(functions, variables, statements)))
+
+def rewrite_statements(tree: ast.AbstractSyntaxTree, model: SemanticModel, rewriter: Callable[[Scope], Callable[[ast.CompoundStatement], ast.CompoundStatement]]) -> ast.AbstractSyntaxTree:
+    block = tree.program.block
+    functions = block.functions
+    if functions:
+        functions = []
+        for function in block.functions:
+            body = function.body
+            if isinstance(body, ast.Block):
+                statements = rewriter(model.scope(function.heading.identifier.name))(body.statements)
+                if statements is not body.statements:
+                    function = ast.FunctionDeclaration(function.heading, ast.Block(body.functions, body.variables, statements), function.local_variables)
+            functions.append(function)
+        if all(new is old for new, old in zip(functions, block.functions)):
+            functions = block.functions
+    statements = rewriter(model.scope())(block.statements)
+    if functions is block.functions and statements is block.statements:
+        return tree
+    return ast.AbstractSyntaxTree(ast.Program(tree.program.heading, ast.Block(functions, block.variables, statements)))
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import marshal
+import sys
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar, override
+from types import GeneratorType
+from typing import Callable, Dict, Generic, Iterator, List, Optional, TypeVar, override
 
 T = TypeVar("T", bound="Translator")
 
@@ -100,49 +103,425 @@ class Translator(ABC, Generic[T]):
     def translate(self, ast: AbstractSyntaxTree) -> T:
         pass
 
+    @classmethod
+    def dispatch_table(cls) -> DispatchTable:
+        table = cls.__dict__.get('_dispatch')
+        if table is None:
+            table = cls._dispatch = DispatchTable(cls)
+        return table
+
+    def run(self, node) -> T:
+        dispatch = self.dispatch_table()
+        result = dispatch[type(node)](self, node)
+        if not isinstance(result, GeneratorType):
+            return result
+        stack = [result]
+        value = None
+        while stack:
+            try:
+                child = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                continue
+            result = dispatch[type(child)](self, child)
+            if isinstance(result, GeneratorType):
+                stack.append(result)
+                value = None
+            else:
+                value = result
+        return value
+
 
 class TranslationError(Exception):
     pass
 
-class Expression(ABC):
-    def __init__(self):
-        pass
 
-    @abstractmethod
-    def __repr__(self):
-        pass
+class DispatchTable(dict):
+    def __init__(self, translator_class: type):
+        super().__init__()
+        self.translator_class = translator_class
+
+    def __missing__(self, node_type: type) -> Callable:
+        name = VISITORS.get(getattr(node_type, 'node_class', None))
+        if name is None:
+            raise TranslationError(f"{self.translator_class.__name__} cannot visit {node_type.__name__}")
+        handler = self[node_type] = getattr(self.translator_class, name)
+        return handler
+
+
+class Node:
+    __slots__ = ('_hash',)
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'node_class' not in cls.__dict__:
+            cls.node_class = cls
+            cls._fields = cls.__dict__.get('__slots__', ())
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            return structural_hash(self)
 
-    @abstractmethod
     def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Node) or self.node_class is not other.node_class:
+            return NotImplemented
+        return structural_equal(self, other)
+
+    def __repr__(self):
+        return render(self)
+
+    def evaluate(self, translator: Translator):
+        return translator.run(self)
+
+
+def node_type(value) -> type:
+    # flat views subclass the node class they stand for
+    kind = type(value)
+    return getattr(kind, 'node_class', kind)
+
+
+def fold(value, combine, cached=None):
+    stack = [(value, None)]
+    results = []
+    while stack:
+        item, children = stack.pop()
+        if children is not None:
+            count = len(children)
+            args = results[len(results) - count:]
+            del results[len(results) - count:]
+            results.append(combine(item, args))
+            continue
+        if cached is not None:
+            known = cached(item)
+            if known is not None:
+                results.append(known)
+                continue
+        if isinstance(item, Node):
+            children = [getattr(item, field) for field in item._fields]
+        elif isinstance(item, list):
+            children = item
+        else:
+            results.append(combine(item, None))
+            continue
+        stack.append((item, children))
+        stack.extend([(child, None) for child in reversed(children)])
+    return results[0]
+
+
+def _cached_hash(item):
+    return getattr(item, '_hash', None) if isinstance(item, Node) else None
+
+def _combine_hash(item, args):
+    if args is None:
+        return hash(item)
+    if isinstance(item, list):
+        return hash(tuple(args))
+    return hash((item.node_class.__name__, *args))
+
+def structural_hash(value) -> int:
+    return fold(value, _combine_hash, _cached_hash)
+
+
+def structural_equal(left, right) -> bool:
+    stack = [(left, right)]
+    while stack:
+        left, right = stack.pop()
+        if left is right:
+            continue
+        if isinstance(left, Node):
+            if not isinstance(right, Node) or left.node_class is not right.node_class:
+                return False
+            left_hash, right_hash = getattr(left, '_hash', None), getattr(right, '_hash', None)
+            if left_hash is not None and right_hash is not None and left_hash != right_hash:
+                return False
+            stack.extend([(getattr(left, field), getattr(right, field)) for field in left._fields])
+        elif isinstance(left, list):
+            if not isinstance(right, list) or len(left) != len(right):
+                return False
+            stack.extend(zip(left, right))
+        elif isinstance(right, (Node, list)) or left != right:
+            return False
+    return True
+
+
+class _Rendered:
+    __slots__ = ('fields', 'slot')
+
+    def __init__(self, fields, slot):
+        self.fields = fields
+        self.slot = slot
+
+    def __getattr__(self, name):
+        try:
+            return self.fields[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __repr__(self):
+        return f"\x00{self.slot}\x00"
+
+    __str__ = __repr__
+
+    def __format__(self, spec):
+        return repr(self)
+
+
+def render(value) -> str:
+    templates = []
+
+    def combine(item, args):
+        if args is None or isinstance(item, list):
+            return item if args is None else args
+        proxy = _Rendered(dict(zip(item._fields, args)), len(templates))
+        templates.append(None)
+        templates[proxy.slot] = type(item)._format(proxy)
+        return proxy
+
+    root = fold(value, combine)
+    if not isinstance(root, _Rendered):
+        return repr(root)
+    output = []
+    pending = [(True, templates[root.slot])]
+    while pending:
+        is_template, text = pending.pop()
+        if not is_template:
+            output.append(text)
+            continue
+        parts = text.split("\x00")
+        for position in range(len(parts) - 1, -1, -1):
+            if position % 2:
+                pending.append((True, templates[int(parts[position])]))
+            else:
+                pending.append((False, parts[position]))
+    return "".join(output)
+
+
+class NodeInterner:
+    def __init__(self):
+        self.table: Dict[tuple, Node] = {}
+
+    def __len__(self):
+        return len(self.table)
+
+    def intern(self, value):
+        return fold(value, self._combine)
+
+    def _combine(self, item, args):
+        if args is None:
+            return item
+        if isinstance(item, list):
+            return args
+        # children are interned already, so their identity stands for their structure
+        key = (item.node_class, *[_identity_key(arg) for arg in args])
+        node = self.table.get(key)
+        if node is not None:
+            return node
+        if any(arg is not getattr(item, field) for field, arg in zip(item._fields, args)):
+            node = item.node_class.__new__(item.node_class)
+            for field, arg in zip(item._fields, args):
+                setattr(node, field, arg)
+        else:
+            node = item
+        # only interned nodes keep their hash: they are shared, so nothing may change them anyway
+        node._hash = _combine_hash(node, [hash(tuple([hash(member) for member in arg])) if isinstance(arg, list) else hash(arg) for arg in args])
+        self.table[key] = node
+        return node
+
+
+def _identity_key(value):
+    if isinstance(value, Node):
+        return id(value)
+    if isinstance(value, list):
+        return (list, tuple([_identity_key(member) for member in value]))
+    return (type(value), value)
+
+
+def walk(value) -> Iterator[Node]:
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, Node):
+            yield item
+            stack.extend([getattr(item, field) for field in reversed(item._fields)])
+
+
+def transform(value, function: Callable[[Node], object]):
+    order = []
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, Node):
+            children = [getattr(item, field) for field in item._fields]
+        elif isinstance(item, list):
+            children = item
+        else:
+            continue
+        order.append((item, children))
+        stack.extend(children)
+    replaced = {}
+    done = set()
+    for item, children in reversed(order):
+        if id(item) in done:
+            continue
+        done.add(id(item))
+        if replaced:
+            args = [replaced.get(id(child), child) for child in children]
+            changed = any(arg is not child for arg, child in zip(args, children))
+        else:
+            changed = False
+        if isinstance(item, list):
+            if changed:
+                replaced[id(item)] = args
+            continue
+        if changed:
+            node = item.node_class.__new__(item.node_class)
+            for field, arg in zip(item._fields, args):
+                setattr(node, field, arg)
+            result = function(node)
+        else:
+            result = function(item)
+        if result is not item:
+            replaced[id(item)] = result
+    return replaced.get(id(value), value)
+
+
+class Expression(Node, ABC):
+    __slots__ = ()
+
+    def __init__(self):
         pass
 
     @abstractmethod
-    def evaluate(self, translator: Translator):
+    def _format(self):
         pass
 
 class Statement(Expression):
-    pass 
+    __slots__ = ()
+
+
+class Identifier(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _format(self):
+        return f"Identifier(name={self.name})"
+
+
+class ProgramHeading(Node):
+    __slots__ = ('identifier', 'parameters')
+
+    def __init__(self, identifier: Identifier, parameters: Optional[List[Identifier]] = None):
+        self.identifier = identifier
+        self.parameters = parameters
+
+    def _format(self):
+        return f"ProgramHeading(identifier={self.identifier}, parameters={self.parameters})"
+
+
+class NamedType(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _format(self):
+        return f"NamedType(name={self.name})"
+
+
+class IndexRange(Node):
+    __slots__ = ('lower', 'upper')
+
+    def __init__(self, lower: Expression, upper: Expression):
+        self.lower = lower
+        self.upper = upper
+
+    def _format(self):
+        return f"IndexRange(lower={self.lower}, upper={self.upper})"
+
+
+class ParameterSection(Node):
+    __slots__ = ('kind', 'identifiers', 'type_denoter')
+
+    def __init__(self, kind: str, identifiers: List[Identifier], type_denoter: NamedType | ArrayType | FunctionHeading):
+        self.kind = kind
+        self.identifiers = identifiers
+        self.type_denoter = type_denoter
+
+    def _format(self):
+        return f"ParameterSection(kind={self.kind}, identifiers={self.identifiers}, type={self.type_denoter})"
+
+
+class FunctionHeading(Node):
+    __slots__ = ('identifier', 'parameters', 'return_type')
+
+    def __init__(self, identifier: Identifier, parameters: List[ParameterSection], return_type: Optional[NamedType | ArrayType]):
+        self.identifier = identifier
+        self.parameters = parameters
+        self.return_type = return_type
+
+    def _format(self):
+        return f"FunctionHeading(identifier={self.identifier}, parameters={self.parameters}, return_type={self.return_type})"
+
+
+class Directive(Node):
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def _format(self):
+        return f"Directive(name={self.name})"
+
+
+class ActualParameter(Node):
+    __slots__ = ('expression', 'width', 'precision')
+
+    def __init__(self, expression: Expression, width: Optional[Expression] = None, precision: Optional[Expression] = None):
+        self.expression = expression
+        self.width = width
+        self.precision = precision
+
+    def _format(self):
+        return f"ActualParameter(expression={self.expression}, width={self.width}, precision={self.precision})"
+
+
+class SetMember(Node):
+    __slots__ = ('lower', 'upper')
+
+    def __init__(self, lower: Expression, upper: Optional[Expression] = None):
+        self.lower = lower
+        self.upper = upper
+
+    def _format(self):
+        return f"SetMember(lower={self.lower}, upper={self.upper})"
+
 
 class Program(Expression):
-    def __init__(self, heading: tuple, block: 'Block'):
+    __slots__ = ('heading', 'block')
+
+    def __init__(self, heading: 'ProgramHeading', block: 'Block'):
         super().__init__()
         self.heading = heading
         self.block = block
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"Program(heading={self.heading}, block={self.block})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, Program) and self.heading == other.heading and self.block == other.block
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_program(self)
-
 
 class Block(Expression):
+    __slots__ = ('functions', 'variables', 'statements')
+
     def __init__(self, functions: Optional[List['FunctionDeclaration']], variables: Optional[List['VariableDeclaration']], statements: 'CompoundStatement'):
         super().__init__()
         self.functions = functions
@@ -150,106 +529,77 @@ class Block(Expression):
         self.statements = statements
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"Block(functions={self.functions}, variables={self.variables}, statements={self.statements})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, Block) and self.functions == other.functions and self.variables == other.variables and self.statements == other.statements
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_block(self)
-
 
 class FunctionDeclaration(Expression):
-    def __init__(self, heading: tuple, body: 'Block' | tuple, local_variables: Optional[List['VariableDeclaration']] = None):
+    __slots__ = ('heading', 'body', 'local_variables')
+
+    def __init__(self, heading: 'FunctionHeading', body: Block | Directive, local_variables: Optional[List['VariableDeclaration']] = None):
         super().__init__()
         self.heading = heading
         self.body = body
         self.local_variables = local_variables or []
 
-    def __repr__(self):
+    def _format(self):
         return f"FunctionDeclaration(heading={self.heading}, local_variables={self.local_variables}, body={self.body})"
 
-    def __eq__(self, other):
-        return isinstance(other, FunctionDeclaration) and self.heading == other.heading and self.local_variables == other.local_variables and self.body == other.body
-
-    def evaluate(self, translator: Translator):
-        return translator.visit_function_declaration(self)
-
 
 class VariableDeclaration(Expression):
-    def __init__(self, identifiers: List[tuple], type_denoter: tuple):
+    __slots__ = ('identifiers', 'type_denoter')
+
+    def __init__(self, identifiers: List['Identifier'], type_denoter: NamedType | ArrayType):
         super().__init__()
         self.identifiers = identifiers
         self.type_denoter = type_denoter
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"VariableDeclaration(identifiers={self.identifiers}, type={self.type_denoter})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, VariableDeclaration) and self.identifiers == other.identifiers and self.type_denoter == other.type_denoter
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_variable_declaration(self)
+class ProcedureCall(Node):
+    __slots__ = ('identifier', 'args')
 
-class ProcedureCall:
-    def __init__(self, identifier, args):
+    def __init__(self, identifier: 'Identifier', args: Optional[List['ActualParameter']]):
         super().__init__()
         self.identifier = identifier 
         self.args = args             
 
     @override
-    def __repr__(self):
+    def _format(self):
         args_str = f", args={self.args}" if self.args is not None else ""
-        return f"ProcedureCall({self.identifier[1]}{args_str})"
+        return f"ProcedureCall({self.identifier.name}{args_str})"
     
-    def evaluate(self, translator: Translator):
-        return translator.visit_procedure_call(self)
-
 class CompoundStatement(Expression):
+    __slots__ = ('statements',)
+
     def __init__(self, statements: List['Statement']):
         super().__init__()
         self.statements = statements or []
 
     @override
-    def __repr__(self):
+    def _format(self):
         if self.statements:
             return f"CompoundStatement(statements={self.statements})"
         return ""
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, CompoundStatement) and self.statements == other.statements
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_compound_statement(self)
-
 class AssignmentStatement(Statement):
+    __slots__ = ('variable', 'expression')
+
     def __init__(self, variable: 'VariableAccess', expression: Expression):
         super().__init__()
         self.variable = variable
         self.expression = expression
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"AssignmentStatement(variable={self.variable}, expression={self.expression})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, AssignmentStatement) and self.variable == other.variable and self.expression == other.expression
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_assignment_statement(self)
-
 
 class IfStatement(Statement):
+    __slots__ = ('condition', 'then_stmt', 'else_stmt')
+
     def __init__(self, condition: Expression, then_stmt: Statement, else_stmt: Optional[Statement] = None):
         super().__init__()
         self.condition = condition
@@ -257,39 +607,27 @@ class IfStatement(Statement):
         self.else_stmt = else_stmt
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"IfStatement(condition={self.condition}, then={self.then_stmt}, else={self.else_stmt})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, IfStatement) and self.condition == other.condition and self.then_stmt == other.then_stmt and self.else_stmt == other.else_stmt
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_if_statement(self)
-
 
 class WhileStatement(Statement):
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition: Expression, body: Statement):
         super().__init__()
         self.condition = condition
         self.body = body
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"WhileStatement(condition={self.condition}, body={self.body})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, WhileStatement) and self.condition == other.condition and self.body == other.body
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_while_statement(self)
-
 
 class ForStatement(Statement):
-    def __init__(self, control_var: tuple, initial_value: Expression, direction: tuple, final_value: Expression, body: Statement):
+    __slots__ = ('control_var', 'initial_value', 'direction', 'final_value', 'body')
+
+    def __init__(self, control_var: 'Identifier', initial_value: Expression, direction: str, final_value: Expression, body: Statement):
         super().__init__()
         self.control_var = control_var
         self.initial_value = initial_value
@@ -298,246 +636,281 @@ class ForStatement(Statement):
         self.body = body
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"ForStatement(control_var={self.control_var}, initial={self.initial_value}, direction={self.direction}, final={self.final_value}, body={self.body})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, ForStatement) and self.control_var == other.control_var and self.initial_value == other.initial_value and self.direction == other.direction and self.final_value == other.final_value and self.body == other.body
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_for_statement(self)
-
 
 class VariableAccess(Expression):
-    def __init__(self, identifier: tuple):
+    __slots__ = ('identifier',)
+
+    def __init__(self, identifier: 'Identifier'):
         super().__init__()
         self.identifier = identifier
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"VariableAccess(identifier={self.identifier})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, VariableAccess) and self.identifier == other.identifier
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_variable_access(self)
-
 
 class FunctionCall(Expression):
-    def __init__(self, identifier: tuple, params: tuple):
+    __slots__ = ('identifier', 'params')
+
+    def __init__(self, identifier: 'Identifier', params: List['ActualParameter']):
         super().__init__()
         self.identifier = identifier
         self.params = params
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"FunctionCall(identifier={self.identifier}, params={self.params})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, FunctionCall) and self.identifier == other.identifier and self.params == other.params
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_function_call(self)
-
 class BinaryExpression(Expression):
-    def __init__(self, operator: tuple, left: Expression, right: Expression):
+    __slots__ = ('operator', 'left', 'right')
+
+    def __init__(self, operator: str, left: Expression, right: Expression):
         super().__init__()
         self.operator = operator
         self.left = left
         self.right = right
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"BinaryExpression(operator={self.operator}, left={self.left}, right={self.right})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, BinaryExpression) and self.operator == other.operator and self.left == other.left and self.right == other.right
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_binary_expression(self)
-
 
 class SignedExpression(Expression):
-    def __init__(self, sign: tuple, expression: Expression):
+    __slots__ = ('sign', 'expression')
+
+    def __init__(self, sign: str, expression: Expression):
         super().__init__()
         self.sign = sign
         self.expression = expression
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"SignedExpression(sign={self.sign}, expression={self.expression})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, SignedExpression) and self.sign == other.sign and self.expression == other.expression
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_signed_expression(self)
-
 
 class Exponentiation(Expression):
+    __slots__ = ('base', 'exponent')
+
     def __init__(self, base: Expression, exponent: Expression):
         super().__init__()
         self.base = base
         self.exponent = exponent
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"Exponentiation(base={self.base}, exponent={self.exponent})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, Exponentiation) and self.base == other.base and self.exponent == other.exponent
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_exponentiation(self)
-
 
 class NotExpression(Expression):
+    __slots__ = ('expression',)
+
     def __init__(self, expression: Expression):
         super().__init__()
         self.expression = expression
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"NotExpression(expression={self.expression})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, NotExpression) and self.expression == other.expression
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_not_expression(self)
-
 
 class Constant(Expression):
-    def __init__(self, value: tuple):
+    __slots__ = ('kind', 'value')
+
+    def __init__(self, kind: str, value):
         super().__init__()
+        self.kind = kind
         self.value = value
 
     @override
-    def __repr__(self):
-        return f"Constant(value={self.value})"
-
-    @override
-    def __eq__(self, other):
-        return isinstance(other, Constant) and self.value == other.value
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_constant(self)
+    def _format(self):
+        return f"Constant(kind={self.kind}, value={self.value!r})"
 
 
 class SetConstructor(Expression):
-    def __init__(self, members: Optional[List[tuple]]):
+    __slots__ = ('members',)
+
+    def __init__(self, members: Optional[List['SetMember']]):
         super().__init__()
         self.members = members
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"SetConstructor(members={self.members})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, SetConstructor) and self.members == other.members
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_set_constructor(self)
-
 
 class PointerDereference(Expression):
+    __slots__ = ('variable',)
+
     def __init__(self, variable: 'VariableAccess'):
         super().__init__()
         self.variable = variable
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"PointerDereference(variable={self.variable})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, PointerDereference) and self.variable == other.variable
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_pointer_dereference(self)
-
 
 class IndexedVariable(Expression):
+    __slots__ = ('variable', 'indices')
+
     def __init__(self, variable: 'VariableAccess', indices: List[Expression]):
         super().__init__()
         self.variable = variable
         self.indices = indices
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"IndexedVariable(variable={self.variable}, indices={self.indices})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, IndexedVariable) and self.variable == other.variable and self.indices == other.indices
-
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_indexed_variable(self)
-
 
 class FieldDesignator(Expression):
-    def __init__(self, variable: 'VariableAccess', field: tuple):
+    __slots__ = ('variable', 'field')
+
+    def __init__(self, variable: 'VariableAccess', field: 'Identifier'):
         super().__init__()
         self.variable = variable
         self.field = field
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"FieldDesignator(variable={self.variable}, field={self.field})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, FieldDesignator) and self.variable == other.variable and self.field == other.field
+class ArrayType(Node):
+    __slots__ = ('index_range', 'element_type')
 
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_field_designator(self)
-
-class ArrayType:
-    def __init__(self, index_range, element_type):
+    def __init__(self, index_range: 'IndexRange', element_type: NamedType | ArrayType):
         self.index_range = index_range  
         self.element_type = element_type  
 
     @override  
-    def __repr__(self):
-        return f"Array[{self.index_range[1]}..{self.index_range[2]}] of {self.element_type}"
+    def _format(self):
+        return f"Array[{self.index_range.lower}..{self.index_range.upper}] of {self.element_type}"
     
-    @override
-    def evaluate(self, translator: Translator):
-        return translator.visit_array_type(self)
 
+class AbstractSyntaxTree(Node):
+    __slots__ = ('program',)
 
-class AbstractSyntaxTree:
     def __init__(self, program: Program):
         self.program = program
 
     @override
-    def __repr__(self):
+    def _format(self):
         return f"AST(program={self.program})"
 
-    @override
-    def __eq__(self, other):
-        return isinstance(other, AbstractSyntaxTree) and self.program == other.program
-
-    def evaluate(self, translator: Translator):
-        return translator.visit_ast(self)
\ No newline at end of file
+    def hash_cons(self, interner: Optional[NodeInterner] = None) -> AbstractSyntaxTree:
+        if interner is None:
+            interner = NodeInterner()
+        self.program = interner.intern(self.program)
+        return self
+
+    def dumps(self, source_hash: str = "") -> bytes:
+        return SERIAL_MAGIC + marshal.dumps((SERIAL_VERSION, source_hash, _encode(self.program)))
+
+    @classmethod
+    def loads(cls, data: bytes, source_hash: Optional[str] = None) -> AbstractSyntaxTree:
+        if data[:len(SERIAL_MAGIC)] != SERIAL_MAGIC:
+            raise ValueError("Not a serialized AST")
+        version, stored_hash, program = marshal.loads(data[len(SERIAL_MAGIC):])
+        if version != SERIAL_VERSION:
+            raise ValueError(f"Unsupported serialized AST version {version}")
+        if source_hash is not None and stored_hash != source_hash:
+            raise ValueError("Serialized AST does not match the source")
+        return cls(_decode(program))
+
+    def dump(self, file, source_hash: str = ""):
+        file.write(self.dumps(source_hash))
+
+    @classmethod
+    def load(cls, file, source_hash: Optional[str] = None) -> AbstractSyntaxTree:
+        return cls.loads(file.read(), source_hash)
+
+
+VISITORS = {
+    Program: 'visit_program',
+    Block: 'visit_block',
+    FunctionDeclaration: 'visit_function_declaration',
+    VariableDeclaration: 'visit_variable_declaration',
+    ProcedureCall: 'visit_procedure_call',
+    CompoundStatement: 'visit_compound_statement',
+    AssignmentStatement: 'visit_assignment_statement',
+    IfStatement: 'visit_if_statement',
+    WhileStatement: 'visit_while_statement',
+    ForStatement: 'visit_for_statement',
+    VariableAccess: 'visit_variable_access',
+    FunctionCall: 'visit_function_call',
+    BinaryExpression: 'visit_binary_expression',
+    SignedExpression: 'visit_signed_expression',
+    Exponentiation: 'visit_exponentiation',
+    NotExpression: 'visit_not_expression',
+    Constant: 'visit_constant',
+    SetConstructor: 'visit_set_constructor',
+    PointerDereference: 'visit_pointer_dereference',
+    IndexedVariable: 'visit_indexed_variable',
+    FieldDesignator: 'visit_field_designator',
+    ArrayType: 'visit_array_type',
+    AbstractSyntaxTree: 'visit_ast',
+}
+
+SERIAL_MAGIC = b"PAST"
+SERIAL_VERSION = 3
+
+NODE_CLASSES = (
+    Program, Block, FunctionDeclaration, VariableDeclaration, ProcedureCall, CompoundStatement,
+    AssignmentStatement, IfStatement, WhileStatement, ForStatement, VariableAccess, FunctionCall,
+    BinaryExpression, SignedExpression, Exponentiation, NotExpression, Constant, SetConstructor,
+    PointerDereference, IndexedVariable, FieldDesignator, ArrayType, Identifier, ProgramHeading,
+    NamedType, IndexRange, ParameterSection, FunctionHeading, Directive, ActualParameter, SetMember,
+)
+NODE_IDS = {cls: i for i, cls in enumerate(NODE_CLASSES)}
+_NODE_FIELDS = tuple(cls.__slots__ for cls in NODE_CLASSES)
+_REVERSED_FIELDS = tuple(fields[::-1] for fields in _NODE_FIELDS)
+_TUPLE_TAG = -1
+_LIST_TAG = -2
+
+
+def _encode(value) -> list:
+    # a flat preorder of (tag, arity) markers and plain values, so marshal never sees deep nesting
+    items = []
+    append = items.append
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        kind = type(value)
+        node_id = NODE_IDS.get(kind)
+        if node_id is not None:
+            append((node_id,))
+            pending.extend([getattr(value, field) for field in _REVERSED_FIELDS[node_id]])
+        elif kind is list or kind is tuple:
+            append((_LIST_TAG if kind is list else _TUPLE_TAG, len(value)))
+            pending.extend(reversed(value))
+        else:
+            append(sys.intern(value) if kind is str else value)
+    return items
+
+
+def _decode(items: list):
+    # children follow their marker, so walking backwards finds them on the stack, first child on top
+    stack = []
+    for item in reversed(items):
+        if type(item) is not tuple:
+            stack.append(item)
+            continue
+        tag = item[0]
+        if tag == _TUPLE_TAG or tag == _LIST_TAG:
+            count = item[1]
+            values = stack[len(stack) - count:] if count else []
+            del stack[len(stack) - count:]
+            values.reverse()
+            stack.append(tuple(values) if tag == _TUPLE_TAG else values)
+            continue
+        cls = NODE_CLASSES[tag]
+        node = cls.__new__(cls)
+        for field in _NODE_FIELDS[tag]:
+            setattr(node, field, stack.pop())
+        stack.append(node)
+    if len(stack) != 1:
+        raise ValueError("Malformed serialized AST")
+    return stack[0]
\ No newline at end of file
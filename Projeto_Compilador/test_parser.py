@@ -1,4 +1,6 @@
 import os
+import tempfile
+from cache import ASTCache
 from parser import PascalParser
 from lexer import PascalLexer
 from view import *
@@ -8,19 +10,19 @@ def process_test_file(test_number, lexer, results_dir):
     output_file = f'{results_dir}/resultado{test_number}.txt'
     
     try:
-        with open(input_file, 'r') as file:
-            code = file.read()
+        parser = PascalParser(lexer)
+        ast = parser.parse_file(input_file)
     except FileNotFoundError:
         print(f"Erro: O arquivo '{input_file}' não foi encontrado.")
         return False
-
-    try:
-        parser = PascalParser(lexer)
-        ast = parser.parse(code)
     except Exception as e:
         print(f"Erro ao processar {input_file}: {e}")
         return False
 
+    if AbstractSyntaxTree.loads(ast.dumps()) != ast:
+        print(f"Erro: A AST serializada de {input_file} não é igual à original.")
+        return False
+
     os.makedirs(results_dir, exist_ok=True)
 
     with open(output_file, 'w') as f:
@@ -32,12 +34,36 @@ def process_test_file(test_number, lexer, results_dir):
             printer = ASTPrinter()
             f.write(printer.translate(ast))
         else:
+            f.write(parser.diagnostics.render() + "\n")
             f.write("Não foi possível gerar a AST devido a erros de sintaxe.\n")
     
     return True
 
+def check_ast_cache(lexer, test_files_range):
+    parser = PascalParser(lexer)
+    input_files = [f'./Tests/Correct/test{test_number}.txt' for test_number in test_files_range]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # uma expressão com 1500 termos não pode fazer a serialização recursiva rebentar
+        deep_file = os.path.join(cache_dir, 'profunda.pas')
+        with open(deep_file, 'w') as f:
+            f.write("program Profunda;\nvar a, r: integer;\nbegin\n    a := 1;\n    r := " + " + ".join(["a"] * 1500) + ";\nend.\n")
+        input_files.append(deep_file)
+        cache = ASTCache(os.path.join(cache_dir, 'ast'))
+        first = [cache.parse_file(parser, input_file) for input_file in input_files]
+        if cache.stats()["misses"] != len(input_files) or cache.stats()["hits"] != 0:
+            print(f"Erro: A primeira passagem pela cache de AST deveria falhar sempre: {cache.stats()}")
+            return False
+        second = [cache.parse_file(parser, input_file) for input_file in input_files]
+        if cache.stats()["hits"] != len(input_files):
+            print(f"Erro: A segunda passagem pela cache de AST deveria acertar sempre: {cache.stats()}")
+            return False
+        if first != second:
+            print("Erro: As AST lidas da cache não são iguais às originais.")
+            return False
+    return True
+
 def main():
-    test_files_range = range(1, 13)
+    test_files_range = range(1, 18)
     results_dir = 'Resultados_ast'
     
     lexer = PascalLexer()
@@ -55,6 +81,8 @@ def main():
             print(f"Falha ao processar test{test_num}.txt")
 
     print(f"\nProcessamento concluído. {success_count}/{len(test_files_range)} testes processados com sucesso.")
+    if check_ast_cache(lexer, test_files_range):
+        print("Cache de AST verificada.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
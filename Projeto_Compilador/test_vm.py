@@ -4,22 +4,25 @@ import syntax as ast
 from vm_translator import PascalEWVMTranslator
 from parser import PascalParser
 from lexer import PascalLexer
+from optimizer import OPTIMIZATION_LEVELS, pass_manager
 import traceback
 
-def translate_pascal_file(file_path: str, translator: PascalEWVMTranslator) -> List[str]:
+def translate_pascal_file(file_path: str, translator: PascalEWVMTranslator, level: int = 0, time_passes: bool = False) -> List[str]:
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
         lexer = PascalLexer()
         lexer.build()
         parser = PascalParser(lexer)
 
-        ast_tree = parser.parse(code)
+        ast_tree = parser.parse_file(file_path, use_mmap=True)
         if parser.error_count > 0:
-            print(f"Error: Parsing failed for {file_path} with {parser.error_count} syntax errors")
+            print(parser.diagnostics.render())
+            print(f"Error: Parsing failed for {file_path} with {parser.error_count} errors")
             return []
-        
+
+        manager = pass_manager(level)
+        ast_tree = manager.run(ast_tree)
+        if time_passes:
+            print(manager.report())
         ewvm_code = translator.translate(ast_tree)
         return ewvm_code
     
@@ -36,18 +39,30 @@ def translate_pascal_file(file_path: str, translator: PascalEWVMTranslator) -> L
         return []
 
 def main():
-    translator = PascalEWVMTranslator()
-    file_paths = sys.argv[1:]
+    level = 0
+    time_passes = False
+    check_bounds = False
+    file_paths = []
+    for arg in sys.argv[1:]:
+        if arg[:2] == "-O" and arg[2:].isdigit() and int(arg[2:]) in OPTIMIZATION_LEVELS:
+            level = int(arg[2:])
+        elif arg == "--time-passes":
+            time_passes = True
+        elif arg == "--check-bounds":
+            check_bounds = True
+        else:
+            file_paths.append(arg)
     
     if not file_paths:
-        print("Usage: python test_vm.py <file1.pas> [<file2.pas> ...]")
+        print("Usage: python test_vm.py [-O0|-O1|-O2] [--time-passes] [--check-bounds] <file1.pas> [<file2.pas> ...]")
         print("Please provide at least one Pascal file to process")
         return
     
+    translator = PascalEWVMTranslator(check_bounds)
     for file_path in file_paths:
         print(f"\nProcessing {file_path}:")
         print("-" * 50)
-        ewvm_code = translate_pascal_file(file_path, translator)
+        ewvm_code = translate_pascal_file(file_path, translator, level, time_passes)
         if ewvm_code:
             print("Generated EWVM code:")
             for line in ewvm_code:
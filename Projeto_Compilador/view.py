@@ -5,6 +5,10 @@ class ASTPrinter(Translator[str]):
     def __init__(self, indent_size: int = 2):
         self.indent_size = indent_size
         self.current_indent = 0
+        self.output: List[str] = []
+
+    def _write(self, text: str):
+        self.output.append(text)
 
     def _indent(self):
         self.current_indent += self.indent_size
@@ -15,308 +19,271 @@ class ASTPrinter(Translator[str]):
     def _make_indent(self) -> str:
         return " " * self.current_indent
 
-    def visit_program(self, program: Program) -> str:
-        heading = f"{self._make_indent()}Program:\n"
+    def visit_program(self, program: Program):
+        self._write(f"{self._make_indent()}Program:\n")
         self._indent()
-        heading += f"{self._make_indent()}Heading: {program.heading}\n"
-        heading += f"{self._make_indent()}Block:\n"
+        self._write(f"{self._make_indent()}Heading: {program.heading}\n")
+        self._write(f"{self._make_indent()}Block:\n")
         self._indent()
-        heading += program.block.evaluate(self)
+        yield program.block
         self._dedent()
         self._dedent()
-        return heading
 
-    def visit_block(self, block: Block) -> str:
-        result = ""
-        
+    def visit_block(self, block: Block):
         if block.functions:
-            result += f"{self._make_indent()}Functions:\n"
+            self._write(f"{self._make_indent()}Functions:\n")
             self._indent()
             for func in block.functions:
-                result += func.evaluate(self)
+                yield func
             self._dedent()
         
         if block.variables:
-            result += f"{self._make_indent()}Variables:\n"
+            self._write(f"{self._make_indent()}Variables:\n")
             self._indent()
             for var in block.variables:
-                result += var.evaluate(self)
+                yield var
             self._dedent()
         
-        result += f"{self._make_indent()}Statements:\n"
+        self._write(f"{self._make_indent()}Statements:\n")
         self._indent()
-        result += block.statements.evaluate(self)
+        yield block.statements
         self._dedent()
-        
-        return result
 
-    def visit_function_declaration(self, func_decl: FunctionDeclaration) -> str:
-        result = f"{self._make_indent()}FunctionDeclaration:\n"
+    def visit_function_declaration(self, func_decl: FunctionDeclaration):
+        self._write(f"{self._make_indent()}FunctionDeclaration:\n")
         self._indent()
-        result += f"{self._make_indent()}Heading: {func_decl.heading}\n"
-        result += f"{self._make_indent()}Body:\n"
+        self._write(f"{self._make_indent()}Heading: {func_decl.heading}\n")
+        self._write(f"{self._make_indent()}Body:\n")
         self._indent()
         if isinstance(func_decl.body, Block):
-            result += func_decl.body.evaluate(self)
+            yield func_decl.body
         else:
-            result += f"{self._make_indent()}{func_decl.body}\n"
+            self._write(f"{self._make_indent()}{func_decl.body}\n")
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_variable_declaration(self, var_decl: VariableDeclaration) -> str:
-        result = f"{self._make_indent()}VariableDeclaration:\n"
+    def visit_variable_declaration(self, var_decl: VariableDeclaration):
+        self._write(f"{self._make_indent()}VariableDeclaration:\n")
         self._indent()
-        result += f"{self._make_indent()}Identifiers: {var_decl.identifiers}\n"
-        result += f"{self._make_indent()}Type:\n"
+        self._write(f"{self._make_indent()}Identifiers: {var_decl.identifiers}\n")
+        self._write(f"{self._make_indent()}Type:\n")
         self._indent()
         if isinstance(var_decl.type_denoter, ArrayType):
-            result += var_decl.type_denoter.evaluate(self)
-        elif isinstance(var_decl.type_denoter, tuple) and var_decl.type_denoter[0] == 'type':
-            result += f"{self._make_indent()}{var_decl.type_denoter[1]}\n"
+            yield var_decl.type_denoter
+        elif isinstance(var_decl.type_denoter, NamedType):
+            self._write(f"{self._make_indent()}{var_decl.type_denoter.name}\n")
         else:
-            result += f"{self._make_indent()}{var_decl.type_denoter}\n"
+            self._write(f"{self._make_indent()}{var_decl.type_denoter}\n")
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_compound_statement(self, compound_stmt: CompoundStatement) -> str:
+    def visit_compound_statement(self, compound_stmt: CompoundStatement):
         if not compound_stmt.statements:
-            return ""
+            return
             
-        result = f"{self._make_indent()}CompoundStatement:\n"
+        self._write(f"{self._make_indent()}CompoundStatement:\n")
         self._indent()
         for stmt in compound_stmt.statements:
-            result += stmt.evaluate(self)
+            yield stmt
         self._dedent()
-        return result
 
-    def visit_assignment_statement(self, assign_stmt: AssignmentStatement) -> str:
-        result = f"{self._make_indent()}AssignmentStatement:\n"
+    def visit_assignment_statement(self, assign_stmt: AssignmentStatement):
+        self._write(f"{self._make_indent()}AssignmentStatement:\n")
         self._indent()
-        result += f"{self._make_indent()}Variable:\n"
+        self._write(f"{self._make_indent()}Variable:\n")
         self._indent()
-        result += assign_stmt.variable.evaluate(self)
+        yield assign_stmt.variable
         self._dedent()
-        result += f"{self._make_indent()}Expression:\n"
+        self._write(f"{self._make_indent()}Expression:\n")
         self._indent()
-        result += assign_stmt.expression.evaluate(self)
+        yield assign_stmt.expression
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_if_statement(self, if_stmt: IfStatement) -> str:
-        result = f"{self._make_indent()}IfStatement:\n"
+    def visit_if_statement(self, if_stmt: IfStatement):
+        self._write(f"{self._make_indent()}IfStatement:\n")
         self._indent()
-        result += f"{self._make_indent()}Condition:\n"
+        self._write(f"{self._make_indent()}Condition:\n")
         self._indent()
-        result += if_stmt.condition.evaluate(self)
+        yield if_stmt.condition
         self._dedent()
-        result += f"{self._make_indent()}Then:\n"
+        self._write(f"{self._make_indent()}Then:\n")
         self._indent()
-        result += if_stmt.then_stmt.evaluate(self)
+        yield if_stmt.then_stmt
         self._dedent()
         if if_stmt.else_stmt:
-            result += f"{self._make_indent()}Else:\n"
+            self._write(f"{self._make_indent()}Else:\n")
             self._indent()
-            result += if_stmt.else_stmt.evaluate(self)
+            yield if_stmt.else_stmt
             self._dedent()
         self._dedent()
-        return result
 
-    def visit_while_statement(self, while_stmt: WhileStatement) -> str:
-        result = f"{self._make_indent()}WhileStatement:\n"
+    def visit_while_statement(self, while_stmt: WhileStatement):
+        self._write(f"{self._make_indent()}WhileStatement:\n")
         self._indent()
-        result += f"{self._make_indent()}Condition:\n"
+        self._write(f"{self._make_indent()}Condition:\n")
         self._indent()
-        result += while_stmt.condition.evaluate(self)
+        yield while_stmt.condition
         self._dedent()
-        result += f"{self._make_indent()}Body:\n"
+        self._write(f"{self._make_indent()}Body:\n")
         self._indent()
-        result += while_stmt.body.evaluate(self)
+        yield while_stmt.body
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_for_statement(self, for_stmt: ForStatement) -> str:
-        result = f"{self._make_indent()}ForStatement:\n"
+    def visit_for_statement(self, for_stmt: ForStatement):
+        self._write(f"{self._make_indent()}ForStatement:\n")
         self._indent()
-        result += f"{self._make_indent()}ControlVar: {for_stmt.control_var}\n"
-        result += f"{self._make_indent()}InitialValue:\n"
+        self._write(f"{self._make_indent()}ControlVar: {for_stmt.control_var.name}\n")
+        self._write(f"{self._make_indent()}InitialValue:\n")
         self._indent()
-        result += for_stmt.initial_value.evaluate(self)
+        yield for_stmt.initial_value
         self._dedent()
-        result += f"{self._make_indent()}Direction: {for_stmt.direction}\n"
-        result += f"{self._make_indent()}FinalValue:\n"
+        self._write(f"{self._make_indent()}Direction: {for_stmt.direction}\n")
+        self._write(f"{self._make_indent()}FinalValue:\n")
         self._indent()
-        result += for_stmt.final_value.evaluate(self)
+        yield for_stmt.final_value
         self._dedent()
-        result += f"{self._make_indent()}Body:\n"
+        self._write(f"{self._make_indent()}Body:\n")
         self._indent()
-        result += for_stmt.body.evaluate(self)
+        yield for_stmt.body
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_variable_access(self, var_access: VariableAccess) -> str:
-        return f"{self._make_indent()}VariableAccess: {var_access.identifier}\n"
+    def visit_variable_access(self, var_access: VariableAccess):
+        self._write(f"{self._make_indent()}VariableAccess: {var_access.identifier.name}\n")
 
-    def visit_function_call(self, func_call: FunctionCall) -> str:
-        result = f"{self._make_indent()}FunctionCall:\n"
+    def visit_function_call(self, func_call: FunctionCall):
+        self._write(f"{self._make_indent()}FunctionCall:\n")
         self._indent()
-        result += f"{self._make_indent()}Function: {func_call.identifier}\n"
+        self._write(f"{self._make_indent()}Function: {func_call.identifier.name}\n")
         if func_call.params:
-            result += f"{self._make_indent()}Params:\n"
+            self._write(f"{self._make_indent()}Params:\n")
             self._indent()
-            if isinstance(func_call.params, tuple) and func_call.params[0] == 'params':
-                for param in func_call.params[1]:
-                    if isinstance(param, Expression):
-                        result += param.evaluate(self)
-                    else:
-                        result += f"{self._make_indent()}{param}\n"
-            else:
-                result += f"{self._make_indent()}{func_call.params}\n"
+            for param in func_call.params:
+                yield param.expression
             self._dedent()
         self._dedent()
-        return result
 
-    def visit_procedure_call(self, proc_call: ProcedureCall) -> str:
-        result = f"{self._make_indent()}ProcedureCall: {proc_call.identifier[1]}\n"
+    def visit_procedure_call(self, proc_call: ProcedureCall):
+        self._write(f"{self._make_indent()}ProcedureCall: {proc_call.identifier.name}\n")
         if proc_call.args is not None:
             self._indent()
-            result += f"{self._make_indent()}Arguments:\n"
+            self._write(f"{self._make_indent()}Arguments:\n")
             self._indent()
-            if isinstance(proc_call.args, tuple) and proc_call.args[0] == 'params':
-                for arg in proc_call.args[1]:
-                    if isinstance(arg, Expression):
-                        result += arg.evaluate(self)
-                    else:
-                        result += f"{self._make_indent()}{arg}\n"
-            else:
-                result += f"{self._make_indent()}{proc_call.args}\n"
+            for arg in proc_call.args:
+                yield arg.expression
             self._dedent()
             self._dedent()
-        return result
 
-    def visit_binary_expression(self, bin_expr: BinaryExpression) -> str:
-        result = f"{self._make_indent()}BinaryExpression ({bin_expr.operator[1]}):\n"
+    def visit_binary_expression(self, bin_expr: BinaryExpression):
+        self._write(f"{self._make_indent()}BinaryExpression ({bin_expr.operator}):\n")
         self._indent()
-        result += f"{self._make_indent()}Left:\n"
+        self._write(f"{self._make_indent()}Left:\n")
         self._indent()
-        result += bin_expr.left.evaluate(self)
+        yield bin_expr.left
         self._dedent()
-        result += f"{self._make_indent()}Right:\n"
+        self._write(f"{self._make_indent()}Right:\n")
         self._indent()
-        result += bin_expr.right.evaluate(self)
+        yield bin_expr.right
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_signed_expression(self, signed_expr: SignedExpression) -> str:
-        result = f"{self._make_indent()}SignedExpression ({signed_expr.sign[1]}):\n"
+    def visit_signed_expression(self, signed_expr: SignedExpression):
+        self._write(f"{self._make_indent()}SignedExpression ({signed_expr.sign}):\n")
         self._indent()
-        result += signed_expr.expression.evaluate(self)
+        yield signed_expr.expression
         self._dedent()
-        return result
 
-    def visit_exponentiation(self, exponentiation: Exponentiation) -> str:
-        result = f"{self._make_indent()}Exponentiation:\n"
+    def visit_exponentiation(self, exponentiation: Exponentiation):
+        self._write(f"{self._make_indent()}Exponentiation:\n")
         self._indent()
-        result += f"{self._make_indent()}Base:\n"
+        self._write(f"{self._make_indent()}Base:\n")
         self._indent()
-        result += exponentiation.base.evaluate(self)
+        yield exponentiation.base
         self._dedent()
-        result += f"{self._make_indent()}Exponent:\n"
+        self._write(f"{self._make_indent()}Exponent:\n")
         self._indent()
-        result += exponentiation.exponent.evaluate(self)
+        yield exponentiation.exponent
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_not_expression(self, not_expr: NotExpression) -> str:
-        result = f"{self._make_indent()}NotExpression:\n"
+    def visit_not_expression(self, not_expr: NotExpression):
+        self._write(f"{self._make_indent()}NotExpression:\n")
         self._indent()
-        result += not_expr.expression.evaluate(self)
+        yield not_expr.expression
         self._dedent()
-        return result
 
-    def visit_constant(self, constant: Constant) -> str:
-        return f"{self._make_indent()}Constant: {constant.value}\n"
+    def visit_constant(self, constant: Constant):
+        self._write(f"{self._make_indent()}Constant: {constant.value}\n")
 
-    def visit_set_constructor(self, set_constr: SetConstructor) -> str:
-        result = f"{self._make_indent()}SetConstructor:\n"
+    def visit_set_constructor(self, set_constr: SetConstructor):
+        self._write(f"{self._make_indent()}SetConstructor:\n")
         if set_constr.members:
             self._indent()
             for member in set_constr.members:
-                if isinstance(member, tuple):
-                    result += f"{self._make_indent()}{member}\n"
-                else:
-                    result += member.evaluate(self)
+                yield member.lower
+                if member.upper is not None:
+                    yield member.upper
             self._dedent()
-        return result
 
-    def visit_pointer_dereference(self, ptr_deref: PointerDereference) -> str:
-        result = f"{self._make_indent()}PointerDereference:\n"
+    def visit_pointer_dereference(self, ptr_deref: PointerDereference):
+        self._write(f"{self._make_indent()}PointerDereference:\n")
         self._indent()
-        result += ptr_deref.variable.evaluate(self)
+        yield ptr_deref.variable
         self._dedent()
-        return result
 
-    def visit_indexed_variable(self, indexed_var: IndexedVariable) -> str:
-        result = f"{self._make_indent()}IndexedVariable:\n"
+    def visit_indexed_variable(self, indexed_var: IndexedVariable):
+        self._write(f"{self._make_indent()}IndexedVariable:\n")
         self._indent()
-        result += f"{self._make_indent()}Variable:\n"
+        self._write(f"{self._make_indent()}Variable:\n")
         self._indent()
-        result += indexed_var.variable.evaluate(self)
+        yield indexed_var.variable
         self._dedent()
-        result += f"{self._make_indent()}Indices:\n"
+        self._write(f"{self._make_indent()}Indices:\n")
         self._indent()
         if isinstance(indexed_var.indices, list):
             for idx in indexed_var.indices:
                 if isinstance(idx, Expression):
-                    result += idx.evaluate(self)
+                    yield idx
                 else:
-                    result += f"{self._make_indent()}{idx}\n"
+                    self._write(f"{self._make_indent()}{idx}\n")
         else:
-            result += f"{self._make_indent()}{indexed_var.indices}\n"
+            self._write(f"{self._make_indent()}{indexed_var.indices}\n")
         self._dedent()
         self._dedent()
-        return result
 
-    def visit_field_designator(self, field_des: FieldDesignator) -> str:
-        result = f"{self._make_indent()}FieldDesignator:\n"
+    def visit_field_designator(self, field_des: FieldDesignator):
+        self._write(f"{self._make_indent()}FieldDesignator:\n")
         self._indent()
-        result += f"{self._make_indent()}Variable:\n"
+        self._write(f"{self._make_indent()}Variable:\n")
         self._indent()
-        result += field_des.variable.evaluate(self)
+        yield field_des.variable
         self._dedent()
-        result += f"{self._make_indent()}Field: {field_des.field}\n"
+        self._write(f"{self._make_indent()}Field: {field_des.field.name}\n")
         self._dedent()
-        return result
     
-    def visit_array_type(self, array_type: ArrayType) -> str:
-        result = f"{self._make_indent()}ArrayType:\n"
+    def visit_array_type(self, array_type: ArrayType):
+        self._write(f"{self._make_indent()}ArrayType:\n")
         self._indent()
-        result += f"{self._make_indent()}Index Range:\n"
+        self._write(f"{self._make_indent()}Index Range:\n")
         self._indent()
-        if isinstance(array_type.index_range, tuple) and array_type.index_range[0] == 'index_range':
-            result += f"{self._make_indent()}From: {array_type.index_range[1]}\n"
-            result += f"{self._make_indent()}To: {array_type.index_range[2]}\n"
-        else:
-            result += f"{self._make_indent()}{array_type.index_range}\n"
+        self._write(f"{self._make_indent()}From: {array_type.index_range.lower}\n")
+        self._write(f"{self._make_indent()}To: {array_type.index_range.upper}\n")
         self._dedent()
-        result += f"{self._make_indent()}Element Type:\n"
+        self._write(f"{self._make_indent()}Element Type:\n")
         self._indent()
-        if isinstance(array_type.element_type, tuple) and array_type.element_type[0] == 'type':
-            result += f"{self._make_indent()}{array_type.element_type[1]}\n"
+        if isinstance(array_type.element_type, NamedType):
+            self._write(f"{self._make_indent()}{array_type.element_type.name}\n")
         else:
-            result += array_type.element_type.evaluate(self)
+            yield array_type.element_type
         self._dedent()
         self._dedent()
-        return result
 
     def visit_ast(self, ast: AbstractSyntaxTree) -> str:
-        return ast.program.evaluate(self)
+        self.output = []
+        ast.program.evaluate(self)
+        return "".join(self.output)
 
     def translate(self, ast: AbstractSyntaxTree) -> str:
         return self.visit_ast(ast)
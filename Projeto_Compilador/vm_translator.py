@@ -1,18 +1,37 @@
-from typing import Dict, List, Optional, Tuple
+from typing import List
 import syntax as ast
+from bounds import proven_indices
+from semantic import SemanticModel, Symbol, SymbolTable, analyze, call_graph, integer_constant, reads_into_array, reentrant_callees, result_functions, self_tail_calls
+
+# runtime helper for exponents only known at run time; its operands live in hidden globals
+POWER_ROUTINE = "powhelper"
+POWER_SLOTS = ("$powbase", "$powexp", "$powresult")
+# integer powers have no value for negative exponents, so those stop the program
+NEGATIVE_EXPONENT_ERROR = "Negative exponent"
+# self tail calls jump to this label after the function name, which skips the parameter stores and local arrays
+TAIL_ENTRY_SUFFIX = "tail"
 
 class PascalEWVMTranslator(ast.Translator[List[str]]):
-    def __init__(self):
-        self.global_variables: Dict[str, Tuple[int, str, Optional[int], Optional[str]]] = {}
-        self.local_variables: Dict[str, Dict[str, Tuple[int, str, Optional[int], Optional[str]]]] = {}
-        self.variable_counter = 0
+    def __init__(self, check_bounds: bool = False):
+        self.check_bounds = check_bounds
+        self.reset()
+
+    def reset(self):
+        self.symbols = SymbolTable()
+        self.model = SemanticModel(self.symbols)
+        self.scope = self.model.scope()
         self.if_counter = 0
         self.while_counter = 0
         self.for_counter = 0
-        self.function_addresses: Dict[str, str] = {}
-        self.function_signatures: Dict[str, int] = {}
-        self.current_function: Optional[str] = None
         self.bool_label_counter = 0
+        self.power_slots = None
+        self.tail_calls = set()
+        self.parameter_stores = []
+        self.call_graph = {}
+        self.result_functions = set()
+        self.reentrant = set()
+        self.saved_slots = []
+        self.proven_indices = set()
         self.predefined_procedures = {
             "writeln": ["writeln"],
             "write": [],
@@ -30,147 +49,120 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
 
     def visit_program(self, program: ast.Program) -> List[str]:
         init_code = []
+        self.scope = self.model.scope()
         if program.block.variables:
             for var in program.block.variables:
-                init_code.extend(self._declare_variable(var, is_local=False))
+                init_code.extend(self._declare_variable(var))
         init_code.append("jump main")
         code = []
         if program.block.functions:
             for func in program.block.functions:
-                code.extend(self.visit_function_declaration(func))
+                code.extend((yield func))
+        self.scope = self.model.scope()
+        if self.check_bounds:
+            self.proven_indices = proven_indices(program.block.statements, self.scope)
         code.append("main:")
         code.append("start")
-        code.extend(program.block.statements.evaluate(self))
+        code.extend((yield program.block.statements))
         code.append("stop")
+        if self.power_slots is not None:
+            code.extend(self._power_routine())
         return init_code + code
 
     def visit_block(self, block: ast.Block) -> List[str]:
-        return block.statements.evaluate(self)
+        return (yield block.statements)
 
     def visit_function_declaration(self, function_declaration: ast.FunctionDeclaration) -> List[str]:
-        heading = function_declaration.heading
-        func_name = heading[1][1]
-        self.function_addresses[func_name] = func_name
-        param_count = 0
-        if heading[2]:
-            for param in heading[2][1]:
-                value_param = param[1]
-                identifiers = value_param[1]
-                param_count += len(identifiers)
-        self.function_signatures[func_name] = param_count
-        self.current_function = func_name
-        self.local_variables[func_name] = {}
-        code = []
-        if heading[2]:
-            for param in heading[2][1]:
-                value_param = param[1]
-                identifiers = value_param[1]
-                type_denoter = value_param[2]
-                type_name = type_denoter[1].lower() if isinstance(type_denoter, tuple) else type_denoter.lower()
-                for ident in identifiers:
-                    var_name = ident[1]
-                    self.local_variables[func_name][var_name] = (self.variable_counter, type_name, None, None)
-                    self.variable_counter += 1
-        if function_declaration.local_variables:
-            for var in function_declaration.local_variables:
-                code.extend(self._declare_variable(var, is_local=True))
+        func_name = function_declaration.heading.identifier.name
+        self.scope = self.model.scope(func_name)
+        # arguments arrive on the stack in call order and are passed through the parameter slots
+        parameters = self.symbols.locals.get(func_name, {})
+        stores = []
+        for section in reversed(function_declaration.heading.parameters):
+            for ident in reversed(section.identifiers):
+                stores.append(f"storeg {parameters[ident.name].slot}")
+        # parameters and locals live in global slots, so a call that can come back here must save them;
+        # local arrays are not saved and stay shared between activations
+        self.reentrant = reentrant_callees(self.call_graph, func_name)
+        self.saved_slots = [symbol.slot for symbol in parameters.values() if symbol.type != "array"]
         if isinstance(function_declaration.body, ast.Block):
-            body_code = function_declaration.body.statements.evaluate(self)
+            function = self.symbols.functions.get(func_name)
+            if function is not None:
+                self.tail_calls = self_tail_calls(function_declaration.body.statements, self.scope, function)
+        code = list(stores)
+        local_variables = function_declaration.local_variables or []
+        for var in local_variables:
+            code.extend(self._declare_variable(var, scalars=False))
+        if self.tail_calls:
+            self.parameter_stores = stores
+            code.append(f"{func_name}{TAIL_ENTRY_SUFFIX}:")
+        for var in local_variables:
+            code.extend(self._declare_variable(var, arrays=False))
+        if isinstance(function_declaration.body, ast.Block):
+            if self.check_bounds:
+                self.proven_indices = proven_indices(function_declaration.body.statements, self.scope)
+            body_code = (yield function_declaration.body.statements)
             code.extend(body_code)
-        self.current_function = None
-        return [f"{self.function_addresses[func_name]}:"] + code + ["return"]
+            self.tail_calls = set()
+            self.parameter_stores = []
+        self.reentrant = set()
+        self.saved_slots = []
+        self.scope = self.model.scope()
+        return [f"{func_name}:"] + code + ["return"]
 
     def visit_variable_declaration(self, variable_declaration: ast.VariableDeclaration) -> List[str]:
-        return self._declare_variable(variable_declaration, is_local=False)
+        return self._declare_variable(variable_declaration)
 
-    def _declare_variable(self, variable_declaration: ast.VariableDeclaration, is_local: bool) -> List[str]:
-        type_denoter = variable_declaration.type_denoter[1]
+    def _declare_variable(self, variable_declaration: ast.VariableDeclaration, arrays: bool = True, scalars: bool = True) -> List[str]:
         code = []
-        if isinstance(type_denoter, ast.ArrayType):
-            type_name = "array"
-            element_type = getattr(type_denoter, 'element_type', ('type', 'integer'))
-            element_type_name = element_type[1].lower() if isinstance(element_type, tuple) else element_type.lower()
-            if isinstance(type_denoter.index_range, tuple) and type_denoter.index_range[0] == 'index_range':
-                lower_bound = self._evaluate_constant(type_denoter.index_range[1])
-                upper_bound = self._evaluate_constant(type_denoter.index_range[2])
-                array_size = upper_bound - lower_bound + 1
-                for ident in variable_declaration.identifiers:
-                    var_name = ident[1]
-                    if var_name == "numeros":
-                        continue
-                    if is_local:
-                        if var_name not in self.local_variables[self.current_function]:
-                            self.local_variables[self.current_function][var_name] = (self.variable_counter, type_name, lower_bound, element_type_name)
-                            code.append(f"pushn {array_size}")
-                            self.variable_counter += array_size
-                    else:
-                        if var_name not in self.global_variables:
-                            self.global_variables[var_name] = (self.variable_counter, type_name, lower_bound, element_type_name)
-                            code.append(f"pushn {array_size}")
-                            self.variable_counter += array_size
-        else:
-            if isinstance(type_denoter, tuple) and type_denoter[0] == "type":
-                type_name = type_denoter[1].lower()
-            elif isinstance(type_denoter, str):
-                type_name = type_denoter.lower()
-            else:
-                type_name = "integer"
-            for ident in variable_declaration.identifiers:
-                var_name = ident[1]
-                if is_local:
-                    if var_name not in self.local_variables[self.current_function]:
-                        self.local_variables[self.current_function][var_name] = (self.variable_counter, type_name, None, None)
-                        code.append("pushi 0" if type_name != "string" else 'pushs ""')
-                        code.append(f"storeg {self.variable_counter}")
-                        self.variable_counter += 1
-                else:
-                    if var_name not in self.global_variables:
-                        self.global_variables[var_name] = (self.variable_counter, type_name, None, None)
-                        code.append("pushi 0" if type_name != "string" else 'pushs ""')
-                        code.append(f"storeg {self.variable_counter}")
-                        self.variable_counter += 1
+        for symbol in self.scope.declared(variable_declaration):
+            if symbol.type == "array":
+                if arrays:
+                    code.append(f"pushn {symbol.size}")
+            elif scalars:
+                code.append("pushi 0" if symbol.type != "string" else 'pushs ""')
+                code.append(f"storeg {symbol.slot}")
         return code
 
     def visit_compound_statement(self, compound_statement: ast.CompoundStatement) -> List[str]:
         code = []
         for stmt in compound_statement.statements:
-            code.extend(stmt.evaluate(self))
+            code.extend((yield stmt))
         return code
 
     def visit_assignment_statement(self, assignment_statement: ast.AssignmentStatement) -> List[str]:
         var = assignment_statement.variable
         expr = assignment_statement.expression
-        expr_type = self._infer_expression_type(expr)
-        code = expr.evaluate(self)
+        expr_type = self.scope.type_of(expr)
+        if id(assignment_statement) in self.tail_calls:
+            # a self call in tail position reuses the running call: it takes the new arguments and zeroes the scalar locals again
+            code = []
+            for param in expr.params:
+                code.extend((yield param.expression))
+            code.extend(self.parameter_stores)
+            code.append(f"jump {self.scope.symbol(assignment_statement).name}{TAIL_ENTRY_SUFFIX}")
+            return code
+        code = (yield expr)
         if isinstance(var, ast.VariableAccess):
-            var_name = var.identifier[1]
-            if var_name in self.function_addresses:
-                pass
-            elif self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                var_index, var_type, _, _ = self.local_variables[self.current_function][var_name]
-                if var_type != expr_type and not (var_type in ("integer", "real") and expr_type in ("integer", "real")):
-                    raise ast.TranslationError(f"Type mismatch: cannot assign {expr_type} to {var_type} variable '{var_name}'")
-                code.append(f"storeg {var_index}")
-            elif var_name in self.global_variables:
-                var_index, var_type, _, _ = self.global_variables[var_name]
-                if var_type != expr_type and not (var_type in ("integer", "real") and expr_type in ("integer", "real")):
-                    raise ast.TranslationError(f"Type mismatch: cannot assign {expr_type} to {var_type} variable '{var_name}'")
-                code.append(f"storeg {var_index}")
-            else:
+            var_name = var.identifier.name
+            symbol = self.scope.symbol(assignment_statement)
+            if symbol is None:
                 raise ast.TranslationError(f"Variable '{var_name}' not declared")
+            if not symbol.is_function:
+                if symbol.type != expr_type and not (symbol.type in ("integer", "real") and expr_type in ("integer", "real")):
+                    raise ast.TranslationError(f"Type mismatch: cannot assign {expr_type} to {symbol.type} variable '{var_name}'")
+                code.append(f"storeg {symbol.slot}")
         elif isinstance(var, ast.IndexedVariable):
-            var_name = var.variable.identifier[1]
-            if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                var_index, var_type, lower_bound, element_type = self.local_variables[self.current_function][var_name]
-            elif var_name in self.global_variables:
-                var_index, var_type, lower_bound, element_type = self.global_variables[var_name]
-            else:
+            var_name = var.variable.identifier.name
+            symbol = self.scope.symbol(var)
+            if symbol is None:
                 raise ast.TranslationError(f"Variable '{var_name}' not declared")
-            if var_type != "array":
+            if symbol.type != "array":
                 raise ast.TranslationError(f"Variable '{var_name}' is not an array")
+            element_type = symbol.element_type
             if element_type != expr_type and not (element_type in ("integer", "real") and expr_type in ("integer", "real")):
                 raise ast.TranslationError(f"Type mismatch: cannot assign {expr_type} to array element of type {element_type}")
-            code.extend(self._translate_indexed_variable_assignment(var))
+            code.extend((yield from self._translate_indexed_variable_assignment(var)))
         else:
             raise ast.TranslationError(f"Unsupported assignment to {type(var)}")
         return code
@@ -178,12 +170,12 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
     def visit_if_statement(self, if_statement: ast.IfStatement) -> List[str]:
         current_if = self.if_counter
         self.if_counter += 1
-        condition = if_statement.condition.evaluate(self)
-        then_stmt = if_statement.then_stmt.evaluate(self)
+        condition = (yield if_statement.condition)
+        then_stmt = (yield if_statement.then_stmt)
         code = condition
         if if_statement.else_stmt:
             code += [f"jz else{current_if}"] + then_stmt
-            else_stmt = if_statement.else_stmt.evaluate(self)
+            else_stmt = (yield if_statement.else_stmt)
             code += [f"jump endif{current_if}", f"else{current_if}:"] + else_stmt
             code.append(f"endif{current_if}:")
         else:
@@ -194,8 +186,8 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
     def visit_while_statement(self, while_statement: ast.WhileStatement) -> List[str]:
         current_while = self.while_counter
         self.while_counter += 1
-        condition = while_statement.condition.evaluate(self)
-        body = while_statement.body.evaluate(self)
+        condition = (yield while_statement.condition)
+        body = (yield while_statement.body)
         return [
             f"while{current_while}:",
             *condition,
@@ -208,37 +200,26 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
     def visit_for_statement(self, for_statement: ast.ForStatement) -> List[str]:
         current_for = self.for_counter
         self.for_counter += 1
-        control_var = for_statement.control_var[1]
-        if self.current_function and control_var not in self.local_variables.get(self.current_function, {}):
-            self.local_variables[self.current_function][control_var] = (self.variable_counter, "integer", None, None)
-            self.variable_counter += 1
-        elif not self.current_function and control_var not in self.global_variables:
-            self.global_variables[control_var] = (self.variable_counter, "integer", None, None)
-            self.variable_counter += 1
-        var_index = self.local_variables[self.current_function][control_var][0] if self.current_function and control_var in self.local_variables.get(self.current_function, {}) else self.global_variables[control_var][0]
-        init_value = for_statement.initial_value.evaluate(self)
-        final_value = for_statement.final_value.evaluate(self)
-        direction = for_statement.direction[1]
+        var_index = self.scope.symbol(for_statement).slot
+        init_value = (yield for_statement.initial_value)
+        final_value = (yield for_statement.final_value)
+        direction = for_statement.direction
         body = for_statement.body
         code = init_value + [f"storeg {var_index}"]
         code += [f"for{current_for}:"]
         code += [f"pushg {var_index}"] + final_value
         code.append("infeq" if direction == "to" else "supeq")
         code += [f"jz endfor{current_for}"]
-        if isinstance(body, ast.CompoundStatement) and body.statements and len(body.statements) >= 1 and isinstance(body.statements[0], ast.ProcedureCall) and body.statements[0].identifier[1].lower() in ["readln", "read"]:
-            arg = body.statements[0].args[1][0][1] if body.statements[0].args else None
-            if isinstance(arg, ast.IndexedVariable):
-                code += [
-                    "read",
-                    "atoi",
-                    "pushg 1",
-                    "add",
-                    "storeg 1"
-                ]
-            else:
-                code.extend(body.evaluate(self))
+        if reads_into_array(body):
+            code += [
+                "read",
+                "atoi",
+                "pushg 1",
+                "add",
+                "storeg 1"
+            ]
         else:
-            code.extend(body.evaluate(self))
+            code.extend((yield body))
         code += [
             f"pushg {var_index}",
             "pushi 1",
@@ -250,22 +231,19 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
         return code
 
     def visit_variable_access(self, variable_access: ast.VariableAccess) -> List[str]:
-        var_name = variable_access.identifier[1].lower()
+        var_name = variable_access.identifier.name.lower()
         if var_name == "true":
             return ["pushi 1"]
         if var_name == "false":
             return ["pushi 0"]
-        if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-            var_index = self.local_variables[self.current_function][var_name][0]
-            return [f"pushg {var_index}"]
-        if var_name in self.global_variables:
-            var_index = self.global_variables[var_name][0]
-            return [f"pushg {var_index}"]
-        raise ast.TranslationError(f"Variable '{var_name}' not declared")
+        symbol = self.scope.symbol(variable_access)
+        if symbol is None:
+            raise ast.TranslationError(f"Variable '{var_name}' not declared")
+        return [f"pushg {symbol.slot}"]
 
     def visit_function_call(self, function_call: ast.FunctionCall) -> List[str]:
-        func_name = function_call.identifier[1]
-        params = function_call.params[1] if function_call.params else []
+        func_name = function_call.identifier.name
+        params = function_call.params or []
         param_count = len(params)
         if func_name in self.predefined_functions:
             expected_params = self.predefined_function_signatures.get(func_name, 0)
@@ -273,104 +251,97 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
                 raise ast.TranslationError(f"Function '{func_name}' expects {expected_params} parameters, got {param_count}")
             code = []
             for param in params:
-                code.extend(param[1].evaluate(self))
+                code.extend((yield param.expression))
             code.extend(self.predefined_functions[func_name])
             return code
-        if func_name not in self.function_addresses:
+        symbol = self.scope.symbol(function_call)
+        if symbol is None:
             raise ast.TranslationError(f"Function '{func_name}' not declared")
-        expected_params = self.function_signatures.get(func_name, 0)
-        if param_count != expected_params:
-            raise ast.TranslationError(f"Function '{func_name}' expects {expected_params} parameters, got {param_count}")
-        code = []
+        if param_count != symbol.params:
+            raise ast.TranslationError(f"Function '{func_name}' expects {symbol.params} parameters, got {param_count}")
+        code = self._save_slots(symbol)
         for param in params:
-            code.extend(param[1].evaluate(self))
-        code.append(f"pusha {self.function_addresses[func_name]}")
+            code.extend((yield param.expression))
+        code.append(f"pusha {symbol.name}")
         code.append("call")
+        code.extend(self._restore_slots(symbol, True))
         return code
 
     def visit_procedure_call(self, procedure_call: ast.ProcedureCall) -> List[str]:
-        proc_name = procedure_call.identifier[1].lower()
-        args = procedure_call.args[1] if procedure_call.args else []
+        proc_name = procedure_call.identifier.name.lower()
+        args = procedure_call.args or []
         code = []
         if proc_name in self.predefined_procedures:
             if proc_name in ["readln", "read"]:
                 if args:
-                    var = args[0][1]
-                    if isinstance(var, ast.VariableAccess):
-                        var_name = var.identifier[1]
-                        if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                            var_index = self.local_variables[self.current_function][var_name][0]
-                            var_type = self.local_variables[self.current_function][var_name][1]
-                        elif var_name in self.global_variables:
-                            var_index = self.global_variables[var_name][0]
-                            var_type = self.global_variables[var_name][1]
-                        else:
+                    var = args[0].expression
+                    if isinstance(var, (ast.VariableAccess, ast.IndexedVariable)):
+                        var_name = var.identifier.name if isinstance(var, ast.VariableAccess) else var.variable.identifier.name
+                        symbol = self.scope.symbol(args[0])
+                        if symbol is None:
                             raise ast.TranslationError(f"Variable '{var_name}' not declared")
                         code.extend(self.predefined_procedures[proc_name])
-                        if var_type != "string":
+                        if symbol.type != "string":
                             code.append("atoi")
-                        code.append(f"storeg {var_index}")
-                    elif isinstance(var, ast.IndexedVariable):
-                        var_name = var.variable.identifier[1]
-                        code.extend(self.predefined_procedures[proc_name])
-                        if var_name in self.global_variables and self.global_variables[var_name][1] == "string":
-                            code.append(f"storeg {self.global_variables[var_name][0]}")
-                        else:
-                            code.append("atoi")
-                            code.append(f"storeg {self.global_variables[var_name][0]}")
+                        code.append(f"storeg {symbol.slot}")
             else:
                 for arg in args:
-                    arg_expr = arg[1]
-                    code.extend(arg_expr.evaluate(self))
-                    if isinstance(arg_expr, ast.Constant) and isinstance(arg_expr.value[1], str) and len(arg_expr.value[1]) > 1:
+                    arg_expr = arg.expression
+                    code.extend((yield arg_expr))
+                    if isinstance(arg_expr, ast.Constant) and arg_expr.kind == 'string' and len(arg_expr.value) > 1:
                         code.append("writes")
                     elif isinstance(arg_expr, ast.VariableAccess):
-                        var_name = arg_expr.identifier[1]
-                        if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                            var_type = self.local_variables[self.current_function][var_name][1]
-                        elif var_name in self.global_variables:
-                            var_type = self.global_variables[var_name][1]
-                        else:
-                            raise ast.TranslationError(f"Variable '{var_name}' not declared")
-                        if var_type == "string":
+                        symbol = self.scope.symbol(arg)
+                        if symbol is None:
+                            raise ast.TranslationError(f"Variable '{arg_expr.identifier.name}' not declared")
+                        if symbol.type == "string":
                             code.append("writes")
                         else:
                             code.append("writei")
                     elif isinstance(arg_expr, ast.IndexedVariable):
-                        var_name = arg_expr.variable.identifier[1]
-                        if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                            var_type = self.local_variables[self.current_function][var_name][1]
-                        elif var_name in self.global_variables:
-                            var_type = self.global_variables[var_name][1]
-                        else:
-                            raise ast.TranslationError(f"Variable '{var_name}' not declared")
-                        if var_type == "string":
+                        if self.scope.symbol(arg_expr).type == "string":
                             code.append("writechr")
                         else:
                             code.append("writei")
-                    elif isinstance(arg_expr, ast.Constant) and isinstance(arg_expr.value[1], str) and len(arg_expr.value[1]) == 1:
-                        code.append(f"pushi {ord(arg_expr.value[1])}")
+                    elif isinstance(arg_expr, ast.Constant) and arg_expr.kind == 'string' and len(arg_expr.value) == 1:
+                        code.append(f"pushi {ord(arg_expr.value)}")
                         code.append("writechr")
                     else:
                         code.append("writei")
                 if proc_name == "writeln":
                     code.append("writeln")
             return code
-        if proc_name not in self.function_addresses:
+        symbol = self.scope.symbol(procedure_call)
+        if symbol is None:
             raise ast.TranslationError(f"Procedure '{proc_name}' not declared")
-        expected_params = self.function_signatures.get(proc_name, 0)
-        if len(args) != expected_params:
-            raise ast.TranslationError(f"Procedure '{proc_name}' expects {expected_params} parameters, got {len(args)}")
+        if len(args) != symbol.params:
+            raise ast.TranslationError(f"Procedure '{proc_name}' expects {symbol.params} parameters, got {len(args)}")
+        code.extend(self._save_slots(symbol))
         for arg in args:
-            code.extend(arg[1].evaluate(self))
-        code.append(f"pusha {self.function_addresses[proc_name]}")
+            code.extend((yield arg.expression))
+        code.append(f"pusha {symbol.name}")
         code.append("call")
+        code.extend(self._restore_slots(symbol, symbol.name in self.result_functions))
+        return code
+
+    def _save_slots(self, callee: Symbol) -> List[str]:
+        if callee.name not in self.reentrant:
+            return []
+        return [f"pushg {slot}" for slot in self.saved_slots]
+
+    def _restore_slots(self, callee: Symbol, result: bool) -> List[str]:
+        if callee.name not in self.reentrant:
+            return []
+        code = []
+        for slot in reversed(self.saved_slots):
+            # the result sits above the saved values
+            code.extend(["swap", f"storeg {slot}"] if result else [f"storeg {slot}"])
         return code
 
     def visit_binary_expression(self, binary_expression: ast.BinaryExpression) -> List[str]:
-        left = binary_expression.left.evaluate(self)
-        right = binary_expression.right.evaluate(self)
-        op = binary_expression.operator[1]
+        left = (yield binary_expression.left)
+        right = (yield binary_expression.right)
+        op = binary_expression.operator
         op_map = {
             "+": "add",
             "-": "sub",
@@ -390,89 +361,149 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
         op_code = op_map.get(op)
         if op_code is None:
             raise ast.TranslationError(f"Unsupported operator '{op}'")
+        left.extend(right)
         if isinstance(op_code, str):
-            return left + right + [op_code]
-        return left + right + op_code
+            left.append(op_code)
+        else:
+            left.extend(op_code)
+        return left
 
     def visit_signed_expression(self, signed_expression: ast.SignedExpression) -> List[str]:
-        expr = signed_expression.expression.evaluate(self)
-        sign = signed_expression.sign[1]
+        expr = (yield signed_expression.expression)
+        sign = signed_expression.sign
         if sign == "+":
             return expr
-        return expr + ["pushi -1", "mul"]
+        expr.extend(["pushi -1", "mul"])
+        return expr
 
     def visit_exponentiation(self, exponentiation: ast.Exponentiation) -> List[str]:
-        base = exponentiation.base.evaluate(self)
+        base = (yield exponentiation.base)
         if isinstance(exponentiation.exponent, ast.Constant):
-            n = self._evaluate_constant(exponentiation.exponent)
+            n = integer_constant(exponentiation.exponent)
+            if n < 0:
+                return base + ["pop 1", f'err "{NEGATIVE_EXPONENT_ERROR}"']
             if n == 0:
-                return ["pushi 1"]
-            return base + ["dup 1"] * (n - 1) + ["mul"] * (n - 1)
-        raise ast.TranslationError("Dynamic exponentiation not supported")
+                return base + ["pop 1", "pushi 1"]
+            # square and multiply, keeping a copy of every power of two the exponent needs
+            code = base
+            factors = 1
+            while n > 1:
+                if n & 1:
+                    code.append("dup 1")
+                    factors += 1
+                code.extend(["dup 1", "mul"])
+                n >>= 1
+            return code + ["mul"] * (factors - 1)
+        exponent = (yield exponentiation.exponent)
+        base_slot, exponent_slot, result_slot = self._power_storage()
+        return base + exponent + [
+            f"storeg {exponent_slot}",
+            f"storeg {base_slot}",
+            f"pusha {POWER_ROUTINE}",
+            "call",
+            f"pushg {result_slot}"
+        ]
+
+    def _power_storage(self):
+        if self.power_slots is None:
+            self.power_slots = tuple(self.symbols.declare(name, "integer").slot for name in POWER_SLOTS)
+        return self.power_slots
+
+    def _power_routine(self) -> List[str]:
+        base_slot, exponent_slot, result_slot = self.power_slots
+        return [
+            f"{POWER_ROUTINE}:",
+            f"pushg {exponent_slot}",
+            "pushi 0",
+            "inf",
+            f"jz {POWER_ROUTINE}start",
+            f'err "{NEGATIVE_EXPONENT_ERROR}"',
+            f"{POWER_ROUTINE}start:",
+            "pushi 1",
+            f"storeg {result_slot}",
+            f"{POWER_ROUTINE}loop:",
+            f"pushg {exponent_slot}",
+            "pushi 0",
+            "sup",
+            f"jz {POWER_ROUTINE}end",
+            f"pushg {exponent_slot}",
+            "pushi 2",
+            "mod",
+            f"jz {POWER_ROUTINE}square",
+            f"pushg {result_slot}",
+            f"pushg {base_slot}",
+            "mul",
+            f"storeg {result_slot}",
+            f"{POWER_ROUTINE}square:",
+            f"pushg {base_slot}",
+            "dup 1",
+            "mul",
+            f"storeg {base_slot}",
+            f"pushg {exponent_slot}",
+            "pushi 2",
+            "div",
+            f"storeg {exponent_slot}",
+            f"jump {POWER_ROUTINE}loop",
+            f"{POWER_ROUTINE}end:",
+            "return"
+        ]
 
     def visit_not_expression(self, not_expression: ast.NotExpression) -> List[str]:
-        expr = not_expression.expression.evaluate(self)
-        return expr + ["not"]
+        expr = (yield not_expression.expression)
+        expr.append("not")
+        return expr
 
     def visit_constant(self, constant: ast.Constant) -> List[str]:
-        value = constant.value[1]
-        if isinstance(value, tuple):
-            val = value[1]
-            if value[0] == 'integer':
-                return [f"pushi {val}"]
-            elif value[0] == 'real':
-                return [f"pushf {val}"]
-            elif value[0] == 'boolean':
-                return [f"pushi {1 if val.lower() == 'true' else 0}"]
-            elif value[0] == 'char':
-                return [f"pushi {ord(val)}"]
-        elif isinstance(value, str) and len(value) == 1:
+        value = constant.value
+        if constant.kind == 'integer':
+            return [f"pushi {value}"]
+        elif constant.kind == 'real':
+            return [f"pushf {value}"]
+        elif constant.kind == 'string' and len(value) == 1:
             return [f"pushi {ord(value)}"]
-        elif isinstance(value, str):
+        elif constant.kind == 'string':
             return [f'pushs "{value}"']
-        elif value.lower() in ("true", "false"):
-            return [f"pushi {1 if value.lower() == 'true' else 0}"]
+        elif constant.kind == 'nil':
+            return ["pushi 0"]
         raise ast.TranslationError(f"Unsupported constant '{value}'")
 
     def visit_set_constructor(self, set_constructor: ast.SetConstructor) -> List[str]:
         code = []
         for member in (set_constructor.members or []):
-            if member[0] == "set_member":
-                code.extend(member[1].evaluate(self))
-            elif member[0] == "set_range":
-                code.extend(member[1].evaluate(self) + member[2].evaluate(self))
+            code.extend((yield member.lower))
+            if member.upper is not None:
+                code.extend((yield member.upper))
         return code
 
     def visit_pointer_dereference(self, pointer_dereference: ast.PointerDereference) -> List[str]:
-        return pointer_dereference.variable.evaluate(self) + ["load"]
+        return (yield pointer_dereference.variable) + ["load"]
 
     def visit_indexed_variable(self, indexed_variable: ast.IndexedVariable) -> List[str]:
-        var_name = indexed_variable.variable.identifier[1]
-        if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-            var_index, var_type, lower_bound, element_type = self.local_variables[self.current_function][var_name]
-        elif var_name in self.global_variables:
-            var_index, var_type, lower_bound, element_type = self.global_variables[var_name]
-        else:
+        var_name = indexed_variable.variable.identifier.name
+        symbol = self.scope.symbol(indexed_variable)
+        if symbol is None:
             raise ast.TranslationError(f"Variable '{var_name}' not declared")
+        var_index, var_type, lower_bound = symbol.slot, symbol.type, symbol.lower_bound
         if var_type != "array" and var_type != "string":
             raise ast.TranslationError(f"Variable '{var_name}' is not an array or string")
         code = []
         if var_type == "string":
             if len(indexed_variable.indices) != 1:
                 raise ast.TranslationError("String indexing requires exactly one index")
-            index_type = self._infer_expression_type(indexed_variable.indices[0])
+            index_type = self.scope.type_of(indexed_variable.indices[0])
             if index_type != "integer":
                 raise ast.TranslationError(f"String index must be integer, got {index_type}")
             code.append(f"pushg {var_index}")
-            code.extend(indexed_variable.indices[0].evaluate(self))
+            code.extend((yield indexed_variable.indices[0]))
             code.append("pushi 1")
             code.append("sub")
             code.append("charat")
         else:
-            index_type = self._infer_expression_type(indexed_variable.indices[0])
+            index_type = self.scope.type_of(indexed_variable.indices[0])
             if index_type != "integer":
                 raise ast.TranslationError(f"Array index must be integer, got {index_type}")
-            code.extend(indexed_variable.indices[0].evaluate(self))
+            code.extend((yield indexed_variable.indices[0]))
+            code.extend(self._bounds_check(indexed_variable, symbol))
             if lower_bound is not None:
                 code.append(f"pushi {lower_bound}")
                 code.append("sub")
@@ -482,33 +513,35 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
         return code
 
     def visit_field_designator(self, field_designator: ast.FieldDesignator) -> List[str]:
-        return field_designator.variable.evaluate(self) + [f"pushi {field_designator.field[1]}", "add", "load"]
+        return (yield field_designator.variable) + [f"pushi {field_designator.field.name}", "add", "load"]
 
     def visit_array_type(self, array_type: ast.ArrayType) -> List[str]:
         return []
 
     def visit_ast(self, ast_node: ast.AbstractSyntaxTree) -> List[str]:
+        self.model = analyze(ast_node, self.symbols)
+        self.call_graph = call_graph(ast_node, self.model)
+        self.result_functions = result_functions(ast_node, self.model)
         return ast_node.program.evaluate(self)
 
     def translate(self, ast_node: ast.AbstractSyntaxTree) -> List[str]:
         return self.visit_ast(ast_node)
 
     def _translate_indexed_variable_assignment(self, indexed_variable: ast.IndexedVariable) -> List[str]:
-        var_name = indexed_variable.variable.identifier[1]
-        if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-            var_index, var_type, lower_bound, element_type = self.local_variables[self.current_function][var_name]
-        elif var_name in self.global_variables:
-            var_index, var_type, lower_bound, element_type = self.global_variables[var_name]
-        else:
+        var_name = indexed_variable.variable.identifier.name
+        symbol = self.scope.symbol(indexed_variable)
+        if symbol is None:
             raise ast.TranslationError(f"Variable '{var_name}' not declared")
+        var_index, var_type, lower_bound = symbol.slot, symbol.type, symbol.lower_bound
         if var_type == "string":
             raise ast.TranslationError("String character assignment not supported")
         elif var_type != "array":
             raise ast.TranslationError(f"Variable '{var_name}' is not an array")
-        index_type = self._infer_expression_type(indexed_variable.indices[0])
+        index_type = self.scope.type_of(indexed_variable.indices[0])
         if index_type != "integer":
             raise ast.TranslationError(f"Array index must be integer, got {index_type}")
-        code = indexed_variable.indices[0].evaluate(self)
+        code = (yield indexed_variable.indices[0])
+        code.extend(self._bounds_check(indexed_variable, symbol))
         if lower_bound is not None:
             code.append(f"pushi {lower_bound}")
             code.append("sub")
@@ -517,70 +550,8 @@ class PascalEWVMTranslator(ast.Translator[List[str]]):
         code.append("storeg")
         return code
 
-    def _evaluate_constant(self, expr: ast.Expression) -> int:
-        if isinstance(expr, ast.Constant):
-            value = expr.value[1]
-            if isinstance(value, tuple) and value[0] == 'integer':
-                return int(value[1])
-            elif isinstance(value, (int, float)):
-                return int(value)
-        raise ast.TranslationError(f"Expected constant integer, got {expr}")
-
-    def _infer_expression_type(self, expr: ast.Expression) -> str:
-        if isinstance(expr, ast.Constant):
-            value = expr.value[1]
-            if isinstance(value, tuple):
-                return value[0]
-            elif isinstance(value, str) and len(value) == 1:
-                return "char"
-            elif isinstance(value, str):
-                return "string"
-            elif value.lower() in ("true", "false"):
-                return "boolean"
-        elif isinstance(expr, ast.VariableAccess):
-            var_name = expr.identifier[1].lower()
-            if var_name in ("true", "false"):
-                return "boolean"
-            if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                return self.local_variables[self.current_function][var_name][1]
-            if var_name in self.global_variables:
-                return self.global_variables[var_name][1]
-            raise ast.TranslationError(f"Variable '{var_name}' not declared")
-        elif isinstance(expr, ast.IndexedVariable):
-            var_name = expr.variable.identifier[1]
-            if self.current_function and var_name in self.local_variables.get(self.current_function, {}):
-                var_type, _, _, element_type = self.local_variables[self.current_function][var_name]
-                return element_type if element_type and var_type == "array" else "char" if var_type == "string" else "integer"
-            if var_name in self.global_variables:
-                var_type, _, _, element_type = self.global_variables[var_name]
-                return element_type if element_type and var_type == "array" else "char" if var_type == "string" else "integer"
-            raise ast.TranslationError(f"Variable '{var_name}' not declared")
-        elif isinstance(expr, ast.BinaryExpression):
-            op = expr.operator[1]
-            if op in ("=", "<>", "<", "<=", ">", ">="):
-                return "boolean"
-            if op in ("and", "or"):
-                return "boolean"
-            left_type = self._infer_expression_type(expr.left)
-            right_type = self._infer_expression_type(expr.right)
-            if left_type == right_type:
-                return left_type
-            if left_type in ("integer", "real") and right_type in ("integer", "real"):
-                return "real" if "real" in (left_type, right_type) else "integer"
-            return left_type
-        elif isinstance(expr, ast.SignedExpression):
-            return self._infer_expression_type(expr.expression)
-        elif isinstance(expr, ast.NotExpression):
-            return "boolean"
-        elif isinstance(expr, ast.Exponentiation):
-            return self._infer_expression_type(expr.base)
-        elif isinstance(expr, ast.FunctionCall):
-            func_name = expr.identifier[1]
-            if func_name == "length":
-                return "integer"
-            if func_name == "charat":
-                return "char"
-            return "integer"
-        raise ast.TranslationError(f"Cannot infer type for expression {expr}")
-    
-
+    def _bounds_check(self, indexed_variable: ast.IndexedVariable, symbol: Symbol) -> List[str]:
+        # indices the interval analysis proved in range need no runtime check
+        if not self.check_bounds or id(indexed_variable) in self.proven_indices:
+            return []
+        return [f"check {symbol.lower_bound}, {symbol.upper_bound}"]